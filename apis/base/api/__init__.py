@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
-router_simple = APIRouter(prefix="/api", tags=["简单模块"])
-router_user = APIRouter(prefix="/api", tags=["用户模块"])
+from exts.requestvar.timed_route import TimedRoute
+
+router_simple = APIRouter(prefix="/api", tags=["简单模块"], route_class=TimedRoute)
+router_user = APIRouter(prefix="/api", tags=["用户模块"], route_class=TimedRoute)
 
 from . import simple
 from . import user
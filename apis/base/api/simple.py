@@ -4,13 +4,30 @@
     - 接口没有复杂的业务逻辑，标题即内容的接口
 """
 
-from fastapi import Depends, Query, Path, UploadFile, File
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import Depends, Query, Path, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.database import depends_get_db_session, depends_get_db_session_with_transaction
+from db.database import (
+    depends_get_db_session,
+    depends_get_db_session_with_transaction,
+    unit_of_work,
+)
+from db.query_timeout import query_timeout
 from exts.responses.api_response import Success
+from exts.responses.conditional import NotModified
+from utils.export import EXPORT_MEDIA_TYPES
 from . import router_simple
-from ..schemas.simple import DesignUnitCreateRequest, DesignUnitUpdateRequest
+from ..schemas.simple import (
+    DesignUnitCreateRequest,
+    DesignUnitFilter,
+    DesignUnitSort,
+    DesignUnitUpdateRequest,
+    TotalMode,
+)
 from ..services.simple import SimpleService
 
 
@@ -25,21 +42,170 @@ async def create_design_unit(
 
 @router_simple.get("/design_unit/{unit_id}", summary="获取设计单位详情")
 async def get_design_unit(
+    request: Request,
     unit_id: int = Path(..., description="Unique identifier of the design unit"),
+    fields: Optional[str] = Query(
+        None, description="Comma separated fields to return, e.g. id,name"
+    ),
     db_session: AsyncSession = Depends(depends_get_db_session),
 ):
-    result = await SimpleService.get_unit_by_id(db_session, unit_id)
-    return Success(result, message="获取设计单位详情成功")
+    fields = SimpleService.parse_fields(fields)
+
+    # 整个请求一个工作单元：只签出一次连接，响应序列化前归还
+    async with unit_of_work(db_session):
+        # 条件请求：仅查询 updated_at，未变化时直接返回 304；不同字段子集的 ETag 不同
+        version = await SimpleService.get_unit_version(db_session, unit_id)
+        if fields:
+            version = version.vary("fields", *fields)
+        if version.matches(request):
+            return NotModified(version)
+
+        result = await SimpleService.get_unit_by_id(db_session, unit_id, fields)
+    return Success(result, message="获取设计单位详情成功", headers=version.headers())
+
 
+async def design_unit_filter(
+    name_prefix: Optional[str] = Query(
+        None, min_length=1, max_length=20, description="Name prefix"
+    ),
+    contact: Optional[str] = Query(
+        None, max_length=20, description="Exact contact person name"
+    ),
+    created_from: Optional[datetime] = Query(
+        None, description="Created at or after this time"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Created before this time"
+    ),
+    sort: Optional[DesignUnitSort] = Query(
+        None, description="Sort field, prefix with - for descending, e.g. -created_at"
+    ),
+) -> DesignUnitFilter:
+    """列表过滤与排序参数（白名单）"""
+    return DesignUnitFilter(
+        name_prefix=name_prefix,
+        contact=contact,
+        created_from=created_from,
+        created_to=created_to,
+        sort=sort,
+    )
 
-@router_simple.get("/design_units", summary="获取设计单位列表")
+
+@router_simple.get(
+    "/design_units",
+    summary="获取设计单位列表",
+    dependencies=[Depends(query_timeout(5))],
+)
 async def get_design_units(
+    request: Request,
     page: int = Query(1, description="Page number"),
     page_size: int = Query(10, description="Page size"),
+    fields: Optional[str] = Query(
+        None, description="Comma separated fields to return, e.g. id,name"
+    ),
+    total: Optional[TotalMode] = Query(
+        None,
+        description="Include total count: cached, approx (table statistics) or exact",
+    ),
+    filters: DesignUnitFilter = Depends(design_unit_filter),
+    db_session: AsyncSession = Depends(depends_get_db_session),
+):
+    fields = SimpleService.parse_fields(fields)
+
+    # 整个请求一个工作单元：排序保护、本页与总数共用一次连接签出
+    async with unit_of_work(db_session):
+        await SimpleService.check_sort(db_session, filters)
+
+        # 本页数据与版本一次查询得到；条件请求未变化时返回 304，不同字段子集的 ETag 不同
+        result, version = await SimpleService.get_units(
+            db_session, page=page, size=page_size, fields=fields, filters=filters
+        )
+        if fields:
+            version = version.vary("fields", *fields)
+        if total:
+            # 总数变化（如其他页新增）时本页内容不变，但响应体不同
+            count, total_mode = await SimpleService.count_units(
+                db_session, total, filters
+            )
+            version = version.vary("total", total_mode, count)
+        if version.matches(request):
+            return NotModified(version)
+
+    if total:
+        result = SimpleService.build_page(result, count, total_mode, page_size, page)
+    return Success(result, message="获取设计单位列表成功", headers=version.headers())
+
+
+@router_simple.get("/design_units/suggest", summary="设计单位名称联想")
+async def suggest_design_units(
+    q: str = Query(..., min_length=1, max_length=20, description="Name fragment"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions"),
+    db_session: AsyncSession = Depends(depends_get_db_session),
+):
+    # 进程内 n-gram 索引，索引未就绪时回退为数据库前缀查询
+    result = await SimpleService.suggest(db_session, q, limit)
+    return Success(result, message="获取联想结果成功")
+
+
+@router_simple.get("/design_units/by_ids", summary="按 id 批量获取设计单位")
+async def get_design_units_by_ids(
+    ids: List[int] = Query(..., description="Design unit ids, e.g. ?ids=1&ids=2"),
+    db_session: AsyncSession = Depends(depends_get_db_session),
+):
+    # 一条 WHERE id IN (...) 查询，按传入顺序返回，不存在的 id 对应 null
+    result = await SimpleService.get_units_by_ids(db_session, ids)
+    return Success(result, message="批量获取设计单位成功")
+
+
+@router_simple.get(
+    "/design_units/export",
+    summary="流式导出设计单位",
+    dependencies=[Depends(query_timeout(0))],
+)
+async def export_design_units(
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Export format: ndjson or csv"
+    ),
+    db_session: AsyncSession = Depends(depends_get_db_session),
+):
+    # 服务端游标分批读取、逐块发送；导出为长时间查询，不受单条语句超时限制
+    filename = f"design_units.{export_format}"
+    return StreamingResponse(
+        SimpleService.export_units(db_session, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router_simple.post("/design_units/import", summary="批量导入设计单位")
+async def import_design_units(
+    file: UploadFile = File(..., description="CSV or NDJSON file"),
+    import_format: Optional[Literal["csv", "ndjson"]] = Query(
+        None,
+        alias="format",
+        description="Import format, inferred from filename if omitted",
+    ),
+    db_session: AsyncSession = Depends(depends_get_db_session),
+):
+    # 按批解析、校验、插入，每批一次事务；逐行返回 NDJSON 处理报告
+    import_format = SimpleService.resolve_import_format(file.filename, import_format)
+    return StreamingResponse(
+        SimpleService.import_units(db_session, file, import_format),
+        media_type="application/x-ndjson",
+    )
+
+
+@router_simple.get("/design_units/changes", summary="增量同步设计单位")
+async def get_design_unit_changes(
+    since: Optional[str] = Query(
+        None,
+        description="Continuation token from the previous sync, omit for full sync",
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Max changes per response"),
     db_session: AsyncSession = Depends(depends_get_db_session),
 ):
-    result = await SimpleService.get_units(db_session, page=page, size=page_size)
-    return Success(result, message="获取设计单位列表成功")
+    result = await SimpleService.get_changes(db_session, since, limit)
+    return Success(result, message="获取设计单位变更成功")
 
 
 @router_simple.put("/design_unit/{unit_id}", summary="更新设计单位")
@@ -1,14 +1,156 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select, insert, delete, bindparam, func, or_, text
+from sqlalchemy.engine import Row
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
 from fastapi import UploadFile
 from datetime import datetime
 
 from utils.file import FileUtils, FileCategory
-from db.models import DesignUnit
+from ..schemas.simple import DesignUnitFilter
+from db.models import DesignUnit, DesignUnitTombstone
+from db.repository import BaseRepository
 
+# 预构建语句：模块加载时构造一次，调用时仅绑定参数
+_SELECT_UNIT_BY_ID = select(DesignUnit).where(DesignUnit.id == bindparam("unit_id"))
+_SELECT_UNIT_ID_BY_NAME = (
+    select(DesignUnit.id).where(DesignUnit.name == bindparam("name")).limit(1)
+)
+_SELECT_UNITS_BY_IDS = select(DesignUnit).where(
+    DesignUnit.id.in_(bindparam("unit_ids", expanding=True))
+)
+_SELECT_NAMES_IN = select(DesignUnit.name).where(
+    DesignUnit.name.in_(bindparam("names", expanding=True))
+)
+_SELECT_IDS_BY_NAMES = select(DesignUnit.id, DesignUnit.name).where(
+    DesignUnit.name.in_(bindparam("names", expanding=True))
+)
+_SELECT_UNIT_NAMES = select(DesignUnit.id, DesignUnit.name)
+_INSERT_UNIT = insert(DesignUnit)
+_SELECT_ROW_AT_OFFSET = select(DesignUnit.id).offset(bindparam("offset")).limit(1)
+_COUNT_UNITS = select(func.count()).select_from(DesignUnit)
+# MySQL 表统计信息中的估算行数（InnoDB 为采样估算，误差可达数十个百分点）
+_ESTIMATE_TABLE_ROWS = text(
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+)
+# 分页默认按 id 排序，保证同一页的内容（及由其计算的列表版本）稳定
+_SELECT_UNITS_PAGE = (
+    select(DesignUnit)
+    .order_by(DesignUnit.id)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+# 导出只查询列元组，不构造 ORM 实体，也不进入身份映射
+EXPORT_COLUMNS = (
+    "id",
+    "name",
+    "tel",
+    "email",
+    "address",
+    "contact",
+    "created_at",
+    "updated_at",
+)
+_SELECT_UNITS_EXPORT = select(
+    *(getattr(DesignUnit, column) for column in EXPORT_COLUMNS)
+).order_by(DesignUnit.id)
+# 增量同步：按 (updated_at, id) 键集分页，
+# 写成 updated_at >= :since_at AND (updated_at > :since_at OR id > :since_id) 以便走复合索引范围扫描
+_SELECT_DB_NOW = select(func.now())
+_SELECT_UNIT_CHANGES = (
+    select(DesignUnit)
+    .where(
+        DesignUnit.updated_at >= bindparam("since_at"),
+        or_(
+            DesignUnit.updated_at > bindparam("since_at"),
+            DesignUnit.id > bindparam("since_id"),
+        ),
+        DesignUnit.updated_at <= bindparam("until"),
+    )
+    .order_by(DesignUnit.updated_at, DesignUnit.id)
+    .limit(bindparam("limit"))
+)
+_SELECT_UNIT_DELETIONS = (
+    select(DesignUnitTombstone)
+    .where(
+        DesignUnitTombstone.deleted_at >= bindparam("since_at"),
+        or_(
+            DesignUnitTombstone.deleted_at > bindparam("since_at"),
+            DesignUnitTombstone.id > bindparam("since_id"),
+        ),
+        DesignUnitTombstone.deleted_at <= bindparam("until"),
+    )
+    .order_by(DesignUnitTombstone.deleted_at, DesignUnitTombstone.id)
+    .limit(bindparam("limit"))
+)
+_PURGE_UNIT_DELETIONS = delete(DesignUnitTombstone).where(
+    DesignUnitTombstone.deleted_at < bindparam("before")
+)
+_SELECT_UNIT_VERSION = select(DesignUnit.id, DesignUnit.updated_at).where(
+    DesignUnit.id == bindparam("unit_id")
+)
 
-class SimpleRepository:
+
+def _escape_like(value: str) -> str:
+    """转义 LIKE 通配符，前缀搜索只匹配字面前缀"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _has_filters(filters: Optional[DesignUnitFilter]) -> bool:
+    return filters is not None and not filters.is_empty()
+
+
+def _apply_filters(statement, filters: DesignUnitFilter, with_sort: bool = True):
+    """
+    将白名单过滤与排序参数编译为可走索引的条件
+
+    - 名称前缀：name LIKE 'prefix%'（转义通配符），可走 name 索引范围扫描
+    - 联系人：等值匹配
+    - 创建时间：半开区间 [created_from, created_to)
+    - 排序：替换默认的 id 排序，并附加 id 作为次序键，保证分页稳定
+    """
+    if filters.name_prefix:
+        pattern = _escape_like(filters.name_prefix) + "%"
+        statement = statement.where(DesignUnit.name.like(pattern, escape="\\"))
+    if filters.contact is not None:
+        statement = statement.where(DesignUnit.contact == filters.contact)
+    if filters.created_from is not None:
+        statement = statement.where(DesignUnit.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        statement = statement.where(DesignUnit.created_at < filters.created_to)
+    if with_sort and filters.sort_field:
+        columns = [getattr(DesignUnit, filters.sort_field)]
+        if filters.sort_field != "id":
+            columns.append(DesignUnit.id)
+        statement = statement.order_by(None).order_by(
+            *(
+                column.desc() if filters.sort_descending else column.asc()
+                for column in columns
+            )
+        )
+    return statement
+
+
+# 稀疏字段集：按字段子集构造列级查询，每个子集只构造一次
+@lru_cache(maxsize=None)
+def _select_unit_fields_by_id(fields: Tuple[str, ...]):
+    return select(*(getattr(DesignUnit, field) for field in fields)).where(
+        DesignUnit.id == bindparam("unit_id")
+    )
+
+
+@lru_cache(maxsize=None)
+def _select_units_fields_page(fields: Tuple[str, ...]):
+    return (
+        select(*(getattr(DesignUnit, field) for field in fields))
+        .order_by(DesignUnit.id)
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+    )
+
+
+class SimpleRepository(BaseRepository):
     @staticmethod
     async def create_unit(
         db_session: AsyncSession, unit_data: Dict[str, Any]
@@ -19,34 +161,223 @@ class SimpleRepository:
         await db_session.refresh(unit)
         return unit
 
+    @staticmethod
+    async def bulk_create_units(
+        db_session: AsyncSession, units_data: List[Dict[str, Any]]
+    ) -> None:
+        """批量插入（executemany，不构造 ORM 实体）"""
+        await db_session.execute(_INSERT_UNIT, units_data)
+
+    @staticmethod
+    async def get_existing_names(db_session: AsyncSession, names: List[str]) -> set:
+        """返回 names 中已存在于数据库的名称"""
+        if not names:
+            return set()
+        result = await db_session.execute(_SELECT_NAMES_IN, {"names": names})
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def get_ids_by_names(db_session: AsyncSession, names: List[str]) -> List[Row]:
+        """按名称批量查询 (id, name)"""
+        if not names:
+            return []
+        result = await db_session.execute(_SELECT_IDS_BY_NAMES, {"names": names})
+        return result.all()
+
+    @staticmethod
+    async def stream_unit_names(
+        db_session: AsyncSession, partition_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """以服务端游标流式读取全部 (id, name)，用于构建名称索引"""
+        result = await db_session.stream(
+            _SELECT_UNIT_NAMES.execution_options(yield_per=partition_size)
+        )
+        try:
+            async for partition in result.partitions(partition_size):
+                yield partition
+        finally:
+            await result.close()
+
     @staticmethod
     async def check(db_session: AsyncSession, name: str) -> bool:
-        result = await db_session.execute(
-            select(DesignUnit).where(DesignUnit.name == name)
+        return await BaseRepository.exists(
+            db_session, _SELECT_UNIT_ID_BY_NAME, name=name
         )
-        return result.scalars().first() is not None
 
     @staticmethod
     async def get_unit_by_id(
         db_session: AsyncSession, unit_id: int
     ) -> Optional[DesignUnit]:
+        return await BaseRepository.fetch_first(
+            db_session, _SELECT_UNIT_BY_ID, unit_id=unit_id
+        )
+
+    @staticmethod
+    async def get_units_by_ids(
+        db_session: AsyncSession, unit_ids: List[int]
+    ) -> List[DesignUnit]:
+        """按 id 批量查询（WHERE id IN (...)），不保证顺序"""
+        return await BaseRepository.fetch_all(
+            db_session, _SELECT_UNITS_BY_IDS, unit_ids=unit_ids
+        )
+
+    @staticmethod
+    async def get_unit_fields_by_id(
+        db_session: AsyncSession, unit_id: int, fields: Tuple[str, ...]
+    ) -> Optional[Row]:
+        """只查询指定列"""
         result = await db_session.execute(
-            select(DesignUnit).where(DesignUnit.id == unit_id)
+            _select_unit_fields_by_id(fields), {"unit_id": unit_id}
         )
-        return result.scalars().first()
+        return result.first()
+
+    @staticmethod
+    async def get_units_fields(
+        db_session: AsyncSession,
+        size: int,
+        page: int,
+        fields: Tuple[str, ...],
+        filters: Optional[DesignUnitFilter] = None,
+    ) -> List[Row]:
+        """分页查询，只查询指定列"""
+        params = {"limit": size, "offset": size * (page - 1)}
+        statement = _select_units_fields_page(fields)
+        if _has_filters(filters):
+            statement = _apply_filters(statement, filters)
+        result = await db_session.execute(statement, params)
+        return result.all()
 
     @staticmethod
     async def get_units(
-        db_session: AsyncSession, size: int, page: int
+        db_session: AsyncSession,
+        size: int,
+        page: int,
+        filters: Optional[DesignUnitFilter] = None,
     ) -> List[DesignUnit]:
         """
         size:一页显示多少数据
         page:第几页
+        filters:过滤与排序参数
         """
+        params = {"limit": size, "offset": size * (page - 1)}
+        if not _has_filters(filters):
+            statement = _SELECT_UNITS_PAGE
+        else:
+            statement = _apply_filters(_SELECT_UNITS_PAGE, filters)
+        return await BaseRepository.fetch_all(db_session, statement, **params)
+
+    @staticmethod
+    async def has_more_rows_than(
+        db_session: AsyncSession,
+        threshold: int,
+        filters: Optional[DesignUnitFilter] = None,
+    ) -> bool:
+        """
+        判断（过滤后的）行数是否超过阈值
+
+        用 OFFSET threshold LIMIT 1 探测，最多扫描 threshold 条索引记录，不做全表 COUNT
+        """
+        statement = _SELECT_ROW_AT_OFFSET
+        if _has_filters(filters):
+            statement = _apply_filters(statement, filters, with_sort=False)
+        return await BaseRepository.exists(db_session, statement, offset=threshold)
+
+    @staticmethod
+    async def count_units(
+        db_session: AsyncSession, filters: Optional[DesignUnitFilter] = None
+    ) -> int:
+        """精确计数（过滤后）"""
+        statement = _COUNT_UNITS
+        if _has_filters(filters):
+            statement = _apply_filters(statement, filters, with_sort=False)
+        result = await db_session.execute(statement)
+        return result.scalar_one()
+
+    @staticmethod
+    async def estimate_unit_count(db_session: AsyncSession) -> Optional[int]:
+        """
+        根据表统计信息估算总行数，不扫描表
+
+        仅支持 MySQL，其他数据库返回 None
+        """
+        if db_session.bind.dialect.name != "mysql":
+            return None
         result = await db_session.execute(
-            select(DesignUnit).limit(size).offset(size * (page - 1))
+            _ESTIMATE_TABLE_ROWS, {"table_name": DesignUnit.__tablename__}
+        )
+        return result.scalar()
+
+    @staticmethod
+    async def stream_units(
+        db_session: AsyncSession, partition_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        以服务端游标流式读取全部设计单位，每次产出一个分区（partition_size 行）
+        """
+        result = await db_session.stream(
+            _SELECT_UNITS_EXPORT.execution_options(yield_per=partition_size)
+        )
+        try:
+            async for partition in result.partitions(partition_size):
+                yield partition
+        finally:
+            await result.close()
+
+    @staticmethod
+    async def get_db_now(db_session: AsyncSession) -> datetime:
+        """数据库当前时间（与 updated_at 的 server_default 同源）"""
+        result = await db_session.execute(_SELECT_DB_NOW)
+        return result.scalar_one()
+
+    @staticmethod
+    async def get_unit_changes(
+        db_session: AsyncSession,
+        since_at: datetime,
+        since_id: int,
+        until: datetime,
+        limit: int,
+    ) -> List[DesignUnit]:
+        """查询水位 (since_at, since_id) 之后、until 之前变更的设计单位"""
+        return await BaseRepository.fetch_all(
+            db_session,
+            _SELECT_UNIT_CHANGES,
+            since_at=since_at,
+            since_id=since_id,
+            until=until,
+            limit=limit,
         )
-        return result.scalars().all()
+
+    @staticmethod
+    async def get_unit_deletions(
+        db_session: AsyncSession,
+        since_at: datetime,
+        since_id: int,
+        until: datetime,
+        limit: int,
+    ) -> List[DesignUnitTombstone]:
+        """查询水位 (since_at, since_id) 之后、until 之前的删除记录"""
+        return await BaseRepository.fetch_all(
+            db_session,
+            _SELECT_UNIT_DELETIONS,
+            since_at=since_at,
+            since_id=since_id,
+            until=until,
+            limit=limit,
+        )
+
+    @staticmethod
+    async def purge_unit_deletions(db_session: AsyncSession, before: datetime) -> int:
+        """删除 before 之前的删除记录，返回删除条数"""
+        result = await db_session.execute(_PURGE_UNIT_DELETIONS, {"before": before})
+        return result.rowcount
+
+    @staticmethod
+    async def get_unit_version(
+        db_session: AsyncSession, unit_id: int
+    ) -> Optional[Row]:
+        """仅查询 (id, updated_at)，用于条件请求判断"""
+        result = await db_session.execute(_SELECT_UNIT_VERSION, {"unit_id": unit_id})
+        return result.first()
 
     @staticmethod
     async def update_unit(
@@ -68,5 +399,7 @@ class SimpleRepository:
         if unit is None:
             return False
         await db_session.delete(unit)
+        # 记录删除，供增量同步下发
+        db_session.add(DesignUnitTombstone(unit_id=unit_id))
         await db_session.flush()
         return True
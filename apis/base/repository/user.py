@@ -1,11 +1,17 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from typing import Optional, Dict, Any
 
 from db.models import User
+from db.repository import BaseRepository
 
+# 预构建语句：模块加载时构造一次，调用时仅绑定参数
+_SELECT_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_SELECT_USER_BY_NAME = select(User).where(User.name == bindparam("name"))
+_SELECT_USER_ID_BY_NAME = select(User.id).where(User.name == bindparam("name")).limit(1)
 
-class UserRepository:
+
+class UserRepository(BaseRepository):
     @staticmethod
     async def create_user(db_session: AsyncSession, user_data: Dict[str, Any]) -> User:
         """创建用户"""
@@ -18,17 +24,20 @@ class UserRepository:
     @staticmethod
     async def get_user_by_id(db_session: AsyncSession, user_id: int) -> Optional[User]:
         """根据用户ID获取用户"""
-        result = await db_session.execute(select(User).where(User.id == user_id))
-        return result.scalars().first()
+        return await BaseRepository.fetch_first(
+            db_session, _SELECT_USER_BY_ID, user_id=user_id
+        )
 
     @staticmethod
     async def get_user_by_name(db_session: AsyncSession, name: str) -> Optional[User]:
         """根据用户名获取用户"""
-        result = await db_session.execute(select(User).where(User.name == name))
-        return result.scalars().first()
+        return await BaseRepository.fetch_first(
+            db_session, _SELECT_USER_BY_NAME, name=name
+        )
 
     @staticmethod
     async def check_user_exists(db_session: AsyncSession, name: str) -> bool:
         """检查用户名是否已存在"""
-        result = await db_session.execute(select(User).where(User.name == name))
-        return result.scalars().first() is not None
+        return await BaseRepository.exists(
+            db_session, _SELECT_USER_ID_BY_NAME, name=name
+        )
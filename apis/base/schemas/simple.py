@@ -1,11 +1,15 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from functools import lru_cache
+from pydantic import BaseModel, Field, ConfigDict, create_model
+from typing import Any, Literal, Optional, List, Tuple, Type
 from datetime import datetime
 
 from utils.type import NameStr, AddressStr, MobilePhoneStr, EmailStr
 
 
 class DesignUnitCreateRequest(BaseModel):
+    # 约束类型只接受字符串，兼容以数字提交的电话号码
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
     name: NameStr = Field(..., description="Name of the design unit")
     tel: Optional[MobilePhoneStr] = Field(
         None, description="Telephone number of the design unit"
@@ -21,7 +25,17 @@ class DesignUnitCreateRequest(BaseModel):
     )
 
 
+class DesignUnitImportRequest(DesignUnitCreateRequest):
+    """批量导入记录：邮箱由导入流程整批校验（validate_emails），不逐行回调校验器"""
+
+    email: Optional[str] = Field(
+        None, description="Email address of the design unit"
+    )
+
+
 class DesignUnitUpdateRequest(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
     name: Optional[NameStr] = Field(None, description="Name of the design unit")
     tel: Optional[MobilePhoneStr] = Field(
         None, description="Telephone number of the design unit"
@@ -60,3 +74,102 @@ class DesignUnitResponse(BaseModel):
     )
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DesignUnitSuggestion(BaseModel):
+    id: int = Field(..., description="Unique identifier of the design unit")
+    name: str = Field(..., description="Name of the design unit")
+
+
+# 有索引支撑的排序字段（id 为主键）
+INDEXED_SORT_FIELDS = frozenset({"id", "name", "contact", "created_at", "updated_at"})
+
+
+# 排序参数白名单：字段名升序，"-字段名" 降序
+DesignUnitSort = Literal[
+    tuple(
+        prefix + name
+        for name in DesignUnitResponse.model_fields
+        for prefix in ("", "-")
+    )
+]
+
+
+class DesignUnitFilter(BaseModel):
+    """设计单位列表的过滤与排序参数（白名单）"""
+
+    name_prefix: Optional[str] = None
+    contact: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    sort: Optional[DesignUnitSort] = None
+
+    @property
+    def sort_field(self) -> Optional[str]:
+        return self.sort.lstrip("-") if self.sort else None
+
+    @property
+    def sort_descending(self) -> bool:
+        return bool(self.sort) and self.sort.startswith("-")
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.model_dump().values())
+
+    def has_conditions(self) -> bool:
+        """是否包含过滤条件（排序不影响行数）"""
+        return any(
+            value is not None
+            for key, value in self.model_dump().items()
+            if key != "sort"
+        )
+
+
+@lru_cache(maxsize=None)
+def design_unit_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    按字段子集派生响应模型（稀疏字段集），沿用 DesignUnitResponse 的字段定义与校验
+
+    :param fields: 已规范化（按模型字段顺序、去重）的字段元组
+    """
+    return create_model(
+        "DesignUnitResponse_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (DesignUnitResponse.model_fields[name].annotation, info)
+            for name, info in DesignUnitResponse.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+# 列表总数来源：cached 计数缓存；approx 表统计估算（仅 MySQL）；exact 精确 COUNT(*)
+TotalMode = Literal["cached", "approx", "exact"]
+
+
+class DesignUnitPage(BaseModel):
+    items: List[Any] = Field(default_factory=list, description="Design units")
+    total: int = Field(..., description="Total number of design units")
+    total_pages: int = Field(..., description="Total number of pages")
+    page: int = Field(..., description="Current page number")
+    page_size: int = Field(..., description="Page size")
+    total_mode: TotalMode = Field(
+        ..., description="How the total was obtained: cached, approx or exact"
+    )
+
+
+class DesignUnitDeletion(BaseModel):
+    id: int = Field(..., description="Identifier of the deleted design unit")
+    deleted_at: Optional[datetime] = Field(
+        None, description="Date and time when the design unit was deleted"
+    )
+
+
+class DesignUnitChangesResponse(BaseModel):
+    upserts: List[DesignUnitResponse] = Field(
+        default_factory=list, description="Created or updated design units"
+    )
+    deletes: List[DesignUnitDeletion] = Field(
+        default_factory=list, description="Deleted design units"
+    )
+    next_token: str = Field(..., description="Continuation token for the next sync")
+    has_more: bool = Field(..., description="Whether more changes are pending")
@@ -1,22 +1,130 @@
+import asyncio
+import base64
+import binascii
+import json
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from fastapi import UploadFile
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from ..repository.simple import SimpleRepository
+from ..repository.simple import EXPORT_COLUMNS, SimpleRepository
 from ..schemas.simple import (
+    DesignUnitChangesResponse,
     DesignUnitCreateRequest,
+    DesignUnitDeletion,
+    DesignUnitFilter,
+    DesignUnitImportRequest,
+    DesignUnitPage,
+    INDEXED_SORT_FIELDS,
     DesignUnitResponse,
+    DesignUnitSuggestion,
     DesignUnitUpdateRequest,
+    TotalMode,
+    design_unit_projection,
 )
 from exts.logururoute.business_logger import logger
 from utils.file import FileUtils, FileCategory
 from exts.exceptions.api_exception import ApiException
 from exts.exceptions.error_code import ErrorCode
 from config.settings import settings
+from db.database import after_commit, transactional
+from exts.metrics.registry import metrics
+from exts.requestvar.context import current_context
+from exts.responses.conditional import ResourceVersion
+from utils.construct import construct_from_orm, construct_many
+from utils.count_cache import CountCache
+from utils.bulk_import import (
+    IMPORT_FORMATS,
+    RecordItem,
+    guess_import_format,
+    iter_record_batches,
+)
+from utils.dataloader import DataLoader
+from utils.export import encode_csv, encode_csv_header, encode_ndjson
+from utils.ngram import NgramIndex
+from utils.singleflight import SingleFlight
+from utils.type import validate_emails, validation_message
+
+# 热点设计单位的并发相同读取合并为一次查询；key 的第二项为设计单位 id
+_unit_flight = SingleFlight("design_unit", enabled=settings.singleflight_enabled)
+
+# 名称联想索引（进程内），启动时构建，写入路径提交后同步更新
+name_index = NgramIndex(max_candidates=settings.suggest_max_candidates)
+metrics.register_collector("design_unit_name_index", name_index.stats)
+
+# 设计单位总数：写入路径提交后增量维护，过期后精确计数校准（并发校准合并为一次）
+unit_count = CountCache("design_unit", ttl=settings.count_cache_ttl)
+metrics.register_collector("design_unit_count_cache", unit_count.stats)
+_count_flight = SingleFlight(
+    "design_unit_count", enabled=settings.singleflight_enabled
+)
+
+# 批量导入：整批校验
+_IMPORT_ADAPTER = TypeAdapter(List[DesignUnitImportRequest])
+
+
+# 增量同步的初始水位
+_SYNC_EPOCH = datetime(1970, 1, 1)
+
+
+def _forget_unit_reads(unit_id: int):
+    """写入提交后，之后的读取不再加入提交之前发起的合并查询"""
+    _unit_flight.forget(lambda key: key[1] == unit_id)
+
+
+def _encode_sync_token(
+    unit_at: datetime,
+    unit_id: int,
+    deleted_at: datetime,
+    tombstone_id: int,
+    synced_at: datetime,
+) -> str:
+    raw = json.dumps(
+        [
+            unit_at.isoformat(),
+            unit_id,
+            deleted_at.isoformat(),
+            tombstone_id,
+            synced_at.isoformat(),
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_sync_token(
+    token: Optional[str],
+) -> Tuple[datetime, int, datetime, int, Optional[datetime]]:
+    if not token:
+        return _SYNC_EPOCH, 0, _SYNC_EPOCH, 0, None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        unit_at, unit_id, deleted_at, tombstone_id, synced_at = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+        return (
+            datetime.fromisoformat(unit_at),
+            int(unit_id),
+            datetime.fromisoformat(deleted_at),
+            int(tombstone_id),
+            datetime.fromisoformat(synced_at),
+        )
+    except (binascii.Error, ValueError, TypeError):
+        raise ApiException(ErrorCode.PARAMETER_ERROR, "无效的同步令牌")
+
+
+def _report_line(item: Dict[str, Any]) -> bytes:
+    return (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
 
 
 class SimpleService:
     @staticmethod
+    @transactional
     async def create_unit(
         db_session: AsyncSession, unit_create_request: DesignUnitCreateRequest
     ) -> DesignUnitResponse:
@@ -25,25 +133,523 @@ class SimpleService:
         unit_orm = await SimpleRepository.create_unit(
             db_session, unit_create_request.model_dump()
         )
-        return DesignUnitResponse.model_validate(unit_orm)
+        unit_id, name = unit_orm.id, unit_orm.name
+        after_commit(db_session, lambda: name_index.add(unit_id, name))
+        after_commit(db_session, lambda: unit_count.add(1))
+        after_commit(db_session, lambda: _forget_unit_reads(unit_id))
+        return construct_from_orm(DesignUnitResponse, unit_orm)
+
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        解析稀疏字段集参数（如 "name,contact"）
+
+        :return: 按模型字段顺序规范化的字段元组（总是包含 id），未指定或选择全部字段时返回 None
+        """
+        if not fields:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - DesignUnitResponse.model_fields.keys()
+        if unknown:
+            raise ApiException(
+                ErrorCode.PARAMETER_ERROR, f"不支持的字段: {', '.join(sorted(unknown))}"
+            )
+        requested.add("id")
+        if len(requested) == len(DesignUnitResponse.model_fields):
+            return None
+        return tuple(
+            name for name in DesignUnitResponse.model_fields if name in requested
+        )
 
     @staticmethod
+    @transactional
     async def get_unit_by_id(
+        db_session: AsyncSession,
+        unit_id: int,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> BaseModel:
+        return await _unit_flight.do(
+            ("unit", unit_id, fields),
+            lambda: SimpleService._load_unit(db_session, unit_id, fields),
+        )
+
+    @staticmethod
+    async def _load_unit(
+        db_session: AsyncSession, unit_id: int, fields: Optional[Tuple[str, ...]]
+    ) -> BaseModel:
+        if fields is None:
+            # 经请求内加载器：同一轮次内的多次获取合并为一条 IN 查询
+            unit = await SimpleService.unit_loader(db_session).load(unit_id)
+            if unit is None:
+                raise ApiException(ErrorCode.NOT_FOUND)
+            return unit
+
+        # 稀疏字段集：只查询所需列，构造派生模型
+        row = await SimpleRepository.get_unit_fields_by_id(db_session, unit_id, fields)
+        if row is None:
+            raise ApiException(ErrorCode.NOT_FOUND)
+        return construct_from_orm(design_unit_projection(fields), row)
+
+    @staticmethod
+    def unit_loader(
+        db_session: AsyncSession,
+    ) -> DataLoader[int, DesignUnitResponse]:
+        """
+        获取请求内的设计单位批量加载器
+
+        同一请求、同一会话共用一个加载器（存放在请求上下文中），同一轮次内的
+        load(unit_id) 合并为一条 WHERE id IN (...) 查询，不存在的 id 返回 None；
+        请求之外（后台任务等）每次新建
+        """
+        ctx = current_context()
+        key = ("design_unit", id(db_session))
+        if ctx is not None:
+            loader = ctx.loaders.get(key)
+            if loader is not None:
+                return loader
+
+        async def batch_load(unit_ids: List[int]) -> Dict[int, DesignUnitResponse]:
+            units_orm = await SimpleRepository.get_units_by_ids(db_session, unit_ids)
+            return {
+                unit_orm.id: construct_from_orm(DesignUnitResponse, unit_orm)
+                for unit_orm in units_orm
+            }
+
+        loader = DataLoader(batch_load)
+        if ctx is not None:
+            ctx.loaders[key] = loader
+        return loader
+
+    @staticmethod
+    @transactional
+    async def get_units_by_ids(
+        db_session: AsyncSession, unit_ids: List[int]
+    ) -> List[Optional[DesignUnitResponse]]:
+        """按传入顺序批量获取设计单位，不存在的 id 对应 None"""
+        if len(unit_ids) > settings.batch_get_max_ids:
+            raise ApiException(
+                ErrorCode.PARAMETER_OUT_OF_RANGE,
+                f"单次最多查询 {settings.batch_get_max_ids} 个 id",
+            )
+        return await SimpleService.unit_loader(db_session).load_many(unit_ids)
+
+    @staticmethod
+    @transactional
+    async def get_unit_version(
         db_session: AsyncSession, unit_id: int
-    ) -> DesignUnitResponse:
-        unit_orm = await SimpleRepository.get_unit_by_id(db_session, unit_id)
-        if not unit_orm:
+    ) -> ResourceVersion:
+        """仅查询 updated_at 获取详情版本，不加载完整数据"""
+        return await _unit_flight.do(
+            ("version", unit_id),
+            lambda: SimpleService._load_unit_version(db_session, unit_id),
+        )
+
+    @staticmethod
+    async def _load_unit_version(
+        db_session: AsyncSession, unit_id: int
+    ) -> ResourceVersion:
+        row = await SimpleRepository.get_unit_version(db_session, unit_id)
+        if row is None:
             raise ApiException(ErrorCode.NOT_FOUND)
-        return DesignUnitResponse.model_validate(unit_orm)
+        return ResourceVersion.from_parts(
+            "design_unit", row.id, row.updated_at, last_modified=row.updated_at
+        )
 
     @staticmethod
+    @transactional
+    async def check_sort(db_session: AsyncSession, filters: DesignUnitFilter) -> None:
+        """
+        排序保护：没有索引支撑的排序字段只允许在（过滤后）数据量较小时使用，
+        避免大表上的文件排序
+        """
+        if not filters.sort_field or filters.sort_field in INDEXED_SORT_FIELDS:
+            return
+        if await SimpleRepository.has_more_rows_than(
+            db_session, settings.unindexed_sort_max_rows, filters
+        ):
+            raise ApiException(
+                ErrorCode.PARAMETER_ERROR,
+                f"数据量过大，不支持按 {filters.sort_field} 排序，"
+                f"请缩小过滤范围或按 {', '.join(sorted(INDEXED_SORT_FIELDS))} 排序",
+            )
+
+    @staticmethod
+    @transactional
     async def get_units(
-        db_session: AsyncSession, size: int, page: int
-    ) -> List[DesignUnitResponse]:
-        units_orm = await SimpleRepository.get_units(db_session, size, page)
-        return [DesignUnitResponse.model_validate(unit_orm) for unit_orm in units_orm]
+        db_session: AsyncSession,
+        size: int,
+        page: int,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[DesignUnitFilter] = None,
+    ) -> Tuple[List[BaseModel], ResourceVersion]:
+        """
+        分页查询，并由本页的行计算列表版本（一次查询同时得到数据与版本）
+
+        版本取本页 max(updated_at)、行数与 id 之和（id 之和可发现页内行被替换），
+        连同分页与过滤参数生成 ETag
+        """
+        if fields is None:
+            model = DesignUnitResponse
+            rows = await SimpleRepository.get_units(db_session, size, page, filters)
+        else:
+            # 稀疏字段集：只查询所需列（另带 updated_at 用于计算版本），构造派生模型
+            model = design_unit_projection(fields)
+            columns = fields if "updated_at" in fields else fields + ("updated_at",)
+            rows = await SimpleRepository.get_units_fields(
+                db_session, size, page, columns, filters
+            )
+
+        updated = [row.updated_at for row in rows if row.updated_at is not None]
+        max_updated_at = max(updated) if updated else None
+        version = ResourceVersion.from_parts(
+            "design_units",
+            size,
+            page,
+            filters.model_dump_json() if filters else None,
+            max_updated_at,
+            len(rows),
+            sum(row.id for row in rows),
+            last_modified=max_updated_at,
+        )
+        return construct_many(model, rows), version
+
+    @staticmethod
+    @transactional
+    async def count_units(
+        db_session: AsyncSession,
+        mode: TotalMode,
+        filters: Optional[DesignUnitFilter] = None,
+    ) -> Tuple[int, TotalMode]:
+        """
+        列表总数
+
+        - cached：计数缓存，过期时精确计数校准；多进程部署时各进程的缓存
+          只反映本进程的写入，误差在一个校准间隔内被纠正
+        - approx：MySQL 表统计信息估算，不扫描表；其他数据库按 cached 处理
+        - exact：精确 COUNT(*)
+        带过滤条件时缓存与统计信息都不适用，按 exact 计数（过滤字段均有索引）
+
+        :return: (总数, 实际采用的方式)
+        """
+        if mode == "exact" or (filters is not None and filters.has_conditions()):
+            return await SimpleRepository.count_units(db_session, filters), "exact"
+
+        if mode == "approx":
+            estimate = await SimpleRepository.estimate_unit_count(db_session)
+            if estimate is not None:
+                return estimate, "approx"
+
+        total = unit_count.get()
+        if total is None:
+            total = await _count_flight.do(
+                "count", lambda: SimpleService._reconcile_unit_count(db_session)
+            )
+        return total, "cached"
+
+    @staticmethod
+    async def _reconcile_unit_count(db_session: AsyncSession) -> int:
+        # 计数期间提交的写入可能未被计入，此时 set 放弃校准，下次读取重新计数
+        generation = unit_count.generation
+        total = await SimpleRepository.count_units(db_session)
+        unit_count.set(total, generation)
+        return total
 
     @staticmethod
+    def build_page(
+        items: List[BaseModel], total: int, total_mode: TotalMode, size: int, page: int
+    ) -> DesignUnitPage:
+        return DesignUnitPage(
+            items=items,
+            total=total,
+            total_pages=(total + size - 1) // size if size > 0 else 0,
+            page=page,
+            page_size=size,
+            total_mode=total_mode,
+        )
+
+    @staticmethod
+    async def export_units(
+        db_session: AsyncSession, export_format: str
+    ) -> AsyncIterator[bytes]:
+        """
+        流式导出全部设计单位，每个分区编码为一个字节块
+
+        由 StreamingResponse 逐块发送，客户端读取慢时生成器随之暂停，
+        内存占用与总行数无关
+        """
+        if export_format == "csv":
+            yield encode_csv_header(EXPORT_COLUMNS)
+        async for rows in SimpleRepository.stream_units(
+            db_session, settings.export_partition_size
+        ):
+            if export_format == "csv":
+                yield encode_csv(rows)
+            else:
+                yield encode_ndjson(EXPORT_COLUMNS, rows)
+
+    @staticmethod
+    def resolve_import_format(
+        filename: Optional[str], import_format: Optional[str]
+    ) -> str:
+        """确定导入格式：优先使用显式指定的格式，否则按文件名后缀推断"""
+        import_format = import_format or guess_import_format(filename)
+        if import_format not in IMPORT_FORMATS:
+            raise ApiException(
+                ErrorCode.PARAMETER_ERROR, "无法识别导入文件格式，请指定 format=csv 或 ndjson"
+            )
+        return import_format
+
+    @staticmethod
+    def _validate_import_batch(
+        items: List[RecordItem],
+    ) -> Tuple[List[Tuple[int, DesignUnitImportRequest]], List[Dict[str, Any]]]:
+        """
+        整批校验导入记录
+
+        先用 TypeAdapter 一次校验整批；有错误时按下标收集行级错误，
+        再对剩余记录重新整批校验；最后整批校验邮箱
+
+        :return: ([(行号, 校验后的请求)], [行级错误])
+        """
+        errors = []
+        candidates = []
+        for line_no, record, parse_error in items:
+            if parse_error:
+                errors.append({"row": line_no, "field": None, "message": parse_error})
+            else:
+                candidates.append((line_no, record))
+
+        try:
+            units = _IMPORT_ADAPTER.validate_python(
+                [record for _, record in candidates]
+            )
+        except ValidationError as e:
+            invalid = set()
+            for error in e.errors(include_url=False):
+                index = error["loc"][0]
+                invalid.add(index)
+                errors.append(
+                    {
+                        "row": candidates[index][0],
+                        "field": ".".join(str(part) for part in error["loc"][1:])
+                        or None,
+                        "message": validation_message(error) or error["msg"],
+                    }
+                )
+            candidates = [
+                candidate
+                for index, candidate in enumerate(candidates)
+                if index not in invalid
+            ]
+            units = _IMPORT_ADAPTER.validate_python(
+                [record for _, record in candidates]
+            )
+
+        # 邮箱整批校验：同批重复地址只校验一次；导入地址多为一次性的，结果不写入缓存
+        emails = validate_emails(
+            [unit.email for unit in units], update_cache=False
+        )
+        valid = []
+        for (line_no, _), unit, (email, error) in zip(candidates, units, emails):
+            if error:
+                errors.append({"row": line_no, "field": "email", "message": error})
+                continue
+            unit.email = email
+            valid.append((line_no, unit))
+        return valid, errors
+
+    @staticmethod
+    async def import_units(
+        db_session: AsyncSession, file: UploadFile, import_format: str
+    ) -> AsyncIterator[bytes]:
+        """
+        流式批量导入设计单位，逐行产出 NDJSON 格式的处理报告
+
+        - 上传文件按批增量解析，整批校验（均在线程池中执行）
+        - 名称与库中已有数据或文件中前面的行重复时，该行记为错误
+        - 每批一次 executemany 插入、一次提交；批次写入失败只回滚该批
+
+        报告行:
+            {"type": "error", "row": 行号, "field": 字段, "message": 原因}
+            {"type": "progress", "batch": 批次, "processed": 已处理,
+             "inserted": 已导入, "failed": 失败}
+            {"type": "summary", "processed": ..., "inserted": ...,
+             "failed": ..., "elapsed": 秒}
+        """
+        batches = iter_record_batches(
+            file.file, import_format, settings.import_batch_size
+        )
+        seen_names = set()
+        processed = inserted = 0
+        batch_no = 0
+        start = time.perf_counter()
+
+        while True:
+            items = await run_in_threadpool(next, batches, None)
+            if items is None:
+                break
+            batch_no += 1
+            processed += len(items)
+
+            # 整批校验是 CPU 密集操作，放到线程池避免阻塞事件循环
+            valid, errors = await run_in_threadpool(
+                SimpleService._validate_import_batch, items
+            )
+            rows = []
+            batch_names = []
+            try:
+                existing = await SimpleRepository.get_existing_names(
+                    db_session, list({unit.name for _, unit in valid})
+                )
+                for line_no, unit in valid:
+                    if unit.name in existing or unit.name in seen_names:
+                        errors.append(
+                            {
+                                "row": line_no,
+                                "field": "name",
+                                "message": "设计单位名称已存在",
+                            }
+                        )
+                        continue
+                    seen_names.add(unit.name)
+                    batch_names.append(unit.name)
+                    rows.append(unit.model_dump())
+
+                if rows:
+                    await SimpleRepository.bulk_create_units(db_session, rows)
+                    await db_session.commit()
+                    inserted += len(rows)
+                    unit_count.add(len(rows))
+            except SQLAlchemyError as e:
+                await db_session.rollback()
+                seen_names.difference_update(batch_names)
+                logger.error(f"设计单位导入第 {batch_no} 批写入失败: {e}")
+                # 查重失败时本批通过校验的行都未写入
+                failed_rows = len(rows) or len(valid)
+                errors.append(
+                    {
+                        "row": None,
+                        "field": None,
+                        "message": f"第 {batch_no} 批写入失败，该批 {failed_rows} 行已回滚",
+                    }
+                )
+            else:
+                if rows and (name_index.ready or name_index.building):
+                    await SimpleService._index_imported_names(db_session, batch_names)
+
+            errors.sort(key=lambda error: error["row"] or 0)
+            for error in errors:
+                yield _report_line({"type": "error", **error})
+            yield _report_line(
+                {
+                    "type": "progress",
+                    "batch": batch_no,
+                    "processed": processed,
+                    "inserted": inserted,
+                    "failed": processed - inserted,
+                }
+            )
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"设计单位导入完成: 处理 {processed} 行, 导入 {inserted} 行, 耗时 {elapsed:.2f}s"
+        )
+        yield _report_line(
+            {
+                "type": "summary",
+                "processed": processed,
+                "inserted": inserted,
+                "failed": processed - inserted,
+                "elapsed": round(elapsed, 3),
+            }
+        )
+
+    @staticmethod
+    async def _index_imported_names(db_session: AsyncSession, names: List[str]):
+        """已提交的导入批次加入名称联想索引；失败时只记录日志，由增量刷新补上"""
+        try:
+            for unit_id, name in await SimpleRepository.get_ids_by_names(
+                db_session, names
+            ):
+                name_index.add(unit_id, name)
+        except SQLAlchemyError as e:
+            await db_session.rollback()
+            logger.warning("导入名称加入联想索引失败: {}", e)
+
+    @staticmethod
+    @transactional
+    async def get_changes(
+        db_session: AsyncSession, since: Optional[str], limit: int
+    ) -> DesignUnitChangesResponse:
+        """
+        增量同步：返回水位之后的新增/更新与删除，按 (时间, id) 顺序合并截取 limit 条
+
+        - 令牌同时记录设计单位与删除记录两条流的水位，不传表示从头同步
+        - 只返回 sync_settle_seconds 之前的变更，避免同一秒内稍后提交的变更被水位跳过
+        - 客户端先应用 upserts 再应用 deletes
+        - 删除记录只保留 sync_tombstone_retention_days 天：令牌记录签发时的同步时间，
+          早于保留期的令牌可能漏掉已清理的删除，返回 SYNC_TOKEN_EXPIRED，
+          客户端需不带令牌重新全量同步
+        """
+        unit_at, unit_id, deleted_at, tombstone_id, synced_at = _decode_sync_token(
+            since
+        )
+        now = await SimpleRepository.get_db_now(db_session)
+        retention_days = settings.sync_tombstone_retention_days
+        if synced_at is not None and retention_days > 0:
+            if synced_at < now - timedelta(days=retention_days):
+                raise ApiException(ErrorCode.SYNC_TOKEN_EXPIRED)
+        until = now - timedelta(seconds=settings.sync_settle_seconds)
+
+        units = await SimpleRepository.get_unit_changes(
+            db_session, unit_at, unit_id, until, limit + 1
+        )
+        tombstones = await SimpleRepository.get_unit_deletions(
+            db_session, deleted_at, tombstone_id, until, limit + 1
+        )
+
+        # 两条流按时间归并，整体截取 limit 条
+        merged = sorted(
+            [(unit.updated_at, 0, unit.id, unit) for unit in units]
+            + [(tomb.deleted_at, 1, tomb.id, tomb) for tomb in tombstones],
+            key=lambda item: item[:3],
+        )
+        taken = merged[:limit]
+
+        upserts, deletes = [], []
+        for _, kind, _, item in taken:
+            if kind == 0:
+                upserts.append(construct_from_orm(DesignUnitResponse, item))
+                unit_at, unit_id = item.updated_at, item.id
+            else:
+                deletes.append(
+                    DesignUnitDeletion(id=item.unit_id, deleted_at=item.deleted_at)
+                )
+                deleted_at, tombstone_id = item.deleted_at, item.id
+
+        return DesignUnitChangesResponse(
+            upserts=upserts,
+            deletes=deletes,
+            next_token=_encode_sync_token(
+                unit_at, unit_id, deleted_at, tombstone_id, until
+            ),
+            has_more=len(merged) > limit,
+        )
+
+    @staticmethod
+    @transactional
+    async def purge_deletions(db_session: AsyncSession) -> int:
+        """清理保留期之前的删除记录，返回清理条数；保留天数为 0 时不清理"""
+        retention_days = settings.sync_tombstone_retention_days
+        if retention_days <= 0:
+            return 0
+        now = await SimpleRepository.get_db_now(db_session)
+        return await SimpleRepository.purge_unit_deletions(
+            db_session, now - timedelta(days=retention_days)
+        )
+
+    @staticmethod
+    @transactional
     async def update_unit(
         db_session: AsyncSession,
         unit_id: int,
@@ -54,11 +660,122 @@ class SimpleService:
         )
         if not unit_orm:
             raise ApiException(ErrorCode.NOT_FOUND)
-        return DesignUnitResponse.model_validate(unit_orm)
+        name = unit_orm.name
+        after_commit(db_session, lambda: name_index.add(unit_id, name))
+        after_commit(db_session, lambda: _forget_unit_reads(unit_id))
+        return construct_from_orm(DesignUnitResponse, unit_orm)
 
     @staticmethod
+    @transactional
     async def delete_unit(db_session: AsyncSession, unit_id: int) -> bool:
         result = await SimpleRepository.delete_unit(db_session, unit_id)
         if not result:
             raise ApiException(ErrorCode.NOT_FOUND)
+        after_commit(db_session, lambda: name_index.remove(unit_id))
+        after_commit(db_session, lambda: unit_count.add(-1))
+        after_commit(db_session, lambda: _forget_unit_reads(unit_id))
         return True
+
+    @staticmethod
+    async def build_name_index(db_session: AsyncSession) -> int:
+        """
+        从数据库流式加载全部名称构建联想索引
+
+        构建期间写入路径照常更新索引，加载时以写入路径的结果为准；
+        每个分区之后让出事件循环，不阻塞请求处理
+
+        :return: 索引中的名称数
+        """
+        name_index.start_build()
+        success = False
+        try:
+            # 先记录增量刷新的水位再加载：加载期间的变更由之后的刷新补上（重复应用无副作用）
+            since = await SimpleRepository.get_db_now(db_session) - timedelta(
+                seconds=settings.sync_settle_seconds
+            )
+            name_index.watermark = (since, 0, since, 0)
+            async for rows in SimpleRepository.stream_unit_names(
+                db_session, settings.export_partition_size
+            ):
+                for unit_id, name in rows:
+                    name_index.load(unit_id, name)
+                await asyncio.sleep(0)
+            success = True
+        finally:
+            name_index.finish_build(success)
+        return len(name_index)
+
+    @staticmethod
+    @transactional
+    async def refresh_name_index(db_session: AsyncSession) -> int:
+        """
+        增量刷新名称联想索引
+
+        写入路径只更新处理该请求的工作进程内的索引；其他工作进程（或直接改库）的新增、
+        改名与删除按 updated_at 与删除记录的水位周期拉取（同增量同步），先应用新增/更新
+        再应用删除。索引未就绪时不刷新
+
+        :return: 应用的变更数
+        """
+        if not name_index.ready or name_index.watermark is None:
+            return 0
+        unit_at, unit_id, deleted_at, tombstone_id = name_index.watermark
+        until = await SimpleRepository.get_db_now(db_session) - timedelta(
+            seconds=settings.sync_settle_seconds
+        )
+        size = settings.export_partition_size
+        applied = 0
+
+        while True:
+            units = await SimpleRepository.get_unit_changes(
+                db_session, unit_at, unit_id, until, size
+            )
+            for unit in units:
+                name_index.add(unit.id, unit.name)
+            applied += len(units)
+            if units:
+                unit_at, unit_id = units[-1].updated_at, units[-1].id
+            if len(units) < size:
+                break
+            await asyncio.sleep(0)
+
+        while True:
+            tombstones = await SimpleRepository.get_unit_deletions(
+                db_session, deleted_at, tombstone_id, until, size
+            )
+            for tombstone in tombstones:
+                name_index.remove(tombstone.unit_id)
+            applied += len(tombstones)
+            if tombstones:
+                deleted_at, tombstone_id = tombstones[-1].deleted_at, tombstones[-1].id
+            if len(tombstones) < size:
+                break
+            await asyncio.sleep(0)
+
+        name_index.watermark = (unit_at, unit_id, deleted_at, tombstone_id)
+        return applied
+
+    @staticmethod
+    @transactional
+    async def suggest(
+        db_session: AsyncSession, query: str, limit: int
+    ) -> List[DesignUnitSuggestion]:
+        """
+        名称联想：前缀匹配优先，其次按匹配位置、名称长度排序
+
+        索引未就绪（构建中或构建失败）时回退为数据库名称前缀查询
+        """
+        if name_index.ready:
+            return [
+                DesignUnitSuggestion(id=unit_id, name=name)
+                for unit_id, name in name_index.search(query, limit)
+            ]
+
+        rows = await SimpleRepository.get_units_fields(
+            db_session,
+            limit,
+            1,
+            ("id", "name"),
+            DesignUnitFilter(name_prefix=query.strip(), sort="name"),
+        )
+        return [DesignUnitSuggestion(id=row.id, name=row.name) for row in rows]
@@ -6,16 +6,18 @@ from ..schemas.user import (
     UserLoginRequest,
     UserLoginResponse,
     UserInfoResponse,
-    UserBasicInfo,
 )
 from exts.exceptions.api_exception import ApiException
 from exts.exceptions.error_code import ErrorCode
+from utils.construct import construct_from_orm
 from utils.password import get_password_hash, verify_password
 from utils.jwt import create_access_token
+from db.database import transactional
 
 
 class UserService:
     @staticmethod
+    @transactional
     async def register(
         db_session: AsyncSession, register_request: UserRegisterRequest
     ) -> UserInfoResponse:
@@ -29,9 +31,10 @@ class UserService:
         user_data["password_hash"] = await get_password_hash(register_request.password)
         user_orm = await UserRepository.create_user(db_session, user_data)
 
-        return UserInfoResponse.model_validate(user_orm)
+        return construct_from_orm(UserInfoResponse, user_orm)
 
     @staticmethod
+    @transactional
     async def login(
         db_session: AsyncSession, login_request: UserLoginRequest
     ) -> UserLoginResponse:
@@ -48,12 +51,15 @@ class UserService:
         # 生成 JWT token
         access_token = create_access_token(data={"user_id": user_orm.id})
 
-        user_basic = UserBasicInfo.model_validate(user_orm)
-        return UserLoginResponse(
-            access_token=access_token, token_type="bearer", **user_basic.model_dump()
+        return UserLoginResponse.model_construct(
+            id=user_orm.id,
+            name=user_orm.name,
+            access_token=access_token,
+            token_type="bearer",
         )
 
     @staticmethod
+    @transactional
     async def get_current_user_info(
         db_session: AsyncSession, user_id: int
     ) -> UserInfoResponse:
@@ -63,4 +69,4 @@ class UserService:
         if not user_orm:
             raise ApiException(ErrorCode.USER_NOT_FOUND, "用户不存在")
 
-        return UserInfoResponse.model_validate(user_orm)
+        return construct_from_orm(UserInfoResponse, user_orm)
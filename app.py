@@ -1,4 +1,6 @@
+import asyncio
 import os
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -7,14 +9,73 @@ from fastapi.staticfiles import StaticFiles
 from config.settings import settings
 
 from db.init_db import init_database
-from db.database import async_engine
+from db.database import LazyAsyncSession, async_engine
 from exts.logururoute.business_logger import logger
+from exts.middlewares.admission import admission_controller
+from exts.middlewares.inflight import inflight_tracker
 
 # 导入应用工厂
 from app_factory import get_app_factory
 
 # 导入模块路由
 from apis import router_simple_module
+from apis.base.services.simple import SimpleService, name_index
+
+
+async def build_name_index():
+    """后台构建设计单位名称联想索引，失败时联想接口回退为数据库前缀查询"""
+    start = time.perf_counter()
+    session = LazyAsyncSession()
+    try:
+        count = await SimpleService.build_name_index(session)
+        logger.info(
+            f"名称联想索引构建完成: {count} 个名称, "
+            f"耗时 {time.perf_counter() - start:.2f}s"
+        )
+    except Exception as e:
+        logger.error(f"名称联想索引构建失败，联想接口回退为数据库前缀查询: {e}")
+    finally:
+        await session.close()
+
+
+async def maintain_name_index():
+    """
+    构建名称联想索引，之后周期增量刷新（应用其他工作进程的写入）
+
+    构建失败时下个周期重试；刷新间隔为 0 时只构建一次
+    """
+    interval = settings.suggest_index_refresh_interval
+    while True:
+        if not name_index.ready:
+            await build_name_index()
+        else:
+            session = LazyAsyncSession()
+            try:
+                count = await SimpleService.refresh_name_index(session)
+                if count:
+                    logger.debug("名称联想索引增量刷新 {} 条变更", count)
+            except Exception as e:
+                logger.error("名称联想索引增量刷新失败: {}", e)
+            finally:
+                await session.close()
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+async def purge_sync_deletions():
+    """周期清理保留期之前的增量同步删除记录"""
+    while True:
+        session = LazyAsyncSession()
+        try:
+            count = await SimpleService.purge_deletions(session)
+            if count:
+                logger.info("清理过期删除记录 {} 条", count)
+        except Exception as e:
+            logger.error("清理过期删除记录失败: {}", e)
+        finally:
+            await session.close()
+        await asyncio.sleep(settings.sync_tombstone_purge_interval)
 
 
 @asynccontextmanager
@@ -30,10 +91,48 @@ async def lifespan(app: FastAPI):
     # except Exception as e:
     #     logger.error(f"数据库初始化失败: {e}")
 
+    # 事件循环延迟监测（准入控制的过载信号）
+    if settings.admission_enabled:
+        admission_controller.monitor.start()
+
+    # 常驻后台任务：关闭时直接取消，不参与排空
+    background_tasks = []
+    # 名称联想索引在后台构建并周期增量刷新，不阻塞启动
+    if settings.suggest_index_enabled:
+        background_tasks.append(asyncio.ensure_future(maintain_name_index()))
+    # 增量同步删除记录的周期清理
+    if settings.sync_tombstone_retention_days > 0:
+        background_tasks.append(asyncio.ensure_future(purge_sync_deletions()))
+
     yield
 
     # 关闭时的清理代码
     logger.info("关闭 fastapi arch")
+
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # 排空进行中的请求与后台任务，避免中断仍持有数据库会话的事务
+    drain_start = time.perf_counter()
+    inflight_tracker.start_drain()
+    drained = await inflight_tracker.wait_idle(settings.shutdown_drain_timeout)
+    dropped_requests = inflight_tracker.active
+    cancelled_tasks = inflight_tracker.cancel_tasks()
+    log = logger.info if drained else logger.warning
+    log(
+        f"请求排空{'完成' if drained else '超时'}: "
+        f"耗时 {time.perf_counter() - drain_start:.3f}s, "
+        f"未完成请求 {dropped_requests} 个, 取消后台任务 {cancelled_tasks} 个, "
+        f"排空期间拒绝新请求 {inflight_tracker.rejected} 个"
+    )
+
+    await admission_controller.monitor.stop()
+
     # 关闭数据库连接池
     await async_engine.dispose()
     logger.info("关闭数据库连接")
@@ -1,11 +1,18 @@
 from typing import Dict, Tuple
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from config.settings import settings
+from exts.auth import require_metrics_token
 from exts.exceptions.exception_handler import GlobalExceptionHandler
+from exts.metrics.registry import metrics
+from exts.middlewares.admission import AdmissionMiddleware, admission_controller
+from exts.middlewares.inflight import InFlightMiddleware, inflight_tracker
+from exts.middlewares.compression import CompressionMiddleware
+from exts.middlewares.request_context import RequestContextMiddleware
+from exts.responses.api_response import Success
 
 
 class AppFactory:
@@ -78,12 +85,31 @@ class AppFactory:
         # 配置 CORS
         self._setup_cors(app)
 
+        # 配置响应压缩
+        self._setup_compression(app)
+
+        # 配置进行中请求跟踪（用于关闭时排空）
+        self._setup_inflight_tracking(app)
+
+        # 配置准入控制（过载时尽早拒绝新请求）
+        self._setup_admission(app)
+
+        # 配置请求上下文（请求 id、分阶段耗时）
+        # 后添加的中间件位于外层，请求上下文包住以上各中间件，排空与准入拒绝的响应同样带请求 id
+        self._setup_request_context(app)
+
         # 配置异常处理
         self._setup_exception_handling(app)
 
         # 配置限流
         self._setup_rate_limit(app)
 
+        # 配置运行指标接口
+        self._setup_metrics(app)
+
+        # 配置健康检查接口
+        self._setup_health(app)
+
         # 包含所有模块路由
         for module in self.modules.values():
             app.include_router(module["router"])
@@ -131,6 +157,36 @@ class AppFactory:
             allow_headers=["*"],
         )
 
+    def _setup_compression(self, app: FastAPI):
+        """配置响应压缩中间件"""
+        if not settings.compression_enabled:
+            return
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            offload_size=settings.compression_offload_size,
+        )
+
+    def _setup_inflight_tracking(self, app: FastAPI):
+        """配置进行中请求跟踪中间件"""
+        app.add_middleware(InFlightMiddleware)
+
+    def _setup_admission(self, app: FastAPI):
+        """配置准入控制中间件"""
+        if not settings.admission_enabled:
+            return
+        app.add_middleware(
+            AdmissionMiddleware,
+            controller=admission_controller,
+            retry_after=settings.admission_retry_after,
+        )
+
+    def _setup_request_context(self, app: FastAPI):
+        """配置请求上下文中间件（X-Request-ID / Server-Timing）"""
+        app.add_middleware(
+            RequestContextMiddleware, server_timing=settings.server_timing_enabled
+        )
+
     def _setup_exception_handling(self, app: FastAPI):
         """配置全局异常处理"""
         exception_handler = GlobalExceptionHandler()
@@ -142,6 +198,42 @@ class AppFactory:
         """
         app.state.limiter = self.limiter
 
+    def _setup_metrics(self, app: FastAPI):
+        """
+        配置运行指标接口（连接池占用等）
+
+        metrics_enabled 为 False 时不注册；配置了 metrics_token 时需携带 X-Metrics-Token
+        """
+        if not settings.metrics_enabled:
+            return
+
+        async def get_metrics():
+            return Success(metrics.snapshot(), message="获取运行指标成功")
+
+        app.add_api_route(
+            "/metrics",
+            get_metrics,
+            methods=["GET"],
+            summary="获取运行指标",
+            dependencies=[Depends(require_metrics_token)],
+        )
+
+    def _setup_health(self, app: FastAPI):
+        """
+        配置健康检查接口（不访问数据库，过载时也不会被准入控制拒绝）
+        """
+
+        async def get_health():
+            return Success(
+                {
+                    "status": "draining" if inflight_tracker.draining else "ok",
+                    "loop_lag": round(admission_controller.monitor.lag, 6),
+                },
+                message="服务正常",
+            )
+
+        app.add_api_route("/health", get_health, methods=["GET"], summary="健康检查")
+
 
 # 全局工厂实例
 app_factory = AppFactory()
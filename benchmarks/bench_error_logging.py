@@ -0,0 +1,87 @@
+"""
+错误日志开销基准：同一错误码（如 429 / 404 风暴）连续出现 N 次
+
+- 逐条记录：原异常处理器的写法，每次都格式化 request.url 并输出一条日志
+- 去重记录：error_logger 按错误码去重，窗口内只累加计数器
+
+日志输出到 /dev/null 的文本 handler（与控制台格式相同），只统计调用方开销
+
+运行方式:
+    python -m benchmarks.bench_error_logging --n 100000
+"""
+
+import argparse
+import os
+import time
+
+from loguru import logger
+from starlette.requests import Request
+
+from exts.exceptions.error_logger import ErrorLogger
+
+
+def make_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/design_unit/999999",
+            "query_string": b"",
+            "headers": [(b"host", b"test")],
+            "scheme": "http",
+            "server": ("test", 80),
+        }
+    )
+
+
+def log_each(n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        request = make_request()
+        logger.warning(
+            "[BizError] {} {} | Error Code: {} | Message: {}",
+            request.method,
+            request.url,
+            4040,
+            "请求的资源不存在",
+        )
+    return time.perf_counter() - start
+
+
+def log_dedup(n: int, window: float) -> float:
+    error_logger = ErrorLogger(window)
+    start = time.perf_counter()
+    for _ in range(n):
+        request = make_request()
+        error_logger.log(
+            "WARNING", "BizError", 4040, request, "Message: {}", "请求的资源不存在"
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000, help="错误次数")
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    logger.remove()
+    logger.add(
+        devnull,
+        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | {name}:{line} | {message}",
+    )
+
+    n = args.n
+    for label, elapsed in (
+        ("逐条记录 (request.url)", log_each(n)),
+        ("单条记录，不去重", log_dedup(n, 0)),
+        ("单条记录，10 秒窗口去重", log_dedup(n, 10.0)),
+    ):
+        print(f"  {label:<24}: {elapsed / n * 1e6:7.2f} µs/次")
+
+    logger.remove()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+流式导出基准：服务端游标分区导出 vs 一次性加载
+
+向临时 SQLite 文件库写入 N 行设计单位，然后：
+- stream：SimpleService.export_units（AsyncSession.stream + 分区编码）
+- materialize（可选）：scalars().all() + model_validate + 整体序列化，即分页接口的做法
+统计耗时、输出字节数与 tracemalloc 峰值内存
+
+运行方式:
+    python -m benchmarks.bench_export --rows 1000000 --format ndjson
+    python -m benchmarks.bench_export --rows 100000 --materialize
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from apis.base.schemas.simple import DesignUnitResponse
+from apis.base.services.simple import SimpleService
+from db.models import DesignUnit
+from exts.responses.api_response import CustomJSONEncoder
+
+
+async def seed(engine, rows: int, chunk: int = 10_000):
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        for start in range(0, rows, chunk):
+            await conn.execute(
+                insert(DesignUnit),
+                [
+                    {
+                        "name": f"设计院{i}",
+                        "tel": "13800138000",
+                        "email": f"unit{i}@example.com",
+                        "address": f"北京市海淀区中关村大街{i}号",
+                        "contact": "张三",
+                    }
+                    for i in range(start, min(start + chunk, rows))
+                ],
+            )
+
+
+async def bench_stream(factory, export_format: str):
+    tracemalloc.start()
+    size = 0
+    start = time.perf_counter()
+    async with factory() as session:
+        async for chunk in SimpleService.export_units(session, export_format):
+            size += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+async def bench_materialize(factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    async with factory() as session:
+        units = (await session.execute(select(DesignUnit))).scalars().all()
+        data = [DesignUnitResponse.model_validate(unit) for unit in units]
+        body = json.dumps(data, cls=CustomJSONEncoder, ensure_ascii=False)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, len(body.encode("utf-8")), peak
+
+
+async def main_async(args):
+    path = os.path.join(tempfile.mkdtemp(), "bench_export.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    start = time.perf_counter()
+    await seed(engine, args.rows)
+    print(f"写入 {args.rows} 行: {time.perf_counter() - start:.1f}s")
+
+    results = {
+        f"stream({args.format})": await bench_stream(factory, args.format)
+    }
+    if args.materialize:
+        results["materialize"] = await bench_materialize(factory)
+
+    for label, (elapsed, size, peak) in results.items():
+        print(
+            f"  {label:<16}: {elapsed:.2f}s, 输出 {size / 1024 / 1024:.1f} MiB, "
+            f"峰值内存 {peak / 1024 / 1024:.1f} MiB"
+        )
+
+    await engine.dispose()
+    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="数据行数")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument(
+        "--materialize", action="store_true", help="同时测试一次性加载（内存占用大）"
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+仓储查询基准：预构建语句 vs 每次构造语句
+
+对内存 SQLite 执行 N 次 get_unit_by_id，比较：
+- inline：每次调用 select(DesignUnit).where(DesignUnit.id == unit_id)
+- prebuilt：SimpleRepository 中的模块级 bindparam 语句
+另外单独统计仅“构造语句 + 生成缓存键”的 Python 端开销
+
+运行方式:
+    python -m benchmarks.bench_repository --n 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from apis.base.repository.simple import SimpleRepository, _SELECT_UNIT_BY_ID
+from db.models import DesignUnit
+from db.repository import install_compiled_cache
+
+
+async def inline_get_unit_by_id(db_session: AsyncSession, unit_id: int):
+    result = await db_session.execute(
+        select(DesignUnit).where(DesignUnit.id == unit_id)
+    )
+    return result.scalars().first()
+
+
+def bench_construct(n: int):
+    start = time.perf_counter()
+    for i in range(n):
+        select(DesignUnit).where(DesignUnit.id == i)._generate_cache_key()
+    inline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        _SELECT_UNIT_BY_ID._generate_cache_key()
+    prebuilt = time.perf_counter() - start
+    return inline, prebuilt
+
+
+async def bench_queries(n: int):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    cache = install_compiled_cache(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add_all(DesignUnit(name=f"设计院{i}") for i in range(100))
+        await session.commit()
+
+    results = {}
+    for label, func in (
+        ("inline", inline_get_unit_by_id),
+        ("prebuilt", SimpleRepository.get_unit_by_id),
+    ):
+        async with factory() as session:
+            start = time.perf_counter()
+            for i in range(n):
+                await func(session, i % 100 + 1)
+                # 避免身份映射直接命中，模拟每个请求使用新会话的情况
+                session.expunge_all()
+            results[label] = time.perf_counter() - start
+
+    await engine.dispose()
+    return results, cache.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000, help="调用次数")
+    args = parser.parse_args()
+
+    inline, prebuilt = bench_construct(args.n)
+    print(f"构造语句 + 缓存键 x{args.n}")
+    print(f"  inline   : {inline:.3f}s ({inline / args.n * 1e6:.2f} us/次)")
+    print(f"  prebuilt : {prebuilt:.3f}s ({prebuilt / args.n * 1e6:.2f} us/次)")
+
+    results, stats = asyncio.run(bench_queries(args.n))
+    print(f"get_unit_by_id x{args.n}（SQLite 内存库）")
+    for label, elapsed in results.items():
+        print(f"  {label:<9}: {elapsed:.3f}s ({elapsed / args.n * 1e6:.2f} us/次)")
+    print(f"编译缓存: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+请求上下文开销基准
+
+对一个空 ASGI 应用分别直接调用与经 RequestContextMiddleware 调用 N 次，
+两者耗时之差即每个请求的中间件开销（创建上下文、生成请求 id、拼接
+X-Request-ID / Server-Timing 响应头）；另外统计 timed() 阶段计时的单次开销
+
+运行方式:
+    python -m benchmarks.bench_request_context --n 200000
+"""
+
+import argparse
+import asyncio
+import time
+
+from exts.middlewares.request_context import RequestContextMiddleware
+from exts.requestvar.context import timed
+
+_START = {"type": "http.response.start", "status": 200, "headers": []}
+_BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+async def empty_app(scope, receive, send):
+    with timed("db"):
+        pass
+    await send(dict(_START))
+    await send(_BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def bench(app, n: int) -> float:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/design_units",
+        "headers": [(b"host", b"test"), (b"accept", b"application/json")],
+    }
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+def bench_timed(n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        with timed("db"):
+            pass
+    return time.perf_counter() - start
+
+
+async def main_async(n: int):
+    wrapped = RequestContextMiddleware(empty_app)
+    await bench(wrapped, 1000)
+
+    baseline = min([await bench(empty_app, n) for _ in range(3)])
+    with_context = min([await bench(wrapped, n) for _ in range(3)])
+    overhead = (with_context - baseline) / n * 1e6
+    print(f"{n} 次请求:")
+    print(f"  直接调用        : {baseline / n * 1e6:.2f} µs/次")
+    print(f"  请求上下文中间件: {with_context / n * 1e6:.2f} µs/次")
+    print(f"  中间件开销      : {overhead:.2f} µs/请求")
+    print(f"  timed()（请求外）: {bench_timed(n) / n * 1e6:.2f} µs/次")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=200_000, help="请求次数")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+响应模型构造基准：model_validate vs 可信数据快速构造
+
+构造 N 个 DesignUnit ORM 实例（不访问数据库），分别：
+- validate：DesignUnitResponse.model_validate（重新执行名称/手机号/邮箱/地址校验器）
+- construct：utils.construct.construct_many（model_construct，跳过校验）
+并统计两种方式加上 JSON 序列化后的整体耗时
+
+运行方式:
+    python -m benchmarks.bench_response --rows 10000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+from apis.base.schemas.simple import DesignUnitResponse
+from db.models import DesignUnit
+from exts.responses.api_response import CustomJSONEncoder
+from utils.construct import construct_many
+
+
+def make_units(rows: int):
+    now = datetime.now()
+    return [
+        DesignUnit(
+            id=i,
+            name=f"设计院{i}",
+            tel="13800138000",
+            email=f"unit{i}@example.com",
+            address=f"北京市海淀区中关村大街{i}号",
+            contact="张三",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def bench(label: str, convert, units, repeat: int):
+    best_convert = best_total = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = convert(units)
+        converted = time.perf_counter()
+        json.dumps(data, cls=CustomJSONEncoder, ensure_ascii=False)
+        end = time.perf_counter()
+        best_convert = min(best_convert, converted - start)
+        best_total = min(best_total, end - start)
+    print(
+        f"  {label:<10}: 构造 {best_convert * 1000:8.1f} ms, "
+        f"构造+序列化 {best_total * 1000:8.1f} ms"
+    )
+    return best_convert
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000, help="行数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最优）")
+    args = parser.parse_args()
+
+    units = make_units(args.rows)
+    print(f"{args.rows} 行:")
+    validate = bench(
+        "validate",
+        lambda items: [DesignUnitResponse.model_validate(unit) for unit in items],
+        units,
+        args.repeat,
+    )
+    construct = bench(
+        "construct",
+        lambda items: construct_many(DesignUnitResponse, items),
+        units,
+        args.repeat,
+    )
+    print(f"  构造加速: {validate / construct:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+请求校验吞吐基准：DesignUnitCreateRequest
+
+比较：
+- callback：原实现，名称/地址/电话字段使用 BeforeValidator(validate_*) Python 回调
+- native：当前实现，StringConstraints（去空白、长度、正则）由 pydantic-core 校验
+邮箱仍为 Python 校验器，耗时占比高，因此分别统计带邮箱与不带邮箱的载荷；
+另外单独统计邮箱校验在地址重复时，结果缓存与整批校验的效果
+
+运行方式:
+    python -m benchmarks.bench_validation --n 100000
+"""
+
+import argparse
+import re
+import time
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, BeforeValidator, Field
+
+from apis.base.schemas.simple import DesignUnitCreateRequest
+from utils import type as type_module
+from utils.ttl_cache import TTLCache
+from utils.type import MOBILE_PHONE_PATTERN, EmailStr
+
+
+def _validate_length(v: str, name: str, max_len: int) -> str:
+    v = str(v).strip()
+    if not v:
+        raise ValueError(f"{name}不能为空")
+    if len(v) > max_len:
+        raise ValueError(f"{name}长度不能超过{max_len}个字符")
+    return v
+
+
+def _validate_mobile(v: str) -> str:
+    v = str(v).strip()
+    if not v:
+        raise ValueError("手机号不能为空")
+    if not re.match(MOBILE_PHONE_PATTERN, v):
+        raise ValueError("手机号格式不正确，请输入有效的11位中国大陆手机号码")
+    return v
+
+
+# 原实现的 Python 回调校验，作为对照
+_CallbackName = Annotated[
+    str, BeforeValidator(lambda v: _validate_length(v, "名称", max_len=20))
+]
+_CallbackAddress = Annotated[
+    str, BeforeValidator(lambda v: _validate_length(v, "地址", max_len=200))
+]
+_CallbackMobile = Annotated[str, BeforeValidator(_validate_mobile)]
+
+
+class CallbackCreateRequest(BaseModel):
+    """原实现：Python 回调校验"""
+
+    name: _CallbackName = Field(...)
+    tel: Optional[_CallbackMobile] = Field(None)
+    email: Optional[EmailStr] = Field(None)
+    address: Optional[_CallbackAddress] = Field(None)
+    contact: Optional[_CallbackName] = Field(None)
+
+
+def make_payloads(n: int, with_email: bool):
+    return [
+        {
+            "name": f" 广东建筑设计院{i % 1000} ",
+            "tel": "13800138000",
+            "email": f"unit{i}@example.com" if with_email else None,
+            "address": "广州市天河区科韵路88号",
+            "contact": "张三",
+        }
+        for i in range(n)
+    ]
+
+
+def bench(model, payloads, repeat: int) -> float:
+    best = float("inf")
+    validate = model.model_validate
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            validate(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_email(n: int, distinct: int, repeat: int):
+    emails = [f"unit{i % distinct}@example.com" for i in range(n)]
+    type_module._email_cache = TTLCache(maxsize=max(distinct, 1), ttl=3600)
+
+    def uncached():
+        for email in emails:
+            type_module._check_email(email)
+
+    def cached():
+        for email in emails:
+            type_module.validate_email(email)
+
+    def batch():
+        type_module.validate_emails(emails, update_cache=False)
+
+    print(f"{n} 次邮箱校验（{distinct} 个不同地址）:")
+    for label, func in (("uncached", uncached), ("cached", cached), ("batch", batch)):
+        best = float("inf")
+        for _ in range(repeat):
+            type_module._email_cache.clear()
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:<9}: {best:.3f}s, {best / n * 1e6:.2f} µs/次")
+    stats = type_module._email_cache.stats()
+    print(f"  cached 命中率: {stats['hit_rate']:.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000, help="校验次数")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数（取最优）")
+    parser.add_argument(
+        "--distinct-emails", type=int, default=1000, help="邮箱缓存测试中的不同地址数"
+    )
+    args = parser.parse_args()
+
+    for with_email in (False, True):
+        payloads = make_payloads(args.n, with_email)
+        print(f"{args.n} 次校验（{'带' if with_email else '不带'}邮箱）:")
+        results = {
+            "callback": bench(CallbackCreateRequest, payloads, args.repeat),
+            "native": bench(DesignUnitCreateRequest, payloads, args.repeat),
+        }
+        for label, elapsed in results.items():
+            print(
+                f"  {label:<9}: {elapsed:.3f}s, "
+                f"{args.n / elapsed:,.0f} 次/秒, {elapsed / args.n * 1e6:.2f} µs/次"
+            )
+        print(f"  加速: {results['callback'] / results['native']:.1f}x")
+
+    bench_email(args.n, args.distinct_emails, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+过载负载测试：准入控制开启 / 关闭时的延迟分布
+
+模拟数据库变慢：连接池 4 个连接（无溢出），每个请求持有连接执行一条语句后再等待
+--query-ms 毫秒（慢查询），容量约为 4 / query_ms 个请求/秒。以固定到达率（开环，
+不等待前一个请求返回）持续发起超过容量的请求，同时每 100ms 请求一次 /health，统计：
+- 成功请求的 p50 / p99 延迟、被拒绝（503）请求数及其 p99 延迟
+- /health 的 p99 延迟
+
+关闭准入控制时请求在连接池上排队，延迟随时间线性增长；开启后排队数超过阈值即快速拒绝，
+成功请求的 p99 保持在（阈值 / 连接数 + 1）个查询时长左右
+
+运行方式:
+    python -m benchmarks.load_admission --rate 200 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.pool_monitor import InstrumentedAsyncQueuePool
+from exts.middlewares.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    LoopLagMonitor,
+)
+
+POOL_SIZE = 4
+
+
+def build_app(factory, query_seconds: float, controller: AdmissionController):
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+
+    @app.get("/work")
+    async def work():
+        async with factory() as session:
+            await session.execute(text("SELECT 1"))
+            await asyncio.sleep(query_seconds)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+async def run(label: str, path: str, args, max_pool_waiting: int):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=30,
+    )
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monitor = LoopLagMonitor()
+    controller = AdmissionController(
+        max_loop_lag=0.2 if max_pool_waiting else 0,
+        max_pool_waiting=max_pool_waiting,
+        monitor=monitor,
+    )
+    app = build_app(factory, args.query_ms / 1000, controller)
+
+    ok: List[float] = []
+    rejected: List[float] = []
+    health: List[float] = []
+
+    async def request(client: AsyncClient, url: str):
+        start = time.perf_counter()
+        response = await client.get(url)
+        elapsed = time.perf_counter() - start
+        if url == "/health":
+            health.append(elapsed)
+        elif response.status_code == 200:
+            ok.append(elapsed)
+        else:
+            rejected.append(elapsed)
+
+    monitor.start()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        tasks = []
+        total = int(args.rate * args.seconds)
+        interval = 1 / args.rate
+        start = time.perf_counter()
+        for i in range(total):
+            # 开环到达：按计划时间发起，不等待之前的请求
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(request(client, "/work")))
+            if i % max(int(args.rate / 10), 1) == 0:
+                tasks.append(asyncio.ensure_future(request(client, "/health")))
+        await asyncio.gather(*tasks)
+    await monitor.stop()
+    await engine.dispose()
+
+    print(
+        f"  {label:<16}: 成功 {len(ok):>5} 个 p50 {percentile(ok, 0.5) * 1000:8.1f}ms "
+        f"p99 {percentile(ok, 0.99) * 1000:8.1f}ms | "
+        f"拒绝 {len(rejected):>5} 个 p99 {percentile(rejected, 0.99) * 1000:6.1f}ms | "
+        f"/health p99 {percentile(health, 0.99) * 1000:6.1f}ms"
+    )
+
+
+async def main_async(args):
+    path = os.path.join(tempfile.mkdtemp(), "load_admission.db")
+    capacity = POOL_SIZE / (args.query_ms / 1000)
+    print(
+        f"到达率 {args.rate}/s，持续 {args.seconds}s，"
+        f"容量约 {capacity:.0f}/s（{POOL_SIZE} 个连接 x {args.query_ms}ms）"
+    )
+    await run("关闭准入控制", path, args, max_pool_waiting=0)
+    await run("开启准入控制", path, args, max_pool_waiting=args.max_waiting)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=200, help="每秒请求数")
+    parser.add_argument("--seconds", type=float, default=5, help="持续时间（秒）")
+    parser.add_argument("--query-ms", type=int, default=50, help="慢查询耗时（毫秒）")
+    parser.add_argument("--max-waiting", type=int, default=8, help="连接池排队阈值")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+惊群负载测试：并发相同读取合并（single-flight）前后的数据库查询次数
+
+对临时 SQLite 文件库并发发起 N 个 SimpleService.get_unit_by_id（同一热点 id，
+每个调用使用独立会话，模拟独立请求），分别在关闭 / 开启合并时统计实际执行的 SQL 数与耗时
+
+运行方式:
+    python -m benchmarks.load_singleflight --n 1000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from apis.base.services import simple as simple_service
+from apis.base.services.simple import SimpleService
+from db.database import LazyAsyncSession
+from db.models import DesignUnit
+
+
+async def run_herd(factory, n: int, unit_id: int) -> float:
+    async def one_request():
+        return await SimpleService.get_unit_by_id(LazyAsyncSession(factory), unit_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(n)))
+    return time.perf_counter() - start
+
+
+async def main_async(n: int):
+    path = os.path.join(tempfile.mkdtemp(), "load_singleflight.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        unit = DesignUnit(name="热点设计院")
+        session.add(unit)
+        await session.commit()
+        unit_id = unit.id
+
+    queries = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        nonlocal queries
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries += 1
+
+    flight = simple_service._unit_flight
+    print(f"并发 get_unit_by_id x{n}（同一 id）")
+    for enabled in (False, True):
+        flight.enabled = enabled
+        queries = 0
+        elapsed = await run_herd(factory, n, unit_id)
+        label = "合并开启" if enabled else "合并关闭"
+        print(f"  {label}: SELECT {queries} 次, 耗时 {elapsed:.3f}s")
+    print(f"合并统计: {flight.stats()}")
+
+    await engine.dispose()
+    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000, help="并发请求数")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.n))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,42 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
 from sqlmodel import create_engine, Session
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, sessionmaker
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from functools import wraps
+from typing import Any, AsyncGenerator, Callable, Optional
+from fastapi import Request
 
 from config.settings import settings
+from exts.logururoute.business_logger import logger
+from exts.requestvar.context import add_timing
+from .pool_monitor import (
+    pool_monitor,
+    bind_route,
+    route_label,
+    InstrumentedAsyncQueuePool,
+)
+from .query_timeout import guard_query, install_execution_time_hint
+from .repository import install_compiled_cache
+
+
+def _prepared_statement_connect_args(database_url: str) -> dict:
+    """
+    服务端预处理语句配置
+
+    aiomysql 只支持客户端参数拼接，没有服务端预处理语句；asyncpg 默认启用，
+    开启配置时按配置调整其每连接的预处理语句缓存，关闭时保持驱动默认值
+    """
+    if not settings.db_prepared_statements:
+        return {}
+    if make_url(database_url).drivername != "postgresql+asyncpg":
+        return {}
+    return {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size}
 
 
 # 创建异步数据库引擎
@@ -15,8 +47,19 @@ async_engine = create_async_engine(
     max_overflow=settings.max_overflow,
     pool_timeout=settings.pool_timeout,
     pool_recycle=settings.pool_recycle,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=_prepared_statement_connect_args(settings.database_url),
 )
 
+# 连接池占用监控（按路由统计连接持有时长）
+pool_monitor.install(async_engine)
+
+# 服务端语句超时提示（仅 MySQL）
+install_execution_time_hint(async_engine)
+
+# 带命中统计的 SQL 编译缓存
+install_compiled_cache(async_engine, settings.db_compiled_cache_size)
+
 # 创建异步会话工厂
 AsyncSessionLocal = sessionmaker(
     bind=async_engine,
@@ -25,44 +68,259 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
-@asynccontextmanager
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """获取异步数据库会话"""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
+class LazyAsyncSession:
+    """
+    惰性数据库会话代理
+
+    - 首次访问会话属性（execute/add/flush 等）时才创建真实的 AsyncSession
+    - 只有真正执行过语句的会话才会从连接池签出连接
+    - 未产生任何数据库操作时，commit/rollback 直接跳过
+    - 语句执行受超时保护，超时或被取消时终止数据库端语句
+    """
+
+    __slots__ = ("_session_factory", "_session")
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = None):
+        self._session_factory = session_factory or AsyncSessionLocal
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """获取真实会话（按需创建）"""
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    @property
+    def is_started(self) -> bool:
+        """是否已创建真实会话"""
+        return self._session is not None
+
+    @property
+    def has_pending_work(self) -> bool:
+        """是否存在需要提交或回滚的事务/未刷新的对象"""
+        session = self._session
+        if session is None:
+            return False
+        return bool(
+            session.in_transaction() or session.new or session.dirty or session.deleted
+        )
+
+    async def commit(self) -> None:
+        """提交事务（无数据库操作时跳过）"""
+        if self.has_pending_work:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        """回滚事务（无数据库操作时跳过）"""
+        if self.has_pending_work:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        """
+        关闭真实会话并将连接归还连接池
+
+        关闭后代理仍可继续使用，下次访问时会重新创建会话
+        """
+        session, self._session = self._session, None
+        if session is not None:
             await session.close()
 
+    # 会发出 SQL 的方法统一经过语句超时保护（见 db/query_timeout.py）
+    async def execute(self, *args, **kwargs):
+        return await guard_query(self.session, self.session.execute(*args, **kwargs))
+
+    async def scalar(self, *args, **kwargs):
+        return await guard_query(self.session, self.session.scalar(*args, **kwargs))
+
+    async def scalars(self, *args, **kwargs):
+        return await guard_query(self.session, self.session.scalars(*args, **kwargs))
+
+    async def get(self, *args, **kwargs):
+        return await guard_query(self.session, self.session.get(*args, **kwargs))
+
+    async def flush(self, *args, **kwargs):
+        session = self._session
+        # 没有待刷新的对象时不发出语句，也不签出连接
+        if session is None or not (session.new or session.dirty or session.deleted):
+            return None
+        return await guard_query(session, session.flush(*args, **kwargs))
+
+    async def refresh(self, *args, **kwargs):
+        return await guard_query(self.session, self.session.refresh(*args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncGenerator[LazyAsyncSession, None]:
+    """获取异步数据库会话（惰性签出连接）"""
+    session = LazyAsyncSession()
+    try:
+        yield session
+    finally:
+        await session.close()
+
 
 '''
 函数正常结束 → 自动commit()
 抛出异常 → 自动rollback()
+未执行任何语句 → 跳过 commit()/rollback()
 '''
 @asynccontextmanager
-async def get_async_session_with_transaction() -> AsyncGenerator[AsyncSession, None]:
-    """获取自动事务管理的异步数据库会话"""
-    async with AsyncSessionLocal() as session:
+async def get_async_session_with_transaction() -> (
+    AsyncGenerator[LazyAsyncSession, None]
+):
+    """获取自动事务管理的异步数据库会话（惰性签出连接）"""
+    session = LazyAsyncSession()
+    try:
+        yield session
+        # 自动提交事务
+        await session.commit()
+    except Exception:
+        # 自动回滚
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+# 当前处于工作单元中的会话（嵌套的工作单元 / transactional 方法并入外层）
+_uow_session_var: ContextVar[Optional[Any]] = ContextVar(
+    "unit_of_work_session", default=None
+)
+
+
+async def _rollback_and_close(db_session: AsyncSession):
+    try:
+        await db_session.rollback()
+    finally:
+        await db_session.close()
+
+
+@asynccontextmanager
+async def unit_of_work(db_session: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    """
+    工作单元：在代码块结束时立即提交并归还连接
+
+    依赖注入的会话要等到响应发送后才清理，使用工作单元可以在
+    接口返回（响应序列化）之前就释放连接。
+
+    同一会话已在工作单元内时并入外层，由最外层统一提交：接口用一个工作单元包住
+    多次服务调用，整个请求只签出一次连接
+
+    使用方式:
+        async with unit_of_work(db_session):
+            version = await SimpleService.get_units_version(db_session, ...)
+            result = await SimpleService.get_units(db_session, ...)
+        return Success(result)
+    """
+    if _uow_session_var.get() is db_session:
+        yield db_session
+        return
+
+    token = _uow_session_var.set(db_session)
+    try:
+        yield db_session
+        await db_session.commit()
+    except asyncio.CancelledError:
+        # 任务正在被取消：回滚与归还连接不能被再次取消打断，否则连接无法归还
+        await asyncio.shield(_rollback_and_close(db_session))
+        raise
+    except BaseException:
+        await _rollback_and_close(db_session)
+        raise
+    else:
+        await db_session.close()
+    finally:
+        _uow_session_var.reset(token)
+
+
+def after_commit(db_session: AsyncSession, callback: Callable[[], Any]):
+    """
+    注册提交成功后执行的回调（如更新内存索引），回滚时丢弃
+
+    回调在事务提交后同步执行，异常只记录日志，不影响已提交的事务
+
+    使用方式:
+        after_commit(db_session, lambda: name_index.add(unit.id, unit.name))
+    """
+    db_session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _run_after_commit_callbacks(session: OrmSession):
+    for callback in session.info.pop("after_commit", ()):
         try:
-            yield session
-            # 自动提交事务
-            await session.commit()
-        except Exception:
-            # 自动回滚
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+            callback()
+        except Exception as e:
+            logger.error(f"事务提交后回调执行失败: {e}")
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_after_commit_callbacks(session: OrmSession):
+    session.info.pop("after_commit", None)
+
+
+# 请求内数据库语句耗时计入 Server-Timing 的 db 阶段
+# 开始时间记在本次执行的上下文上：语句出错时 after_cursor_execute 不触发，
+# 由 handle_error 结束计时，不会在连接上残留
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _record_query_time(context):
+    start = getattr(context, "_query_start", None)
+    if start is not None:
+        context._query_start = None
+        add_timing("db", time.perf_counter() - start)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    _record_query_time(context)
+
+
+@event.listens_for(Engine, "handle_error")
+def _stop_query_timer_on_error(exception_context):
+    _record_query_time(exception_context.execution_context)
+
+
+def transactional(func: Callable) -> Callable:
+    """
+    服务层事务装饰器
+
+    被装饰方法的第一个参数必须是数据库会话，方法返回后立即提交并归还连接，
+    抛出异常时回滚；调用方已开启同一会话的工作单元时并入其中，不单独提交
+
+    使用方式:
+        class SimpleService:
+            @staticmethod
+            @transactional
+            async def create_unit(db_session, request): ...
+    """
+
+    @wraps(func)
+    async def wrapper(db_session: AsyncSession, *args, **kwargs):
+        async with unit_of_work(db_session):
+            return await func(db_session, *args, **kwargs)
+
+    return wrapper
 
 
 # 依赖注入函数
-async def depends_get_db_session():
+async def depends_get_db_session(request: Request):
     """数据库会话依赖注入"""
+    bind_route(route_label(request))
     async with get_async_session() as session:
         yield session
 
 
-async def depends_get_db_session_with_transaction():
+async def depends_get_db_session_with_transaction(request: Request):
     """数据库会话依赖注入（带自动事务管理）"""
+    bind_route(route_label(request))
     async with get_async_session_with_transaction() as session:
         yield session
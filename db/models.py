@@ -2,7 +2,7 @@ from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import func
+from sqlalchemy import Index, func
 
 
 class BaseModel(SQLModel):
@@ -30,6 +30,7 @@ class User(BaseModel, table=True):
     """用户表"""
 
     __tablename__ = "user"
+    __table_args__ = (Index("ix_user_name", "name"),)
 
     name: str = Field(max_length=10, description="用户名")
     password_hash: str = Field(description="密码哈希")
@@ -39,9 +40,35 @@ class DesignUnit(BaseModel, table=True):
     """设计单位表"""
 
     __tablename__ = "design_unit"
+    __table_args__ = (
+        # 名称唯一性检查与前缀搜索
+        Index("ix_design_unit_name", "name"),
+        Index("ix_design_unit_contact", "contact"),
+        # 列表按创建时间过滤与排序
+        Index("ix_design_unit_created_at_id", "created_at", "id"),
+        # 增量同步按 (updated_at, id) 键集分页
+        Index("ix_design_unit_updated_at_id", "updated_at", "id"),
+    )
 
     name: str = Field(..., description="设计单位名称")
     tel: Optional[str] = Field(default=None, description="联系电话")
     email: Optional[str] = Field(default=None, description="邮箱")
     address: Optional[str] = Field(default=None, description="地址")
     contact: Optional[str] = Field(default=None, description="联系人")
+
+
+class DesignUnitTombstone(SQLModel, table=True):
+    """设计单位删除记录（供增量同步下发删除）"""
+
+    __tablename__ = "design_unit_tombstone"
+    __table_args__ = (
+        Index("ix_design_unit_tombstone_deleted_at_id", "deleted_at", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    unit_id: int = Field(..., description="被删除的设计单位 id")
+    deleted_at: Optional[datetime] = Field(
+        default=None,
+        description="删除时间",
+        sa_column_kwargs={"server_default": func.now()},
+    )
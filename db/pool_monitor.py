@@ -0,0 +1,223 @@
+"""
+连接池占用监控
+
+- 记录每次连接签出到归还的持有时长，并按路由模板归类，用于定位长时间占用连接的接口
+- 记录连接获取等待时长、溢出连接使用量以及获取超时次数
+- 根据观测到的并发量给出连接池容量建议（仪表盘 + 告警日志），不修改连接池本身
+"""
+
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from config.settings import settings
+from exts.logururoute.business_logger import logger
+from exts.metrics.registry import metrics, MetricsRegistry
+
+# 当前请求的路由模板（由数据库会话依赖写入）
+_route_var: ContextVar[str] = ContextVar("db_pool_route", default="-")
+
+# 连接持有时长分桶（单位：秒）
+HOLD_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+# 连接获取等待时长分桶（单位：秒）
+WAIT_TIME_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+def route_label(request: Request) -> str:
+    """获取请求的路由模板，未匹配路由时退化为原始路径"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or request.url.path
+
+
+def bind_route(route: str):
+    """将路由模板绑定到当前上下文，供连接签出时记录"""
+    _route_var.set(route)
+
+
+class PoolSizeAdvisor:
+    """
+    连接池容量建议器（只给出建议，不修改连接池）
+
+    按固定时间窗口记录同时签出连接数的峰值，取最近若干窗口的最大峰值乘以余量系数
+    作为建议容量，每个窗口结束时写入 db_pool_recommended_size 仪表盘；
+    开启 adaptive 时，建议容量超过配置容量（pool_size + max_overflow）会记录告警日志，
+    由运维据此调整配置
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        history: int = 10,
+        headroom: float = 1.2,
+        adaptive: bool = False,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.window_seconds = window_seconds
+        self.headroom = headroom
+        self.adaptive = adaptive
+        self.registry = registry
+        self.peaks = deque(maxlen=history)
+        self._window_start = time.monotonic()
+        self._window_peak = 0
+        self._warned_size: Optional[int] = None
+
+    def observe(self, in_use: int, pool) -> None:
+        """记录一次签出时的并发连接数，窗口结束时更新建议值"""
+        if in_use > self._window_peak:
+            self._window_peak = in_use
+        now = time.monotonic()
+        if now - self._window_start < self.window_seconds:
+            return
+        self.peaks.append(self._window_peak)
+        self._window_start = now
+        self._window_peak = 0
+        self.publish(pool)
+
+    def recommended_size(self) -> Optional[int]:
+        """建议的连接总数（常驻 + 溢出），尚无完整窗口时返回 None"""
+        if not self.peaks:
+            return None
+        return max(1, math.ceil(max(self.peaks) * self.headroom))
+
+    def publish(self, pool) -> None:
+        """输出建议值；建议容量超过配置容量时告警（同一建议值只告警一次）"""
+        recommended = self.recommended_size()
+        if recommended is None:
+            return
+        self.registry.set_gauge("db_pool_recommended_size", recommended)
+        if not self.adaptive or pool is None:
+            return
+        capacity = pool.size() + settings.max_overflow
+        if recommended > capacity and recommended != self._warned_size:
+            self._warned_size = recommended
+            logger.warning(
+                "连接池容量不足: 建议 {} 个连接，当前配置 {} 个"
+                "（pool_size={}, max_overflow={}）",
+                recommended,
+                capacity,
+                pool.size(),
+                settings.max_overflow,
+            )
+
+
+class PoolMonitor:
+    """连接池占用监控器"""
+
+    def __init__(self, registry: MetricsRegistry = metrics):
+        self.registry = registry
+        self.waiting = 0
+        self._engine = None
+        self.advisor = PoolSizeAdvisor(
+            window_seconds=settings.pool_adaptive_window,
+            headroom=settings.pool_adaptive_headroom,
+            adaptive=settings.pool_adaptive,
+        )
+
+    def install(self, engine: AsyncEngine):
+        """
+        为引擎注册连接池事件监听
+
+        :param engine: 异步数据库引擎
+        """
+        sync_engine = engine.sync_engine
+        self._engine = sync_engine
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        self.registry.register_collector("db_pool", lambda: self.pool_status(engine))
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        route = _route_var.get()
+        connection_record.info["checkout_at"] = time.perf_counter()
+        connection_record.info["checkout_route"] = route
+        self.registry.inc("db_pool_checkouts_total", route=route)
+
+        pool = self._engine.pool
+        checkedout = getattr(pool, "checkedout", None)
+        if checkedout is not None:
+            self.advisor.observe(checkedout(), pool)
+            overflow = pool.overflow()
+            if overflow > 0:
+                self.registry.inc("db_pool_overflow_checkouts_total")
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        """记录一次连接获取的等待时长"""
+        self.registry.observe(
+            "db_pool_wait_seconds", seconds, buckets=WAIT_TIME_BUCKETS
+        )
+        if timed_out:
+            self.registry.inc("db_pool_timeouts_total")
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop("checkout_at", None)
+        if checkout_at is None:
+            return
+        route = connection_record.info.pop("checkout_route", "-")
+        self.registry.observe(
+            "db_pool_hold_seconds",
+            time.perf_counter() - checkout_at,
+            buckets=HOLD_TIME_BUCKETS,
+            route=route,
+        )
+
+    def pool_status(self, engine: AsyncEngine) -> Dict[str, Any]:
+        """获取连接池当前状态"""
+        pool = engine.pool
+        status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if method is not None:
+                status[name] = method()
+        status["waiting"] = self.waiting
+        status["max_overflow"] = getattr(pool, "_max_overflow", None)
+        status["recommended_size"] = self.advisor.recommended_size()
+        status["adaptive"] = self.advisor.adaptive
+        return status
+
+
+# 全局连接池监控器
+pool_monitor = PoolMonitor()
+
+
+class _InstrumentedAsyncQueue(AsyncAdaptedQueue):
+    """统计排队数的连接队列：只有队列为空、需要阻塞等待归还连接时才计入"""
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        if not block or not self._queue.empty():
+            return super().get(block, timeout)
+        pool_monitor.waiting += 1
+        try:
+            return super().get(block, timeout)
+        finally:
+            pool_monitor.waiting -= 1
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    带等待时长统计的异步连接池
+
+    统计从申请连接到拿到连接的耗时（包含排队等待与新建连接），以及获取超时次数；
+    排队数（pool_monitor.waiting）只统计连接池耗尽、在队列上阻塞等待的请求，
+    直接拿到空闲连接或新建连接的签出不计入
+    """
+
+    _queue_class = _InstrumentedAsyncQueue
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except sa_exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_monitor.record_wait(time.perf_counter() - start, timed_out)
@@ -0,0 +1,221 @@
+"""
+数据库查询超时与取消
+
+- 客户端：每次会话操作设置一个定时器，到期时若有语句正在执行，先在数据库端终止该语句，
+  驱动随即返回错误；没有执行中的语句（如等待连接）时直接取消。超时抛出 QueryTimeoutError
+- 服务端：MySQL 的 SELECT 语句自动附加 MAX_EXECUTION_TIME 优化器提示
+- 超时后作废当前连接，避免带着未完成语句的连接被归还到连接池
+
+执行中的连接由 before/after_cursor_execute 事件记录，不提前签出连接：
+没有发出语句的操作（无待刷新对象的 flush、命中标识映射的 get）不会占用连接。
+请求被外部取消时，驱动会等待正在执行的语句，该语句最迟在超时到期时被终止。
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from config.settings import settings
+from exts.logururoute.business_logger import logger
+
+# 当前请求的单条语句超时（秒），未设置时使用全局配置
+_timeout_var: ContextVar[Optional[float]] = ContextVar("db_query_timeout", default=None)
+
+# 当前会话操作的超时守卫（由 guard_query 设置，语句执行事件读取）
+_guard_var: ContextVar[Optional["_StatementGuard"]] = ContextVar(
+    "db_statement_guard", default=None
+)
+
+# MySQL 错误码：超过 MAX_EXECUTION_TIME 被服务端中断
+MYSQL_ER_QUERY_TIMEOUT = 3024
+
+# 终止语句后等待驱动返回的最长时间（秒），超过后强制取消
+KILL_GRACE_SECONDS = 5
+
+# 进行中的终止任务（保留引用，避免执行中被垃圾回收）
+_kill_tasks: Set[asyncio.Task] = set()
+
+
+class QueryTimeoutError(SQLAlchemyError):
+    """数据库语句执行超时（由异常处理器映射为 DATABASE_QUERY_TIMEOUT）"""
+
+
+def query_timeout(seconds: float):
+    """
+    路由级查询超时配置
+
+    使用方式:
+        @router.get("/path", dependencies=[Depends(query_timeout(3))])
+
+    :param seconds: 单条语句最长执行时间，0 表示不限制
+    """
+
+    # 必须是异步依赖：同步依赖在线程池中执行，设置的 ContextVar 不会回传到请求上下文
+    async def dependency():
+        _timeout_var.set(seconds)
+
+    return dependency
+
+
+def current_query_timeout() -> float:
+    """获取当前上下文的语句超时（秒）"""
+    timeout = _timeout_var.get()
+    return settings.db_query_timeout if timeout is None else timeout
+
+
+def install_execution_time_hint(engine: AsyncEngine):
+    """
+    为 MySQL 引擎注册服务端超时提示
+
+    SELECT 语句改写为 SELECT /*+ MAX_EXECUTION_TIME(ms) */ ...，
+    即使客户端连接异常断开，服务端也会按时终止查询
+    """
+    if engine.dialect.name != "mysql":
+        return
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute", retval=True)
+    def _add_hint(conn, cursor, statement, parameters, context, executemany):
+        timeout = current_query_timeout()
+        if timeout and statement[:6].upper() == "SELECT":
+            statement = (
+                f"SELECT /*+ MAX_EXECUTION_TIME({int(timeout * 1000)}) */"
+                + statement[6:]
+            )
+        return statement, parameters
+
+
+async def _kill_statement(engine: AsyncEngine, driver_connection: Any):
+    """终止连接上正在执行的语句（按方言）"""
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        thread_id = int(driver_connection.thread_id())
+        async with engine.connect() as killer:
+            await killer.execute(text(f"KILL QUERY {thread_id}"))
+    elif dialect == "sqlite":
+        await driver_connection.interrupt()
+
+
+async def _kill_in_background(engine: AsyncEngine, driver_connection: Any):
+    try:
+        await asyncio.wait_for(
+            _kill_statement(engine, driver_connection), KILL_GRACE_SECONDS
+        )
+    except Exception as e:
+        logger.warning("终止数据库语句失败: {}: {}", type(e).__name__, e)
+
+
+class _StatementGuard:
+    """单次会话操作的超时守卫"""
+
+    __slots__ = ("engine", "conn", "task", "handle", "expired", "cancelled")
+
+    def __init__(self, engine: AsyncEngine, task: asyncio.Task):
+        self.engine = engine
+        self.conn: Optional[Connection] = None  # 正在执行语句的连接
+        self.task = task
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.expired = False
+        self.cancelled = False  # 是否由守卫取消了任务
+
+    def arm(self, timeout: float):
+        self.handle = asyncio.get_running_loop().call_later(timeout, self.expire)
+
+    def disarm(self):
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+    def expire(self):
+        """定时器到期：终止执行中的语句，或直接取消"""
+        self.expired = True
+        conn = self.conn
+        if conn is None or self.engine is None:
+            self._cancel()
+            return
+        loop = asyncio.get_running_loop()
+        task = loop.create_task(
+            _kill_in_background(self.engine, conn.connection.driver_connection)
+        )
+        _kill_tasks.add(task)
+        task.add_done_callback(_kill_tasks.discard)
+        # 驱动在宽限期内未返回时强制取消
+        self.handle = loop.call_later(KILL_GRACE_SECONDS, self._cancel)
+
+    def _cancel(self):
+        self.handle = None
+        self.cancelled = True
+        self.task.cancel()
+
+    def consume_cancel(self) -> bool:
+        """
+        取消是否只来自守卫（转为超时错误）；同时还有外部取消时返回 False，照常传播
+
+        Python 3.11+ 撤销守卫发出的取消计数，3.9/3.10 无法区分，按超时处理
+        """
+        if not self.cancelled:
+            return False
+        uncancel = getattr(self.task, "uncancel", None)
+        return uncancel is None or uncancel() == 0
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _mark_executing(conn, cursor, statement, parameters, context, executemany):
+    guard = _guard_var.get()
+    if guard is not None:
+        guard.conn = conn
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _mark_finished(conn, cursor, statement, parameters, context, executemany):
+    guard = _guard_var.get()
+    if guard is not None:
+        guard.conn = None
+
+
+async def _invalidate(session: AsyncSession):
+    try:
+        await session.invalidate()
+    except Exception as e:
+        logger.warning("作废数据库连接失败: {}: {}", type(e).__name__, e)
+
+
+async def guard_query(session: AsyncSession, awaitable: Awaitable[Any]) -> Any:
+    """
+    以当前超时配置执行一次会话操作
+
+    超时后作废会话的连接并抛出 QueryTimeoutError，会话需回滚或关闭后才能继续使用
+
+    :param session: 执行该操作的会话
+    :param awaitable: 会话方法返回的协程（如 session.execute(...)）
+    """
+    timeout = current_query_timeout()
+    if not timeout:
+        return await awaitable
+
+    guard = _StatementGuard(session.bind, asyncio.current_task())
+    token = _guard_var.set(guard)
+    try:
+        guard.arm(timeout)
+        try:
+            return await awaitable
+        finally:
+            guard.disarm()
+    except asyncio.CancelledError:
+        # 到期强制取消（等待连接、驱动未在宽限期内返回）；外部取消照常传播
+        if not guard.consume_cancel():
+            raise
+        await _invalidate(session)
+        raise QueryTimeoutError(f"语句执行超过 {timeout}s") from None
+    except Exception as e:
+        # 语句在数据库端被终止后驱动抛出的中断错误
+        if not guard.expired:
+            raise
+        await _invalidate(session)
+        raise QueryTimeoutError(f"语句执行超过 {timeout}s") from e
+    finally:
+        _guard_var.reset(token)
@@ -0,0 +1,96 @@
+"""
+仓储层公共组件
+
+- BaseRepository：执行模块级预构建语句（bindparam 占位）的辅助方法，
+  避免每次调用都重新构造 select(...).where(...) 并生成缓存键
+- CountingLRUCache：带命中统计的 SQLAlchemy 编译缓存
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.sql import Executable
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.util import LRUCache
+
+from exts.metrics.registry import metrics
+
+
+class CountingLRUCache(LRUCache):
+    """带命中/未命中统计的编译缓存"""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self, capacity: int = 500, threshold: float = 0.5):
+        super().__init__(capacity, threshold)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        if value is default:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def install_compiled_cache(engine: AsyncEngine, capacity: int = 500) -> CountingLRUCache:
+    """
+    为引擎替换带统计的编译缓存，并注册到 /metrics
+
+    :param engine: 异步数据库引擎
+    :param capacity: 缓存容量（语句数）
+    """
+    cache = CountingLRUCache(capacity)
+    engine.sync_engine.update_execution_options(compiled_cache=cache)
+    metrics.register_collector("db_compiled_cache", cache.stats)
+    return cache
+
+
+class BaseRepository:
+    """
+    仓储基类
+
+    使用方式:
+        _SELECT_BY_ID = select(Model).where(Model.id == bindparam("model_id"))
+
+        class ModelRepository(BaseRepository):
+            @staticmethod
+            async def get_by_id(db_session, model_id):
+                return await BaseRepository.fetch_first(
+                    db_session, _SELECT_BY_ID, model_id=model_id
+                )
+    """
+
+    @staticmethod
+    async def fetch_first(
+        db_session: AsyncSession, statement: Executable, **params
+    ) -> Optional[Any]:
+        """执行预构建语句，返回第一行的第一个实体"""
+        result = await db_session.execute(statement, params)
+        return result.scalars().first()
+
+    @staticmethod
+    async def fetch_all(
+        db_session: AsyncSession, statement: Executable, **params
+    ) -> List[Any]:
+        """执行预构建语句，返回所有行的第一个实体"""
+        result = await db_session.execute(statement, params)
+        return result.scalars().all()
+
+    @staticmethod
+    async def exists(db_session: AsyncSession, statement: Executable, **params) -> bool:
+        """执行预构建语句，判断是否存在结果"""
+        result = await db_session.execute(statement, params)
+        return result.first() is not None
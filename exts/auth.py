@@ -2,12 +2,17 @@
 全局认证依赖项
 """
 
-from fastapi import Depends
+import secrets
+from typing import Optional
+
+from fastapi import Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from config.settings import settings
 from utils.jwt import get_user_id_from_token
 from exts.exceptions.api_exception import ApiException
 from exts.exceptions.error_code import ErrorCode
+from exts.requestvar.context import current_context, timed
 
 security = HTTPBearer(auto_error=False)
 
@@ -33,6 +38,31 @@ def get_current_user_id(
     token = credentials.credentials
 
     # 验证 token 并获取用户ID
-    user_id = get_user_id_from_token(token)
+    with timed("auth"):
+        user_id = get_user_id_from_token(token)
+
+    ctx = current_context()
+    if ctx is not None:
+        ctx.user_id = user_id
 
     return user_id
+
+
+def require_metrics_token(
+    x_metrics_token: Optional[str] = Header(None, include_in_schema=False),
+) -> None:
+    """
+    运行指标等内部接口的认证：请求头 X-Metrics-Token 必须与 metrics_token 一致
+
+    未配置 metrics_token 时拒绝访问（调试模式除外），避免默认对外暴露内部运行数据
+
+    Raises:
+        ApiException: 未配置令牌、令牌缺失或不一致时抛出异常
+    """
+    expected = settings.metrics_token
+    if not expected:
+        if settings.debug:
+            return
+        raise ApiException(ErrorCode.FORBIDDEN, "未配置 metrics_token，运行指标接口不可用")
+    if not x_metrics_token or not secrets.compare_digest(x_metrics_token, expected):
+        raise ApiException(ErrorCode.FORBIDDEN, "无权访问运行指标")
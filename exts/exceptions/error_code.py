@@ -11,10 +11,12 @@ from starlette.status import (
     HTTP_404_NOT_FOUND,
     HTTP_405_METHOD_NOT_ALLOWED,
     HTTP_409_CONFLICT,
+    HTTP_410_GONE,
     HTTP_422_UNPROCESSABLE_CONTENT,
     HTTP_429_TOO_MANY_REQUESTS,
     HTTP_500_INTERNAL_SERVER_ERROR,
     HTTP_503_SERVICE_UNAVAILABLE,
+    HTTP_504_GATEWAY_TIMEOUT,
 )
 
 
@@ -67,6 +69,7 @@ class ErrorCode(Enum):
     NOT_FOUND = (4040, "请求的资源不存在", HTTP_404_NOT_FOUND)
     RESOURCE_ALREADY_EXISTS = (4041, "资源已存在", HTTP_409_CONFLICT)
     RESOURCE_CONFLICT = (4042, "资源冲突", HTTP_409_CONFLICT)
+    SYNC_TOKEN_EXPIRED = (4043, "同步令牌已过期，请重新全量同步", HTTP_410_GONE)
 
     # ==================== 外部服务错误 (4100-4199) ====================
     EXTERNAL_SERVICE_ERROR = (4100, "外部服务调用失败", HTTP_503_SERVICE_UNAVAILABLE)
@@ -84,6 +87,8 @@ class ErrorCode(Enum):
     DATABASE_CONNECTION_ERROR = (5002, "数据库连接失败", HTTP_500_INTERNAL_SERVER_ERROR)
     DUPLICATE_KEY_ERROR = (5003, "数据重复，违反唯一性约束", HTTP_409_CONFLICT)
     FOREIGN_KEY_ERROR = (5004, "外键约束错误", HTTP_400_BAD_REQUEST)
+    DATABASE_POOL_TIMEOUT = (5005, "数据库繁忙，请稍后重试", HTTP_503_SERVICE_UNAVAILABLE)
+    DATABASE_QUERY_TIMEOUT = (5006, "数据库查询超时", HTTP_504_GATEWAY_TIMEOUT)
 
     # ==================== 系统错误 (5100-5999) ====================
     INTERNAL_SERVER_ERROR = (
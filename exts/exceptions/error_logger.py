@@ -0,0 +1,146 @@
+"""
+@File: error_logger.py
+@Description: 异常处理器的结构化错误日志（单条记录 + 客户端错误按错误码去重）
+
+每个异常只记录一条日志，路径取 scope["path"]，不构造完整 URL；
+error_tag / error_code（及 suppressed）作为 extra 字段，JSON 日志可直接检索。
+每种错误的 bind 结果与消息前缀只构造一次，记录时只传位置参数。
+
+只对 WARNING 级别（4xx/429 等客户端错误）去重：同一类错误（标签 + 错误码）在 window 秒内
+只记录第一条，其余只计数，窗口结束时补记一条 "N more suppressed"。
+ERROR 级别（数据库错误、未预期异常等）每条都记录，不同的根因不会被合并掉。
+每次出错都累加 errors_total{code=...} 计数器，被抑制的日志不影响指标。
+
+使用方式:
+    error_logger.log("WARNING", "BizError", exc.code, request, "Message: {}", msg)
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+from fastapi import Request
+
+from config.settings import settings
+from exts.logururoute.business_logger import logger
+from exts.metrics.registry import metrics
+
+# 参与去重的日志级别
+DEDUP_LEVEL = "WARNING"
+
+
+class ErrorLogger:
+    """客户端错误按错误码去重的错误日志"""
+
+    def __init__(self, window: float):
+        """
+        :param window: 去重窗口（秒），<= 0 表示每条都记录
+        """
+        self.window = window
+        self.suppressed = 0
+        # (标签, 错误码) -> [窗口开始时间, 窗口内被抑制的条数, 窗口结束时的补记定时器]
+        self._windows: Dict[Tuple[str, int], List[Any]] = {}
+        # (标签, 错误码) -> (绑定了 extra 的 logger, 消息前缀)
+        self._loggers: Dict[Tuple[str, int], Tuple[Any, str]] = {}
+
+    def log(
+        self,
+        level: str,
+        tag: str,
+        code: int,
+        request: Request,
+        detail: str = "",
+        *args: Any,
+    ):
+        """
+        记录一条错误日志
+
+        :param level: 日志级别，WARNING 参与去重
+        :param tag: 错误分类标签，如 BizError
+        :param code: 业务错误码
+        :param request: 当前请求
+        :param detail: 附加信息的格式串（loguru {} 占位符）
+        :param args: 附加信息的参数，只在日志真正输出时格式化
+        """
+        metrics.inc("errors_total", code=code)
+
+        key = (tag, code)
+        suppressed = 0
+        if level == DEDUP_LEVEL and self.window > 0:
+            now = time.monotonic()
+            window = self._windows.get(key)
+            if window is not None and now - window[0] < self.window:
+                if not window[1]:
+                    window[2] = _call_later(
+                        window[0] + self.window - now, self._flush, key
+                    )
+                window[1] += 1
+                self.suppressed += 1
+                return
+            if window is not None:
+                # 补记定时器尚未执行：计数并入本条
+                suppressed = window[1]
+                if window[2] is not None:
+                    window[2].cancel()
+            self._windows[key] = [now, 0, None]
+
+        cached = self._loggers.get(key)
+        if cached is None:
+            cached = self._loggers[key] = (
+                logger.bind(error_tag=tag, error_code=code).opt(depth=1),
+                f"[{tag}] {{}} {{}} | Error Code: {code}",
+            )
+        error_log, message = cached
+        if detail:
+            message += " | " + detail
+        if suppressed:
+            error_log = error_log.bind(suppressed=suppressed)
+            message += f" | {suppressed} more suppressed"
+
+        error_log.log(level, message, request.method, request.scope["path"], *args)
+
+    def _flush(self, key: Tuple[str, int]):
+        """窗口结束：补记被抑制的条数，下一条同类错误重新开始计窗"""
+        window = self._windows.pop(key, None)
+        if window is None or not window[1]:
+            return
+        tag, code = key
+        logger.bind(error_tag=tag, error_code=code, suppressed=window[1]).log(
+            DEDUP_LEVEL,
+            "[{}] Error Code: {} | {} more suppressed in the last {}s",
+            tag,
+            code,
+            window[1],
+            self.window,
+        )
+
+    def reset(self):
+        """清空去重窗口"""
+        for window in self._windows.values():
+            if window[2] is not None:
+                window[2].cancel()
+        self._windows.clear()
+        self._loggers.clear()
+        self.suppressed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """去重统计"""
+        return {
+            "window": self.window,
+            "error_kinds": len(self._windows),
+            "suppressed": self.suppressed,
+            "pending": sum(window[1] for window in self._windows.values()),
+        }
+
+
+def _call_later(delay: float, callback, *args):
+    """在当前事件循环中延迟执行，没有运行中的事件循环时返回 None（由下一条日志补记）"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return loop.call_later(delay, callback, *args)
+
+
+error_logger = ErrorLogger(settings.error_log_window)
+metrics.register_collector("error_log", error_logger.stats)
@@ -7,12 +7,16 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.encoders import jsonable_encoder
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError, DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from slowapi.errors import RateLimitExceeded
 
 from .api_exception import ApiException
 from .error_code import ErrorCode
 from exts.responses.api_response import Error, ApiResponse
-from exts.logururoute.business_logger import logger
+from .error_logger import error_logger
+from config.settings import settings
+from db.query_timeout import MYSQL_ER_QUERY_TIMEOUT, QueryTimeoutError
+from utils.type import validation_message
 
 
 class GlobalExceptionHandler:
@@ -60,9 +64,15 @@ class GlobalExceptionHandler:
         """
         处理业务异常（ApiException）
         """
-        logger.warning(f"[BizError] {request.method} {request.url} ")
-        logger.warning(f"  Error Code: {exc.code} ")
-        logger.warning(f"  Message: {exc.message} ")
+        # 5xx 业务异常（如外部服务不可用）按 ERROR 记录，不参与去重
+        error_logger.log(
+            "ERROR" if exc.http_status >= 500 else "WARNING",
+            "BizError",
+            exc.code,
+            request,
+            "Message: {}",
+            exc.message,
+        )
 
         return Error(
             code=exc.code,
@@ -81,11 +91,16 @@ class GlobalExceptionHandler:
 
         client_ip = get_remote_address(request)
 
-        logger.warning(f"[RateLimitError] {request.method} {request.url}")
-        logger.warning(f"  Client IP: {client_ip}")
-        logger.warning(f"  Rate Limit: {exc.detail}")
-
         error_code = ErrorCode.RATE_LIMIT_EXCEEDED.value
+        error_logger.log(
+            "WARNING",
+            "RateLimitError",
+            error_code[0],
+            request,
+            "Client IP: {} | Rate Limit: {}",
+            client_ip,
+            exc.detail,
+        )
         return ApiResponse(
             success=False,
             code=error_code[0],  # 4290
@@ -98,9 +113,6 @@ class GlobalExceptionHandler:
         """
         处理数据库完整性错误（唯一键冲突、外键约束等）
         """
-        logger.error(f"[IntegrityError] {request.method} {request.url}")
-        logger.error(f"  Error: {str(exc)}")
-
         error_msg = str(exc.orig) if hasattr(exc, "orig") else str(exc)
         error_lower = error_msg.lower()
 
@@ -113,6 +125,10 @@ class GlobalExceptionHandler:
         elif "foreign key" in error_lower:
             target_error = ErrorCode.FOREIGN_KEY_ERROR
 
+        error_logger.log(
+            "ERROR", "IntegrityError", target_error.code, request, "Error: {}", exc
+        )
+
         return Error(
             code=target_error.code,
             message=target_error.message,
@@ -123,25 +139,42 @@ class GlobalExceptionHandler:
 
     async def handle_database_error(self, request: Request, exc: SQLAlchemyError):
         """
-        处理数据库操作错误（连接失败、SQL 语法错误等）
+        处理数据库操作错误（连接失败、连接池获取超时、SQL 语法错误等）
         """
-        logger.error(f"[DatabaseError] {request.method} {request.url}")
-        logger.error(f"  Error Type: {type(exc).__name__}")
-        logger.error(f"  Error: {str(exc)}")
-
         target_error = ErrorCode.DATABASE_ERROR
-
-        # 判断是否为连接错误
-        error_str = str(exc).lower()
-        if isinstance(exc, DBAPIError) and (
-            "connect" in error_str or "connection" in error_str
+        headers = None
+
+        orig_args = getattr(getattr(exc, "orig", None), "args", None)
+        if isinstance(exc, PoolTimeoutError):
+            # 连接池获取超时：可重试错误，提示客户端稍后重试
+            target_error = ErrorCode.DATABASE_POOL_TIMEOUT
+            headers = {"Retry-After": str(settings.pool_retry_after)}
+        elif isinstance(exc, QueryTimeoutError) or (
+            orig_args and orig_args[0] == MYSQL_ER_QUERY_TIMEOUT
         ):
-            target_error = ErrorCode.DATABASE_CONNECTION_ERROR
+            # 客户端语句超时，或服务端 MAX_EXECUTION_TIME 中断的查询
+            target_error = ErrorCode.DATABASE_QUERY_TIMEOUT
+        elif isinstance(exc, DBAPIError):
+            # 判断是否为连接错误
+            error_str = str(exc).lower()
+            if "connect" in error_str or "connection" in error_str:
+                target_error = ErrorCode.DATABASE_CONNECTION_ERROR
+
+        error_logger.log(
+            "ERROR",
+            "DatabaseError",
+            target_error.code,
+            request,
+            "Error Type: {} | Error: {}",
+            type(exc).__name__,
+            exc,
+        )
 
         return Error(
             code=target_error.code,
             message=target_error.message,
             http_status=target_error.http_status,
+            headers=headers,
         )
 
     async def handle_validation_error(
@@ -150,11 +183,20 @@ class GlobalExceptionHandler:
         """
         处理 Pydantic 参数校验异常
         """
-        logger.warning(f"[ParamError] {request.method} {request.url}")
-        logger.warning(f"  Errors: {exc.errors()}")
-
-        # 获取原始错误列表
-        errors = exc.errors()
+        # 获取原始错误列表，约束校验（长度、正则）的英文提示翻译为中文
+        errors = []
+        for error in exc.errors():
+            message = validation_message(error)
+            errors.append({**error, "msg": message} if message else error)
+
+        error_logger.log(
+            "WARNING",
+            "ParamError",
+            ErrorCode.PARAMETER_ERROR.code,
+            request,
+            "Errors: {}",
+            errors,
+        )
         target_error = ErrorCode.VALIDATION_ERROR
         message = target_error.message
 
@@ -190,10 +232,6 @@ class GlobalExceptionHandler:
         """
         处理 HTTP 异常
         """
-        logger.error(f"[HTTPException] {request.method} {request.url}")
-        logger.error(f"  Status Code: {exc.status_code}")
-        logger.error(f"  Detail: {exc.detail}")
-
         # HTTP 状态码映射到错误码
         status_code_map = {
             400: ErrorCode.BAD_REQUEST,
@@ -210,6 +248,16 @@ class GlobalExceptionHandler:
             exc.status_code, ErrorCode.INTERNAL_SERVER_ERROR
         )
 
+        error_logger.log(
+            "ERROR" if exc.status_code >= 500 else "WARNING",
+            "HTTPException",
+            error_code.code,
+            request,
+            "Status Code: {} | Detail: {}",
+            exc.status_code,
+            exc.detail,
+        )
+
         return Error(
             code=error_code.code,
             message=str(exc.detail) if exc.detail else error_code.message,
@@ -224,10 +272,17 @@ class GlobalExceptionHandler:
 
         error_trace = traceback.format_exc()
 
-        logger.error(f"[UnexpectedException] {request.method} {request.url}")
-        logger.error(f"  Exception Type: {type(exc).__name__}")
-        logger.error(f"  Exception Message: {str(exc)}")
-        logger.error(f"  Traceback:\n{error_trace}")
+        # 未预期的异常按 ERROR 记录，不去重，每条都带完整堆栈
+        error_logger.log(
+            "ERROR",
+            "UnexpectedException",
+            ErrorCode.INTERNAL_SERVER_ERROR.code,
+            request,
+            "Exception Type: {} | Exception Message: {}\nTraceback:\n{}",
+            type(exc).__name__,
+            exc,
+            error_trace,
+        )
 
         # 生产环境不暴露详细错误信息
         return Error(
@@ -3,12 +3,29 @@ from sys import stdout
 import os
 
 from config.settings import settings
+from exts.metrics.registry import metrics
+from exts.requestvar.context import patch_log_record
+from .json_sink import JsonLinesSink
+from .sampling import CallSiteRateLimiter, SampledLogger
+
+# 调用点限流器，限流在调用 loguru 之前由 sampled_logger 完成
+rate_limiter = CallSiteRateLimiter(settings.log_rate_limit)
 
 
 def setup_business_logger(log_path: str = None):
     """
     业务日志配置
+
+    - log_mode=text：控制台 + 按天切分的文本文件，经 loguru 队列异步写入（默认）
+    - log_mode=json：JSON Lines 文件由专用线程批量写入，控制台只输出 WARNING 及以上
+    - log_level 控制最低级别，低于该级别的调用在 loguru 入口直接返回，不格式化消息
+    - log_rate_limit > 0 时，经 sampled_logger 记录的热点日志按调用点限流采样
+
+    业务代码使用 logger.info("... {}", value) 的参数形式，消息只在需要输出时才格式化
     """
+    # 请求内的日志自动带上 request_id / user_id（请求之外为 "-"）
+    logger.configure(extra={"request_id": "-"}, patcher=patch_log_record)
+
     # 测试环境，不配置日志
     if os.environ.get("TESTING") == "true":
         return logger
@@ -16,38 +33,55 @@ def setup_business_logger(log_path: str = None):
     # 移除默认的 logger，避免重复输出
     logger.remove()
 
+    level = settings.log_level.upper()
+    rate_limiter.limit = settings.log_rate_limit
+
     # 控制台输出配置
     console_format = (
         "<cyan>{time:YYYY-MM-DD HH:mm:ss.SSS}</cyan> │ "
         "<level>{level: <8}</level> │ "
-        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> │ {message}"
+        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> │ "
+        "{extra[request_id]} │ {message}"
     )
 
+    # 确保日志目录存在
+    log_dir = settings.log_dir
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+
+    if settings.log_mode == "json":
+        # 日志文件路径: log/YYYYMMDD.jsonl
+        sink = JsonLinesSink(
+            os.path.join(log_dir, "%Y%m%d.jsonl"),
+            batch_size=settings.log_batch_size,
+            flush_interval=settings.log_flush_interval,
+        )
+        logger.add(sink, format="{message}", level=level)
+        logger.add(
+            stdout,
+            format=console_format,
+            level=max(logger.level(level).no, logger.level("WARNING").no),
+        )
+        metrics.register_collector("log_sink", sink.stats)
+        metrics.register_collector("log_rate_limit", rate_limiter.stats)
+        return logger
+
     # 添加控制台输出处理器
     logger.add(
         stdout,
         format=console_format,
-        level="DEBUG",
+        level=level,
         enqueue=True,
     )
 
-    # if not log_path:
-    #     # 获取项目根目录路径
-    #     current_file_dir = os.path.split(os.path.realpath(__file__))[0]
-    #     exts_dir = os.path.dirname(current_file_dir)
-    #     log_path = os.path.dirname(exts_dir)
-
-    # 确保日志目录存在
-    log_dir = settings.log_dir
-    # log_dir = os.path.join(log_path, "log")
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir, exist_ok=True)
-
     # 日志文件路径: log/YYYYMMDD.log
     log_file_path = os.path.join(log_dir, "{time:YYYYMMDD}.log")
 
     # 文件日志格式
-    file_format = " {time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | {name}:{function}:{line} | {message}"
+    file_format = (
+        " {time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | {name}:{function}:{line} | "
+        "{extra[request_id]} | {message}"
+    )
 
     # 添加文件日志处理器
     logger.add(
@@ -55,12 +89,16 @@ def setup_business_logger(log_path: str = None):
         format=file_format,
         rotation="00:00",  # 每天凌晨0点切分日志
         encoding="utf-8",
-        level="DEBUG",
+        level=level,
         enqueue=True,
     )
+    metrics.register_collector("log_rate_limit", rate_limiter.stats)
 
     return logger
 
 
 # 初始化业务日志
 logger = setup_business_logger()
+
+# 请求路径上的 DEBUG/INFO 热点日志使用，按调用点限流
+sampled_logger = SampledLogger(logger, rate_limiter)
@@ -0,0 +1,180 @@
+"""
+@File: json_sink.py
+@Description: JSON Lines 日志输出（专用线程批量写入）
+
+记录日志的线程只把记录的几个字段放入内存队列，不做序列化与磁盘 IO；
+专用写线程每 flush_interval 秒或攒满 batch_size 条时，批量编码为 JSON Lines，
+一次 write 写入按天切分的文件（路径模板支持 strftime，如 logs/%Y%m%d.jsonl）。
+
+- 队列有上限，写线程跟不上时丢弃新记录并计数，不阻塞业务线程
+- 作为 loguru sink 使用：logger.add(JsonLinesSink(...), format="{message}")，
+  移除 sink 时 loguru 调用 stop()，写完剩余记录后退出
+- 线程不会随 fork 复制到子进程：sink 在主进程导入应用时创建，serve.py 再 fork 出
+  worker，子进程中由 fork 钩子清空队列并重新启动写线程
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Any, Dict, Optional, TextIO
+
+
+class JsonLinesSink:
+    """批量写入的 JSON Lines 日志 sink"""
+
+    def __init__(
+        self,
+        path_template: str,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        max_queue: int = 100_000,
+    ):
+        """
+        :param path_template: 日志文件路径模板（strftime 格式），按当前日期切分文件
+        :param batch_size: 攒满该条数立即写入
+        :param flush_interval: 最长写入间隔（秒）
+        :param max_queue: 队列上限，超出后丢弃新记录
+        """
+        self.path_template = path_template
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+        self._stopping = False
+        self._start()
+        if hasattr(os, "register_at_fork"):
+            # 弱引用：已移除的 sink 不因钩子而常驻内存
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: _restart_in_child(ref))
+
+    def _start(self):
+        """初始化队列与文件状态并启动写线程"""
+        self._queue: deque = deque()
+        self._wakeup = threading.Event()
+        self._path: Optional[str] = None
+        self._file: Optional[TextIO] = None
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _after_fork(self):
+        """
+        fork 后的子进程：父进程的写线程不存在，队列中的记录由父进程写入，
+        子进程丢弃队列与文件句柄（共享同一文件描述符），重新启动写线程
+        """
+        if self._stopping:
+            return
+        self.written = self.dropped = self.batches = 0
+        self._start()
+
+    # ==================== 业务线程 ====================
+
+    def write(self, message):
+        """loguru 调用：只入队，不编码、不写盘"""
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        record = message.record
+        self._queue.append(
+            (
+                record["time"],
+                record["level"].name,
+                record["name"],
+                record["function"],
+                record["line"],
+                record["message"],
+                record["extra"],
+                record["exception"],
+            )
+        )
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def stop(self):
+        """写完剩余记录后停止写线程"""
+        self._stopping = True
+        self._wakeup.set()
+        # 文件由写线程在写完剩余记录后自行关闭；超时未退出时不关闭，避免与写入竞争
+        self._thread.join(timeout=5)
+
+    # ==================== 写线程 ====================
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            stopping = self._stopping
+            try:
+                while self._queue:
+                    self._write_batch()
+            except Exception:  # noqa: BLE001 写日志失败不能影响写线程
+                traceback.print_exc()
+            if stopping:
+                self._close()
+                return
+
+    def _write_batch(self):
+        queue = self._queue
+        count = min(len(queue), self.batch_size * 4)
+        lines = [_encode(queue.popleft()) for _ in range(count)]
+        file = self._open(time.strftime(self.path_template))
+        file.write("".join(lines))
+        file.flush()
+        self.written += count
+        self.batches += 1
+
+    def _close(self):
+        file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+    def _open(self, path: str) -> TextIO:
+        if path != self._path:
+            if self._file is not None:
+                self._file.close()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+            self._path = path
+        return self._file
+
+    def stats(self) -> Dict[str, Any]:
+        """写入统计"""
+        return {
+            "queued": len(self._queue),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+
+def _restart_in_child(ref: "weakref.ref[JsonLinesSink]"):
+    sink = ref()
+    if sink is not None:
+        sink._after_fork()
+
+
+def _encode(item: tuple) -> str:
+    log_time, level, name, function, line, message, extra, exception = item
+    data = {
+        "time": log_time.isoformat(timespec="milliseconds"),
+        "level": level,
+        "logger": f"{name}:{function}:{line}",
+        "message": message,
+    }
+    if extra:
+        data["extra"] = extra
+    if exception is not None:
+        data["exception"] = "".join(
+            traceback.format_exception(
+                exception.type, exception.value, exception.traceback
+            )
+        )
+    return json.dumps(data, ensure_ascii=False, default=str) + "\n"
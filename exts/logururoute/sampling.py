@@ -0,0 +1,85 @@
+"""
+@File: sampling.py
+@Description: 按调用点限流采样日志（在调用 loguru 之前判定）
+
+同一调用点（代码对象 + 行号）每秒最多输出 limit 条日志，超出部分丢弃；
+该调用点下一条输出的日志在 extra["suppressed"] 中带上被丢弃的条数。
+
+限流在进入 loguru 之前完成：被丢弃的调用不构造记录、不格式化消息、不执行 patcher，
+只有一次取调用帧与字典查找。因此限流只作用于经 SampledLogger 记录的日志，
+用于请求路径上的 DEBUG/INFO 热点调用；WARNING 及以上直接使用 logger，不限流。
+
+使用方式:
+    from exts.logururoute.business_logger import sampled_logger
+    sampled_logger.info("文件保存完成: {}", relative_path)
+"""
+
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+class CallSiteRateLimiter:
+    """按调用点限流"""
+
+    def __init__(self, limit: int):
+        """
+        :param limit: 每个调用点每秒最多输出的条数，<= 0 表示不限流
+        """
+        self.limit = limit
+        self.dropped = 0
+        # 调用点 -> [窗口开始时间, 窗口内已输出条数, 窗口内已丢弃条数]
+        self._windows: Dict[Any, List[float]] = {}
+
+    def allow(self, key: Any) -> Optional[int]:
+        """
+        判定调用点本次能否输出
+
+        :return: 丢弃时返回 None；输出时返回上一窗口被丢弃的条数（没有则为 0）
+        """
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= 1.0:
+            suppressed = int(window[2]) if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            return suppressed
+        if window[1] < self.limit:
+            window[1] += 1
+            return 0
+        window[2] += 1
+        self.dropped += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """限流统计"""
+        return {
+            "limit": self.limit,
+            "call_sites": len(self._windows),
+            "dropped": self.dropped,
+        }
+
+
+class SampledLogger:
+    """按调用点限流的 logger 包装，接口与 loguru 的 debug/info 一致（位置参数）"""
+
+    def __init__(self, logger, limiter: CallSiteRateLimiter):
+        self._logger = logger
+        self._limiter = limiter
+
+    def debug(self, message: str, *args: Any):
+        self._log("DEBUG", message, args)
+
+    def info(self, message: str, *args: Any):
+        self._log("INFO", message, args)
+
+    def _log(self, level: str, message: str, args: tuple):
+        # 帧 0 为 _log，帧 1 为 debug/info，帧 2 为业务调用点
+        log = self._logger.opt(depth=2)
+        if self._limiter.limit > 0:
+            frame = sys._getframe(2)
+            suppressed = self._limiter.allow((frame.f_code, frame.f_lineno))
+            if suppressed is None:
+                return
+            if suppressed:
+                log = log.bind(suppressed=suppressed)
+        log.log(level, message, *args)
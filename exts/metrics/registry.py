@@ -0,0 +1,135 @@
+"""
+进程内指标注册表
+
+提供计数器、仪表盘、直方图以及按需采集的指标，供 /metrics 接口统一导出
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+# 默认直方图分桶（单位：秒）
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class Histogram:
+    """固定分桶直方图"""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # 最后一个桶为 +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[LabelKey, float] = {}
+        self._gauges: Dict[LabelKey, float] = {}
+        self._histograms: Dict[LabelKey, Histogram] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+        return name, tuple(sorted(labels.items())) if labels else ()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """计数器累加"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """设置仪表盘数值"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Optional[Sequence[float]] = None,
+        **labels,
+    ):
+        """记录直方图观测值"""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(
+                    buckets or DEFAULT_BUCKETS
+                )
+            histogram.observe(value)
+
+    def get_counter(self, name: str, **labels) -> float:
+        """读取计数器当前值"""
+        return self._counters.get(self._key(name, labels), 0)
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, Any]]):
+        """注册按需采集的指标（导出时调用）"""
+        self._collectors[name] = collector
+
+    def reset(self):
+        """清空所有已记录的指标（采集器保留）"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _render_key(key: LabelKey) -> str:
+        name, labels = key
+        if not labels:
+            return name
+        return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出当前所有指标"""
+        with self._lock:
+            counters = {self._render_key(k): v for k, v in self._counters.items()}
+            histograms = {
+                self._render_key(k): h.snapshot() for k, h in self._histograms.items()
+            }
+            gauges = {self._render_key(k): v for k, v in self._gauges.items()}
+        collected = {name: collector() for name, collector in self._collectors.items()}
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+            "collectors": collected,
+        }
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
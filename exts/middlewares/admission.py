@@ -0,0 +1,166 @@
+"""
+准入控制与过载保护
+
+数据库变慢时，请求会在连接池上排队直到 pool_timeout，排队越长所有请求的延迟越高。
+AdmissionMiddleware 在请求进入时检查两个过载信号，超过阈值直接返回 503 + Retry-After，
+让客户端尽早重试其他实例，而不是在本实例排队：
+
+- 事件循环延迟：LoopLagMonitor 周期性 sleep，实际唤醒时间与预期之差即延迟；
+  监测任务本身被阻塞时，按已超期的时长估算当前延迟
+- 连接池排队数：正在等待签出连接的请求数（pool_monitor.waiting）
+
+健康检查、运行指标等免检路径始终放行，过载时仍可探活与排查。
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Sequence
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+from db.pool_monitor import pool_monitor
+from exts.exceptions.error_code import ErrorCode
+from exts.metrics.registry import metrics
+from exts.responses.api_response import Error
+
+
+class LoopLagMonitor:
+    """事件循环延迟监测"""
+
+    def __init__(self, interval: float = 0.05):
+        """
+        :param interval: 采样间隔（秒）
+        """
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._expected_wake: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """在当前事件循环中启动监测任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """停止监测任务"""
+        task, self._task = self._task, None
+        self._expected_wake = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        interval = self.interval
+        while True:
+            self._expected_wake = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(loop.time() - self._expected_wake, 0.0)
+            # 上升立即生效，回落时平滑衰减，避免单次采样抖动导致放行与拒绝交替
+            self.lag = lag if lag > self.lag else self.lag * 0.7 + lag * 0.3
+            if lag > self.max_lag:
+                self.max_lag = lag
+
+    def current_lag(self) -> float:
+        """当前延迟估计（秒）：最近采样值与监测任务已超期时长中的较大者"""
+        expected_wake = self._expected_wake
+        if expected_wake is None:
+            return self.lag
+        overdue = asyncio.get_running_loop().time() - expected_wake
+        return overdue if overdue > self.lag else self.lag
+
+
+class AdmissionController:
+    """准入控制器"""
+
+    def __init__(
+        self,
+        max_loop_lag: float,
+        max_pool_waiting: int,
+        exempt_paths: Sequence[str] = ("/health", "/metrics"),
+        monitor: Optional[LoopLagMonitor] = None,
+    ):
+        """
+        :param max_loop_lag: 事件循环延迟阈值（秒），<= 0 表示不检查
+        :param max_pool_waiting: 连接池排队数阈值，<= 0 表示不检查
+        :param exempt_paths: 始终放行的路径
+        """
+        self.max_loop_lag = max_loop_lag
+        self.max_pool_waiting = max_pool_waiting
+        self.exempt_paths = frozenset(exempt_paths)
+        self.monitor = monitor or LoopLagMonitor()
+        self.rejected = 0
+
+    def check(self) -> Optional[str]:
+        """检查是否过载，返回拒绝原因（loop_lag / pool_queue），可准入时返回 None"""
+        if 0 < self.max_pool_waiting <= pool_monitor.waiting:
+            return "pool_queue"
+        if 0 < self.max_loop_lag <= self.monitor.current_lag():
+            return "loop_lag"
+        return None
+
+    def reject(self, reason: str):
+        """记录一次拒绝"""
+        self.rejected += 1
+        metrics.inc("admission_rejected_total", reason=reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """准入控制状态"""
+        return {
+            "loop_lag": round(self.monitor.lag, 6),
+            "max_loop_lag_seen": round(self.monitor.max_lag, 6),
+            "pool_waiting": pool_monitor.waiting,
+            "max_loop_lag": self.max_loop_lag,
+            "max_pool_waiting": self.max_pool_waiting,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionMiddleware:
+    """准入控制中间件（纯 ASGI 实现，放行时只有两次比较）"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController = None,
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.controller = controller or admission_controller
+        self.retry_after = str(retry_after)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        if scope["path"] not in controller.exempt_paths:
+            reason = controller.check()
+            if reason is not None:
+                controller.reject(reason)
+                error = ErrorCode.SERVICE_UNAVAILABLE
+                response = Error(
+                    code=error.code,
+                    message="服务繁忙，请稍后重试",
+                    http_status=error.http_status,
+                    headers={"Retry-After": self.retry_after},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+# 全局准入控制器
+admission_controller = AdmissionController(
+    max_loop_lag=settings.admission_max_loop_lag,
+    max_pool_waiting=settings.admission_max_pool_waiting,
+    exempt_paths=settings.admission_exempt_paths,
+    monitor=LoopLagMonitor(settings.admission_lag_interval),
+)
+metrics.register_collector("admission", admission_controller.stats)
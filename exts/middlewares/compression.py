@@ -0,0 +1,354 @@
+"""
+响应压缩中间件
+
+- 根据 Accept-Encoding 协商 zstd / br / gzip（zstd、br 需安装 zstandard、brotli）
+- 小于阈值的响应、已压缩的内容类型（图片、视频、压缩包等）不压缩
+- 大响应体在线程池中压缩，避免阻塞事件循环；流式响应按块增量压缩，大数据块
+  （如导出）同样在线程池中压缩
+- 除已压缩的静态文件外，所有响应（包括未压缩的）都带 Vary: Accept-Encoding，
+  避免共享缓存把某一编码的响应返回给其他客户端
+- 压缩比与压缩 CPU 耗时通过 /metrics 导出
+"""
+
+import gzip
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from exts.metrics.registry import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 可选依赖
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 可选依赖
+    zstandard = None
+
+
+# 服务端偏好顺序（客户端 q 值相同时按此顺序选择）
+SUPPORTED_ENCODINGS = tuple(
+    encoding
+    for encoding, available in (
+        ("zstd", zstandard is not None),
+        ("br", brotli is not None),
+        ("gzip", True),
+    )
+    if available
+)
+
+# 已压缩的内容类型
+COMPRESSED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/pdf",
+    "application/octet-stream",
+)
+
+# 已压缩的静态文件后缀
+COMPRESSED_EXTENSIONS = frozenset(
+    {
+        ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".ico",
+        ".mp3", ".mp4", ".webm", ".ogg",
+        ".zip", ".gz", ".tgz", ".br", ".zst", ".7z", ".rar",
+        ".woff", ".woff2", ".pdf",
+    }
+)  # fmt: skip
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择压缩算法
+
+    :param accept_encoding: 请求头 Accept-Encoding 的值
+    :return: 选中的编码，不压缩时返回 None
+    """
+    if not accept_encoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            qualities[name] = quality
+
+    wildcard = qualities.get("*")
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+        if quality and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(encoding: str, body: bytes, level: int) -> bytes:
+    """一次性压缩完整响应体"""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class StreamCompressor:
+    """流式响应的增量压缩器"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """压缩一个数据块并立即刷新，保证客户端能及时收到"""
+        if self.encoding == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        if self.encoding == "zstd":
+            return self._compressor.flush()
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionStats:
+    """按编码统计压缩前后字节数与 CPU 耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, encoding: str, size_in: int, size_out: int, cpu_seconds: float):
+        with self._lock:
+            stats = self._stats.setdefault(
+                encoding,
+                {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0},
+            )
+            stats["responses"] += 1
+            stats["bytes_in"] += size_in
+            stats["bytes_out"] += size_out
+            stats["cpu_seconds"] += cpu_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for encoding, stats in self._stats.items():
+                result[encoding] = dict(
+                    stats,
+                    cpu_seconds=round(stats["cpu_seconds"], 6),
+                    ratio=round(stats["bytes_out"] / stats["bytes_in"], 4)
+                    if stats["bytes_in"]
+                    else 1.0,
+                )
+            return result
+
+
+compression_stats = CompressionStats()
+metrics.register_collector("compression", compression_stats.snapshot)
+
+
+def _timed_compress(encoding: str, body: bytes, level: int) -> Tuple[bytes, float]:
+    """压缩并返回所在线程的 CPU 耗时"""
+    start = time.thread_time()
+    compressed = compress_body(encoding, body, level)
+    return compressed, time.thread_time() - start
+
+
+def _vary_sender(send: Send) -> Send:
+    """不压缩（客户端未声明可接受的编码）的响应同样带上 Vary: Accept-Encoding"""
+
+    async def send_with_vary(message: Message):
+        if message["type"] == "http.response.start":
+            MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+        await send(message)
+
+    return send_with_vary
+
+
+class CompressionMiddleware:
+    """响应压缩中间件（纯 ASGI 实现）"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        """
+        :param app: 下游 ASGI 应用
+        :param minimum_size: 小于该字节数的响应不压缩
+        :param offload_size: 大于该字节数的响应（或流式响应的数据块）在线程池中压缩
+        :param levels: 各编码的压缩级别
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.levels = {"zstd": 3, "br": 4, "gzip": 6, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        extension = os.path.splitext(scope.get("path", ""))[1].lower()
+        if extension in COMPRESSED_EXTENSIONS:
+            await self.app(scope, receive, send)
+            return
+        if encoding is None:
+            await self.app(scope, receive, _vary_sender(send))
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """单个响应的压缩处理"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.level = middleware.levels[encoding]
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+        self.stream: Optional[StreamCompressor] = None
+        self.size_in = 0
+        self.size_out = 0
+        self.cpu_seconds = 0.0
+
+    def _should_skip(self, headers: MutableHeaders) -> bool:
+        status = self.start_message["status"]
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return True
+        if "content-range" in headers:
+            return True
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(COMPRESSED_CONTENT_TYPES)
+
+    def _set_encoding_headers(self, headers: MutableHeaders):
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # 压缩后的内容与原始内容字节不同，强 ETag 降级为弱 ETag
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if self._should_skip(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                headers.add_vary_header("Accept-Encoding")
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self._set_encoding_headers(headers)
+            if not more_body:
+                await self._send_whole(headers, body)
+                return
+
+            # 流式响应：增量压缩
+            del headers["Content-Length"]
+            self.stream = StreamCompressor(self.encoding, self.level)
+            await self._send(self.start_message)
+
+        if len(body) >= self.middleware.offload_size:
+            # 同一压缩器的数据块依次提交，不会被多个线程同时使用
+            chunk, cpu_seconds = await run_in_threadpool(
+                self._compress_chunk, body, more_body
+            )
+        else:
+            chunk, cpu_seconds = self._compress_chunk(body, more_body)
+        self.cpu_seconds += cpu_seconds
+        self.size_in += len(body)
+        self.size_out += len(chunk)
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+        if not more_body:
+            compression_stats.record(
+                self.encoding, self.size_in, self.size_out, self.cpu_seconds
+            )
+
+    def _compress_chunk(self, body: bytes, more_body: bool) -> Tuple[bytes, float]:
+        """压缩流式响应的一个数据块，返回压缩结果与所在线程的 CPU 耗时"""
+        start = time.thread_time()
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        return chunk, time.thread_time() - start
+
+    async def _send_whole(self, headers: MutableHeaders, body: bytes):
+        if len(body) >= self.middleware.offload_size:
+            compressed, cpu_seconds = await run_in_threadpool(
+                _timed_compress, self.encoding, body, self.level
+            )
+        else:
+            compressed, cpu_seconds = _timed_compress(self.encoding, body, self.level)
+
+        compression_stats.record(self.encoding, len(body), len(compressed), cpu_seconds)
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self.start_message)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": False}
+        )
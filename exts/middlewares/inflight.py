@@ -0,0 +1,102 @@
+"""
+进行中请求跟踪与优雅排空
+
+- InFlightMiddleware 统计进行中的 HTTP 请求（包含响应发送后执行的 BackgroundTasks）
+- 进入排空阶段后，新请求直接返回 503，已在处理的请求继续完成；
+  serve.py 的工作进程在退出信号处理中进入排空阶段，uvicorn 关闭监听之前到达的请求即被拒绝
+- 应用关闭时先等待请求与后台任务结束，再释放数据库连接池
+"""
+
+import asyncio
+import time
+from typing import Coroutine, Set
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from exts.exceptions.error_code import ErrorCode
+from exts.responses.api_response import Error
+
+
+class InFlightTracker:
+    """进行中请求与后台任务跟踪器"""
+
+    def __init__(self):
+        self.active = 0
+        self.draining = False
+        self.rejected = 0
+        self.tasks: Set[asyncio.Task] = set()
+
+    def track_task(self, coro: Coroutine) -> asyncio.Task:
+        """
+        创建并跟踪一个后台任务，排空阶段会等待其结束
+
+        :param coro: 后台任务协程
+        """
+        task = asyncio.ensure_future(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def start_drain(self):
+        """进入排空阶段，拒绝新请求"""
+        self.draining = True
+
+    @property
+    def pending(self) -> int:
+        """尚未结束的请求与后台任务数"""
+        return self.active + len(self.tasks)
+
+    async def wait_idle(self, timeout: float, interval: float = 0.05) -> bool:
+        """
+        等待所有请求与后台任务结束
+
+        :param timeout: 最长等待时间（秒）
+        :return: 是否在超时前全部结束
+        """
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+        return self.pending == 0
+
+    def cancel_tasks(self) -> int:
+        """取消仍未结束的后台任务，返回取消数量"""
+        tasks = [task for task in self.tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+
+class InFlightMiddleware:
+    """进行中请求跟踪中间件（纯 ASGI 实现，开销仅为计数）"""
+
+    def __init__(self, app: ASGIApp, tracker: InFlightTracker = None):
+        self.app = app
+        self.tracker = tracker or inflight_tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = self.tracker
+        if tracker.draining:
+            tracker.rejected += 1
+            error = ErrorCode.SERVICE_UNAVAILABLE
+            response = Error(
+                code=error.code,
+                message="服务正在重启，请稍后重试",
+                http_status=error.http_status,
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        tracker.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            tracker.active -= 1
+
+
+# 全局请求跟踪器
+inflight_tracker = InFlightTracker()
@@ -0,0 +1,61 @@
+"""
+请求上下文中间件
+
+- 为每个请求创建 RequestContext 并绑定到 contextvar
+- 请求 id 沿用客户端的 X-Request-ID（格式合法时），否则生成新的
+- 响应头附加 X-Request-ID 与 Server-Timing（各阶段耗时）
+
+纯 ASGI 实现，每个请求只有一次 contextvar 设置、一次 id 生成与响应头拼接。
+"""
+
+import os
+import re
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from exts.requestvar.context import RequestContext, request_context_var
+
+_REQUEST_ID_HEADER = b"x-request-id"
+_VALID_REQUEST_ID = re.compile(rb"[A-Za-z0-9._\-]{1,64}")
+
+
+def _incoming_request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == _REQUEST_ID_HEADER:
+            if _VALID_REQUEST_ID.fullmatch(value):
+                return value.decode("ascii")
+            break
+    return os.urandom(8).hex()
+
+
+class RequestContextMiddleware:
+    """请求上下文中间件"""
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(_incoming_request_id(scope))
+        server_timing = self.server_timing
+
+        async def send_with_context(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-request-id", ctx.request_id.encode("ascii")))
+                if server_timing:
+                    headers.append(
+                        (b"server-timing", ctx.server_timing().encode("ascii"))
+                    )
+                message["headers"] = headers
+            await send(message)
+
+        token = request_context_var.set(ctx)
+        await self.app(scope, receive, send_with_context)
+        # 异常时保留上下文：外层 ServerErrorMiddleware 记录的日志仍能带上请求 id；
+        # 服务器为每个请求创建独立任务，上下文不会泄漏到其他请求
+        request_context_var.reset(token)
@@ -0,0 +1,118 @@
+"""
+@File: context.py
+@Description: 请求上下文（请求 id、用户 id、路由模板、分阶段耗时）
+
+RequestContextMiddleware 为每个请求创建 RequestContext 并放入 contextvar，
+同一请求内的依赖、服务、数据库事件与日志都能取到它：
+
+- 日志：patch_log_record 作为 loguru patcher，为每条日志带上 request_id / user_id
+- 耗时：timed("auth") / add_timing("db", seconds) 按阶段累计，响应时写入 Server-Timing
+
+请求之外（启动任务、后台线程）没有上下文，current_context() 返回 None，
+add_timing / timed 直接跳过。
+
+使用方式:
+    from exts.requestvar.context import request_context, timed
+
+    request_context.request_id   # 当前请求 id
+    with timed("auth"):
+        ...
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Optional
+
+from .bing import bind_contextvar
+
+
+class RequestContext:
+    """单个请求的上下文"""
+
+    __slots__ = (
+        "request_id",
+        "user_id",
+        "route",
+        "start",
+        "handler_start",
+        "timings",
+        "loaders",
+    )
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.user_id: Optional[int] = None
+        self.route: Optional[str] = None
+        self.start = time.perf_counter()
+        self.handler_start: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+        # 请求内的批量加载器（DataLoader），按名称与会话区分
+        self.loaders: Dict[Hashable, Any] = {}
+
+    def add_timing(self, phase: str, seconds: float):
+        """累计某阶段耗时（秒）"""
+        timings = self.timings
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """Server-Timing 响应头（毫秒）"""
+        parts = [
+            f"{phase};dur={seconds * 1000:.3f}"
+            for phase, seconds in self.timings.items()
+        ]
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.3f}")
+        return ", ".join(parts)
+
+
+request_context_var: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+# 当前请求上下文的代理（仅在请求内访问）
+request_context = bind_contextvar(request_context_var)
+
+
+def current_context() -> Optional[RequestContext]:
+    """当前请求上下文，请求之外返回 None"""
+    return request_context_var.get()
+
+
+def add_timing(phase: str, seconds: float):
+    """为当前请求累计某阶段耗时，请求之外忽略"""
+    ctx = request_context_var.get()
+    if ctx is not None:
+        ctx.add_timing(phase, seconds)
+
+
+class timed:
+    """
+    阶段计时上下文管理器
+
+    with timed("auth"):
+        ...
+    """
+
+    __slots__ = ("phase", "ctx", "start")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self):
+        self.ctx = request_context_var.get()
+        self.start = time.perf_counter() if self.ctx is not None else 0.0
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.ctx is not None:
+            self.ctx.add_timing(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+def patch_log_record(record: Dict[str, Any]):
+    """loguru patcher：为请求内的日志带上 request_id / user_id"""
+    ctx = request_context_var.get()
+    if ctx is not None:
+        extra = record["extra"]
+        extra["request_id"] = ctx.request_id
+        if ctx.user_id is not None:
+            extra["user_id"] = ctx.user_id
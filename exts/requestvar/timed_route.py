@@ -0,0 +1,68 @@
+"""
+@File: timed_route.py
+@Description: 记录路由模板与参数校验耗时的 APIRoute
+
+FastAPI 在调用端点函数之前完成依赖解析与请求参数校验。TimedRoute 在路由处理开始时
+记下时间与路由模板，端点函数开始执行时把中间的耗时（扣除已单独计时的 auth）
+记为 validation 阶段。
+
+使用方式:
+    router = APIRouter(prefix="/api", route_class=TimedRoute)
+"""
+
+import functools
+import inspect
+import time
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+from .context import request_context_var
+
+
+def _mark_validation():
+    ctx = request_context_var.get()
+    if ctx is not None and ctx.handler_start is not None:
+        elapsed = time.perf_counter() - ctx.handler_start - ctx.timings.get("auth", 0.0)
+        ctx.add_timing("validation", max(elapsed, 0.0))
+        ctx.handler_start = None
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # functools.wraps 保留 __wrapped__，FastAPI 解析的仍是原端点的签名
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            _mark_validation()
+            return await endpoint(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        _mark_validation()
+        return endpoint(*args, **kwargs)
+
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    """记录路由模板与 validation 阶段耗时的路由"""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def timed_handler(request: Request):
+            ctx = request_context_var.get()
+            if ctx is not None:
+                ctx.route = route
+                ctx.handler_start = time.perf_counter()
+            return await handler(request)
+
+        return timed_handler
@@ -11,6 +11,8 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from pydantic import BaseModel
 
+from exts.requestvar.context import timed
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     """自定义 JSON 编码器"""
@@ -92,14 +94,15 @@ class ApiResponse(JSONResponse):
 
     def render(self, content: Any) -> bytes:
         """重写 render 方法，使用自定义 JSON 编码器"""
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-            cls=CustomJSONEncoder,
-        ).encode("utf-8")
+        with timed("serialize"):
+            return json.dumps(
+                content,
+                ensure_ascii=False,
+                allow_nan=False,
+                indent=None,
+                separators=(",", ":"),
+                cls=CustomJSONEncoder,
+            ).encode("utf-8")
 
 
 class Success(ApiResponse):
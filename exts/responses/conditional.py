@@ -0,0 +1,100 @@
+"""
+条件请求（ETag / Last-Modified）支持
+
+使用方式:
+    version = await SimpleService.get_unit_version(db_session, unit_id)
+    if version.matches(request):
+        return NotModified(version)
+    ...
+    return Success(result, headers=version.headers())
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from starlette.responses import Response
+
+
+def make_etag(*parts: Any) -> str:
+    """由资源版本信息生成强 ETag"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    """数据库中的无时区时间按 UTC 处理，并截断到秒（HTTP 日期精度）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    """资源版本（ETag + 最后修改时间）"""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def from_parts(
+        cls, *parts: Any, last_modified: Optional[datetime] = None
+    ) -> "ResourceVersion":
+        return cls(
+            etag=make_etag(*parts),
+            last_modified=_as_utc(last_modified) if last_modified else None,
+        )
+
+    def vary(self, *parts: Any) -> "ResourceVersion":
+        """同一资源的不同表示（如字段子集）派生不同的 ETag"""
+        return ResourceVersion(
+            etag=make_etag(self.etag, *parts), last_modified=self.last_modified
+        )
+
+    def headers(self) -> Dict[str, str]:
+        """响应头：ETag / Last-Modified / Cache-Control"""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """
+        判断客户端缓存是否仍然有效
+
+        If-None-Match 优先（弱比较，兼容压缩中间件降级的弱 ETag），
+        未携带时再比较 If-Modified-Since
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            etag = _strip_weak(self.etag)
+            return any(
+                _strip_weak(candidate.strip()) == etag
+                for candidate in if_none_match.split(",")
+            )
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified <= since
+
+        return False
+
+
+class NotModified(Response):
+    """304 响应"""
+
+    def __init__(self, version: ResourceVersion):
+        super().__init__(status_code=304, headers=version.headers())
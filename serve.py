@@ -0,0 +1,237 @@
+"""
+生产环境启动入口（多进程）
+
+- 主进程预先导入 app 并执行 gc.freeze()，fork 出的工作进程通过写时复制共享只读内存
+- 所有工作进程共享同一个监听 socket
+- 自动选择 uvloop / httptools（已安装时）
+- 工作进程处理一定数量请求后自动重启，限制内存增长
+- 收到 SIGTERM/SIGINT 时通知工作进程停止接收新请求，等待处理中的请求完成后退出；
+  工作进程在信号处理中立即进入排空阶段，uvicorn 关闭监听前到达的新请求直接返回 503
+
+运行方式:
+    python serve.py
+
+开发环境请继续使用 main.py（单进程 + 热重载）
+"""
+
+import gc
+import importlib.util
+import os
+import random
+import signal
+import socket
+import time
+from typing import Dict
+
+import uvicorn
+
+from config.settings import settings
+from exts.logururoute.business_logger import logger
+from exts.middlewares.inflight import inflight_tracker
+
+# 工作进程退出后仍需关闭连接池、刷写日志等，主进程在其耗时预算之外额外等待的时间（秒）
+SHUTDOWN_KILL_MARGIN = 5
+# 工作进程存活不足该时间即退出视为启动失败，重启时进行退避（秒）
+WORKER_MIN_UPTIME = 5.0
+RESPAWN_BACKOFF_BASE = 0.5
+RESPAWN_BACKOFF_MAX = 30.0
+
+
+def select_loop_and_http():
+    """选择事件循环与 HTTP 协议实现，优先使用已安装的 uvloop / httptools"""
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """在主进程中创建监听 socket，由所有工作进程共享"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(settings.server_backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def worker_shutdown_budget() -> float:
+    """
+    工作进程优雅退出的最长耗时（秒）
+
+    uvicorn 先最多等待 graceful_timeout 让连接关闭，随后 lifespan 关闭阶段
+    再最多用 shutdown_drain_timeout 排空请求与后台任务，两段依次进行
+    """
+    return settings.graceful_timeout + settings.shutdown_drain_timeout
+
+
+class DrainingServer(uvicorn.Server):
+    """收到退出信号时先进入排空阶段，再交由 uvicorn 停止接收连接"""
+
+    def handle_exit(self, sig, frame):
+        inflight_tracker.start_drain()
+        super().handle_exit(sig, frame)
+
+
+class WorkerManager:
+    """工作进程管理器（主进程）"""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children: Dict[int, int] = {}  # pid -> 工作进程序号
+        self.started_at: Dict[int, float] = {}  # 工作进程序号 -> 启动时间
+        self.failures: Dict[int, int] = {}  # 工作进程序号 -> 连续启动失败次数
+        self.respawn_at: Dict[int, float] = {}  # 工作进程序号 -> 退避结束后的重启时间
+        self.should_exit = False
+        self.loop, self.http = select_loop_and_http()
+
+    def spawn(self, index: int):
+        """fork 一个工作进程"""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._run_worker(index)
+            except Exception as e:
+                logger.error(f"工作进程 #{index} 异常退出: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = index
+        self.started_at[index] = time.monotonic()
+
+    def _run_worker(self, index: int):
+        """工作进程主体"""
+        # 恢复默认信号处理，由 uvicorn 自行接管
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        # 为最大请求数加入随机抖动，避免所有工作进程同时重启
+        max_requests = None
+        if settings.worker_max_requests > 0:
+            max_requests = settings.worker_max_requests + random.randint(
+                0, settings.worker_max_requests_jitter
+            )
+
+        config = uvicorn.Config(
+            self.app,
+            loop=self.loop,
+            http=self.http,
+            lifespan="on",
+            log_level="info",
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=settings.graceful_timeout,
+        )
+        server = DrainingServer(config)
+        logger.info(f"工作进程 #{index} 启动 pid={os.getpid()}")
+        server.run(sockets=[self.sock])
+
+    def _handle_exit(self, signum, frame):
+        self.should_exit = True
+
+    def _reap(self):
+        """回收已退出的工作进程，并在运行状态下补齐"""
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            index = self.children.pop(pid, None)
+            if index is None:
+                continue
+            logger.info(
+                f"工作进程 #{index} 退出 pid={pid} code={os.waitstatus_to_exitcode(status)}"
+            )
+            if not self.should_exit:
+                self._schedule_respawn(index)
+
+    def _schedule_respawn(self, index: int):
+        """
+        补齐退出的工作进程
+
+        正常运行一段时间后退出（如达到最大请求数）立即重启；启动后很快退出的
+        视为启动失败，按连续失败次数指数退避，避免每 0.5 秒反复 fork
+        """
+        uptime = time.monotonic() - self.started_at.get(index, 0.0)
+        if uptime >= WORKER_MIN_UPTIME:
+            self.failures[index] = 0
+            self.spawn(index)
+            return
+
+        failures = self.failures.get(index, 0) + 1
+        self.failures[index] = failures
+        delay = min(RESPAWN_BACKOFF_BASE * 2 ** (failures - 1), RESPAWN_BACKOFF_MAX)
+        self.respawn_at[index] = time.monotonic() + delay
+        logger.warning(
+            f"工作进程 #{index} 启动 {uptime:.1f}s 后退出（连续 {failures} 次），"
+            f"{delay:.1f}s 后重启"
+        )
+
+    def _respawn_due(self):
+        """重启退避已结束的工作进程"""
+        now = time.monotonic()
+        for index, at in list(self.respawn_at.items()):
+            if at <= now:
+                del self.respawn_at[index]
+                self.spawn(index)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        logger.info(
+            f"主进程启动 pid={os.getpid()} workers={self.workers} "
+            f"loop={self.loop} http={self.http} "
+            f"shutdown_budget={worker_shutdown_budget() + SHUTDOWN_KILL_MARGIN}s"
+        )
+        for index in range(self.workers):
+            self.spawn(index)
+
+        while not self.should_exit:
+            self._reap()
+            self._respawn_due()
+            time.sleep(0.5)
+
+        self.shutdown()
+
+    def shutdown(self):
+        """通知工作进程优雅退出，超时后强制结束"""
+        logger.info("主进程收到退出信号，等待工作进程处理完进行中的请求")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+        # 等待时间由工作进程自身的退出预算推导，避免排空过程中被 SIGKILL
+        deadline = time.monotonic() + worker_shutdown_budget() + SHUTDOWN_KILL_MARGIN
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+
+        for pid in list(self.children):
+            logger.warning(f"工作进程 pid={pid} 未能按时退出，强制结束")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.sock.close()
+        logger.info("主进程退出")
+
+
+def main():
+    # 在主进程中完成应用导入，工作进程 fork 后直接复用
+    from app import app
+
+    # 冻结导入阶段产生的对象，避免工作进程中的 GC 触碰这些页面导致写时复制失效
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(settings.server_host, settings.server_port)
+    workers = settings.workers or os.cpu_count() or 1
+    WorkerManager(app, sock, workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import pytest
+from httpx import AsyncClient
+
+from config.settings import settings
+from exts.exceptions.error_code import ErrorCode
+from tests.integration.api.utils import assert_api_failure, assert_api_success
+
+
+@pytest.mark.asyncio
+async def test_health(client: AsyncClient):
+    """
+    测试场景：健康检查接口不访问数据库，返回服务状态
+    """
+    data = assert_api_success(await client.get("/health"))
+    assert data["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_metrics_requires_token_when_configured(
+    client: AsyncClient, monkeypatch
+):
+    """
+    测试场景：配置 metrics_token 后，/metrics 需携带一致的 X-Metrics-Token
+    """
+    monkeypatch.setattr(settings, "metrics_token", "internal-secret")
+
+    assert_api_failure(await client.get("/metrics"), ErrorCode.FORBIDDEN)
+    assert_api_failure(
+        await client.get("/metrics", headers={"X-Metrics-Token": "wrong"}),
+        ErrorCode.FORBIDDEN,
+    )
+
+    data = assert_api_success(
+        await client.get("/metrics", headers={"X-Metrics-Token": "internal-secret"})
+    )
+    assert "counters" in data
+
+
+@pytest.mark.asyncio
+async def test_metrics_without_token_only_in_debug(client: AsyncClient, monkeypatch):
+    """
+    测试场景：未配置 metrics_token 时 /metrics 默认拒绝访问，仅 debug 模式下开放
+    """
+    monkeypatch.setattr(settings, "metrics_token", "")
+
+    monkeypatch.setattr(settings, "debug", False)
+    assert_api_failure(
+        await client.get("/metrics"), ErrorCode.FORBIDDEN, match_msg="metrics_token"
+    )
+
+    monkeypatch.setattr(settings, "debug", True)
+    assert "counters" in assert_api_success(await client.get("/metrics"))
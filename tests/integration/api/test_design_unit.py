@@ -1,14 +1,38 @@
+import csv
+import json
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
-import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from apis.base.repository.simple import SimpleRepository
+from apis.base.services import simple as simple_service
+from apis.base.services.simple import SimpleService, _encode_sync_token
+from config.settings import settings
+from db.models import DesignUnit, DesignUnitTombstone
 from tests.factories import DesignUnitFactory
+from utils.count_cache import CountCache
+from utils.ngram import NgramIndex
 from tests.integration.api.utils import assert_api_success, assert_api_failure
 from exts.exceptions.error_code import ErrorCode
 
 
+async def backdate_units(db_session: AsyncSession, *unit_ids: int, seconds: int = 10):
+    """把 updated_at 回拨若干秒，代替等待时间戳跨秒（SQLite 时间戳精度为秒）"""
+    rows = await db_session.execute(
+        select(DesignUnit.id, DesignUnit.updated_at).where(DesignUnit.id.in_(unit_ids))
+    )
+    for unit_id, updated_at in rows.all():
+        await db_session.execute(
+            update(DesignUnit)
+            .where(DesignUnit.id == unit_id)
+            .values(updated_at=updated_at - timedelta(seconds=seconds))
+        )
+
+
 @pytest.mark.asyncio
 async def test_create_design_unit_success(client: AsyncClient):
     """
@@ -45,6 +69,11 @@ async def test_create_design_unit_duplicate_name(
         # (字段名, 错误值, 期望包含的错误提示)
         ("email", "not-an-email", "邮箱格式"),  # 场景A: 邮箱格式
         ("tel", "123", "手机号格式"),  # 场景B: 手机号格式
+        ("name", "设" * 21, "名称长度不能超过20个字符"),  # 场景C: 名称过长
+        ("name", "   ", "名称不能为空"),  # 场景D: 去除空白后为空
+        ("tel", "", "手机号不能为空"),  # 场景E: 手机号为空
+        ("name", None, "名称不能为空"),  # 场景F: 名称为 null
+        ("contact", ["x"], "联系人格式不正确"),  # 场景G: 非字符串
     ],
 )
 @pytest.mark.asyncio
@@ -71,10 +100,10 @@ async def test_update_design_unit_updates_timestamp(
     """
     # 创建设计单位
     unit = await DesignUnitFactory.create_async(session=db_session, name="原始设计院")
-    original_updated_at = unit.updated_at
 
-    # 等待至少 1 秒确保时间戳变化
-    await asyncio.sleep(1.1)
+    # 回拨更新时间，确保更新后的时间戳变化
+    await backdate_units(db_session, unit.id)
+    original_updated_at = unit.updated_at - timedelta(seconds=10)
 
     # 更新设计单位
     update_payload = DesignUnitFactory.build_payload(
@@ -105,3 +134,455 @@ async def test_delete_design_unit_success(
     unit = await DesignUnitFactory.create_async(session=db_session)
     response = await client.delete(f"/api/design_unit/{unit.id}")
     assert_api_success(response)
+
+
+@pytest.mark.asyncio
+async def test_get_design_unit_conditional_request(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    测试场景：详情接口携带 If-None-Match / If-Modified-Since 时返回 304
+    """
+    unit = await DesignUnitFactory.create_async(session=db_session)
+    # 回拨更新时间，之后的更新必然改变 ETag
+    await backdate_units(db_session, unit.id)
+    response = await client.get(f"/api/design_unit/{unit.id}")
+    assert_api_success(response)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    response = await client.get(
+        f"/api/design_unit/{unit.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    response = await client.get(
+        f"/api/design_unit/{unit.id}", headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    # 数据更新后 ETag 失效
+    update_payload = DesignUnitFactory.build_payload(contact="新联系人")
+    await client.put(f"/api/design_unit/{unit.id}", json=update_payload)
+    response = await client.get(
+        f"/api/design_unit/{unit.id}", headers={"If-None-Match": etag}
+    )
+    assert assert_api_success(response)["contact"] == "新联系人"
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_design_units_conditional_request(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    测试场景：列表接口 ETag 由本页 max(updated_at)、行数与 id 之和决定，
+    本页按 id 排序，数据与版本由同一条查询得到
+    """
+    for _ in range(3):
+        await DesignUnitFactory.create_async(session=db_session)
+
+    statements = []
+    engine = db_session.bind.sync_engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.get("/api/design_units")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    units = assert_api_success(response)
+    assert [unit["id"] for unit in units] == sorted(unit["id"] for unit in units)
+    assert len(units) == 3
+    assert len(statements) == 1 and "ORDER BY" in statements[0]
+    etag = response.headers["ETag"]
+
+    response = await client.get("/api/design_units", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # 新增数据后本页版本变化
+    await DesignUnitFactory.create_async(session=db_session)
+    response = await client.get("/api/design_units", headers={"If-None-Match": etag})
+    assert len(assert_api_success(response)) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_design_units_by_ids(client: AsyncClient, db_session: AsyncSession):
+    """
+    测试场景：批量按 id 获取，按传入顺序返回，不存在的 id 为 null
+    """
+    first = await DesignUnitFactory.create_async(session=db_session, name="批量一院")
+    second = await DesignUnitFactory.create_async(session=db_session, name="批量二院")
+
+    response = await client.get(
+        "/api/design_units/by_ids",
+        params=[("ids", second.id), ("ids", 999999), ("ids", first.id)],
+    )
+    result = assert_api_success(response)
+    assert [unit and unit["id"] for unit in result] == [second.id, None, first.id]
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+@pytest.mark.asyncio
+async def test_export_design_units_streams_all_rows(
+    client: AsyncClient, db_session: AsyncSession, export_format, monkeypatch
+):
+    """
+    测试场景：流式导出跨多个分区的全部数据（NDJSON / CSV）
+    """
+    monkeypatch.setattr(settings, "export_partition_size", 2)
+    for i in range(5):
+        await DesignUnitFactory.create_async(session=db_session, name=f"导出设计院{i}")
+
+    response = await client.get(
+        "/api/design_units/export", params={"format": export_format}
+    )
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+
+    lines = response.text.lstrip("﻿").strip().splitlines()
+    if export_format == "ndjson":
+        rows = [json.loads(line) for line in lines]
+    else:
+        rows = list(csv.DictReader(lines))
+    ids = [int(row["id"]) for row in rows]
+    assert ids == sorted(ids)
+    assert sorted(row["name"] for row in rows) == [f"导出设计院{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_import_design_units_reports_progress_and_row_errors(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：批量导入按批提交，返回行级错误（格式错误、文件内重复、库中已存在）与汇总
+    """
+    monkeypatch.setattr(settings, "import_batch_size", 2)
+    await DesignUnitFactory.create_async(session=db_session, name="已存在设计院")
+
+    content = (
+        "name,tel,email,address,contact\n"
+        "导入一院,13800138000,a@example.com,广州市天河区,张三\n"
+        "导入二院,123,,,\n"
+        "导入一院,,,,\n"
+        "已存在设计院,,,,\n"
+        "导入三院,,,,\n"
+        "导入四院,,bad-email,,\n"
+    )
+    response = await client.post(
+        "/api/design_units/import",
+        files={"file": ("units.csv", content.encode("utf-8"), "text/csv")},
+    )
+    assert response.status_code == 200
+    report = [json.loads(line) for line in response.text.splitlines()]
+
+    errors = [
+        (item["row"], item["field"]) for item in report if item["type"] == "error"
+    ]
+    assert errors == [(3, "tel"), (4, "name"), (5, "name"), (7, "email")]
+    assert [item["batch"] for item in report if item["type"] == "progress"] == [1, 2, 3]
+    summary = report[-1]
+    assert summary["type"] == "summary"
+    assert (summary["processed"], summary["inserted"], summary["failed"]) == (6, 2, 4)
+
+    result = await client.get(
+        "/api/design_units/export", params={"format": "ndjson"}
+    )
+    names = {json.loads(line)["name"] for line in result.text.splitlines()}
+    assert names == {"已存在设计院", "导入一院", "导入三院"}
+
+
+@pytest.mark.asyncio
+async def test_import_design_units_lookup_error_reported(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：某一批查重查询失败时记为该批的错误记录，后续批次继续导入
+    """
+    monkeypatch.setattr(settings, "import_batch_size", 2)
+    get_existing_names = SimpleRepository.get_existing_names
+    calls = []
+
+    async def flaky_get_existing_names(db_session, names):
+        calls.append(names)
+        if len(calls) == 1:
+            raise OperationalError("SELECT name", {}, Exception("connection lost"))
+        return await get_existing_names(db_session, names)
+
+    monkeypatch.setattr(
+        SimpleRepository, "get_existing_names", flaky_get_existing_names
+    )
+    content = "name\n查重一院\n查重二院\n查重三院\n"
+    response = await client.post(
+        "/api/design_units/import",
+        files={"file": ("units.csv", content.encode("utf-8"), "text/csv")},
+    )
+    assert response.status_code == 200
+    report = [json.loads(line) for line in response.text.splitlines()]
+
+    errors = [item["message"] for item in report if item["type"] == "error"]
+    assert errors == ["第 1 批写入失败，该批 2 行已回滚"]
+    summary = report[-1]
+    assert (summary["processed"], summary["inserted"], summary["failed"]) == (3, 1, 2)
+
+@pytest.mark.asyncio
+async def test_import_design_units_unknown_format(client: AsyncClient):
+    """
+    测试场景：无法识别的导入文件格式
+    """
+    response = await client.post(
+        "/api/design_units/import",
+        files={"file": ("units.xlsx", b"data", "application/octet-stream")},
+    )
+    assert_api_failure(response, expected_error=ErrorCode.PARAMETER_ERROR)
+
+
+@pytest.mark.asyncio
+async def test_design_unit_changes_sync(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：增量同步分页拉取新增与删除，再用令牌只拉取之后的变更
+    """
+    monkeypatch.setattr(settings, "sync_settle_seconds", 0)
+    ids = []
+    for i in range(3):
+        payload = DesignUnitFactory.build_payload(name=f"同步设计院{i}")
+        response = await client.post("/api/design_unit", json=payload)
+        ids.append(assert_api_success(response)["id"])
+    await client.delete(f"/api/design_unit/{ids[0]}")
+    # 回拨更新时间，之后的更新必然晚于本轮同步的水位
+    await backdate_units(db_session, *ids[1:])
+
+    upserts, deletes, token, has_more = [], [], None, True
+    while has_more:
+        params = {"limit": 2, **({"since": token} if token else {})}
+        response = await client.get("/api/design_units/changes", params=params)
+        result = assert_api_success(response)
+        upserts += [unit["id"] for unit in result["upserts"]]
+        deletes += [unit["id"] for unit in result["deletes"]]
+        token, has_more = result["next_token"], result["has_more"]
+
+    assert sorted(upserts) == sorted(ids[1:])
+    assert deletes == [ids[0]]
+
+    # 无新变更
+    response = await client.get("/api/design_units/changes", params={"since": token})
+    result = assert_api_success(response)
+    assert result["upserts"] == [] and result["deletes"] == []
+
+    # 更新后只返回该条
+    payload = DesignUnitFactory.build_payload(name="同步设计院改")
+    await client.put(f"/api/design_unit/{ids[1]}", json=payload)
+    response = await client.get("/api/design_units/changes", params={"since": token})
+    result = assert_api_success(response)
+    assert [unit["name"] for unit in result["upserts"]] == ["同步设计院改"]
+
+    response = await client.get("/api/design_units/changes", params={"since": "bad"})
+    assert_api_failure(response, expected_error=ErrorCode.PARAMETER_ERROR)
+
+
+@pytest.mark.asyncio
+async def test_design_unit_changes_token_expiry(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：签发时间早于删除记录保留期的令牌失效（410），过期删除记录被清理
+    """
+    monkeypatch.setattr(settings, "sync_tombstone_retention_days", 30)
+    stale = datetime.utcnow() - timedelta(days=40)
+    token = _encode_sync_token(stale, 0, stale, 0, stale)
+    response = await client.get("/api/design_units/changes", params={"since": token})
+    assert_api_failure(response, expected_error=ErrorCode.SYNC_TOKEN_EXPIRED)
+
+    db_session.add(DesignUnitTombstone(unit_id=999, deleted_at=stale))
+    await db_session.flush()
+    assert await SimpleService.purge_deletions(db_session) == 1
+
+    result = assert_api_success(await client.get("/api/design_units/changes"))
+    response = await client.get(
+        "/api/design_units/changes", params={"since": result["next_token"]}
+    )
+    assert_api_success(response)
+
+
+@pytest.mark.asyncio
+async def test_design_unit_sparse_fieldsets(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    测试场景：fields 参数只返回指定字段（总是包含 id），ETag 随字段子集变化
+    """
+    unit = await DesignUnitFactory.create_async(session=db_session, name="字段设计院")
+
+    response = await client.get(
+        f"/api/design_unit/{unit.id}", params={"fields": "name"}
+    )
+    assert assert_api_success(response) == {"id": unit.id, "name": "字段设计院"}
+    full = await client.get(f"/api/design_unit/{unit.id}")
+    assert response.headers["ETag"] != full.headers["ETag"]
+
+    response = await client.get("/api/design_units", params={"fields": "name,contact"})
+    result = assert_api_success(response)
+    assert result and all(set(item) == {"id", "name", "contact"} for item in result)
+
+    response = await client.get("/api/design_units", params={"fields": "password"})
+    assert_api_failure(
+        response, expected_error=ErrorCode.PARAMETER_ERROR, match_msg="不支持的字段"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_design_units_filter_and_sort(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：名称前缀（通配符转义）、联系人过滤与排序；大表上拒绝无索引排序
+    """
+    for name, contact in (
+        ("华南设计院", "张三"),
+        ("华北设计院", "李四"),
+        ("华_东设计院", "张三"),
+        ("西南设计院", "张三"),
+    ):
+        await DesignUnitFactory.create_async(
+            session=db_session, name=name, contact=contact
+        )
+
+    params = {"name_prefix": "华", "contact": "张三", "sort": "-name", "fields": "name"}
+    response = await client.get("/api/design_units", params=params)
+    assert [unit["name"] for unit in assert_api_success(response)] == [
+        "华南设计院",
+        "华_东设计院",
+    ]
+
+    # "_" 按字面匹配
+    response = await client.get("/api/design_units", params={"name_prefix": "华_"})
+    assert [unit["name"] for unit in assert_api_success(response)] == ["华_东设计院"]
+
+    response = await client.get("/api/design_units", params={"sort": "password"})
+    assert_api_failure(response, expected_error=ErrorCode.PARAMETER_ERROR)
+
+    # 无索引排序：小表允许，超过阈值拒绝
+    response = await client.get("/api/design_units", params={"sort": "email"})
+    assert_api_success(response)
+    monkeypatch.setattr(settings, "unindexed_sort_max_rows", 2)
+    response = await client.get("/api/design_units", params={"sort": "email"})
+    assert_api_failure(
+        response, expected_error=ErrorCode.PARAMETER_ERROR, match_msg="不支持按 email"
+    )
+
+
+@pytest.mark.asyncio
+async def test_suggest_design_units(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：名称联想在索引未就绪时回退为前缀查询；索引就绪后支持包含匹配并随写入更新
+    """
+    monkeypatch.setattr(simple_service, "name_index", NgramIndex())
+    await DesignUnitFactory.create_async(session=db_session, name="联想建筑设计院")
+    await DesignUnitFactory.create_async(session=db_session, name="华南联想设计院")
+
+    response = await client.get("/api/design_units/suggest", params={"q": "联想"})
+    assert [unit["name"] for unit in assert_api_success(response)] == ["联想建筑设计院"]
+
+    await SimpleService.build_name_index(db_session)
+    response = await client.get("/api/design_units/suggest", params={"q": "联想"})
+    assert [unit["name"] for unit in assert_api_success(response)] == [
+        "联想建筑设计院",
+        "华南联想设计院",
+    ]
+
+    payload = DesignUnitFactory.build_payload(name="联想")
+    created = assert_api_success(await client.post("/api/design_unit", json=payload))
+    response = await client.get("/api/design_units/suggest", params={"q": "联想"})
+    assert assert_api_success(response)[0]["id"] == created["id"]
+
+    await client.delete(f"/api/design_unit/{created['id']}")
+    response = await client.get("/api/design_units/suggest", params={"q": "联想"})
+    assert created["id"] not in [unit["id"] for unit in assert_api_success(response)]
+
+
+@pytest.mark.asyncio
+async def test_name_index_refresh_applies_other_workers_writes(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：其他工作进程的新增、改名与删除（不经本进程的写入路径）由增量刷新应用到索引
+    """
+    monkeypatch.setattr(settings, "sync_settle_seconds", 0)
+    monkeypatch.setattr(simple_service, "name_index", NgramIndex())
+    renamed, deleted = [
+        await DesignUnitFactory.create_async(
+            session=db_session, name=name, updated_at=None
+        )
+        for name in ("刷新甲院", "刷新乙院")
+    ]
+    await SimpleService.build_name_index(db_session)
+    # 回拨水位，代替等待时间戳跨秒（SQLite 时间戳精度为秒）
+    since = simple_service.name_index.watermark[0] - timedelta(seconds=10)
+    simple_service.name_index.watermark = (since, 0, since, 0)
+
+    # 直接经仓储层写入，模拟其他工作进程
+    for i in range(3):
+        await DesignUnitFactory.create_async(
+            session=db_session, name=f"刷新新院{i}", updated_at=None
+        )
+    await SimpleRepository.update_unit(db_session, renamed.id, {"name": "刷新丙院"})
+    await SimpleRepository.delete_unit(db_session, deleted.id)
+    await db_session.commit()
+
+    assert await SimpleService.refresh_name_index(db_session) == 5
+    response = await client.get("/api/design_units/suggest", params={"q": "刷新"})
+    names = {unit["name"] for unit in assert_api_success(response)}
+    assert names == {"刷新丙院", "刷新新院0", "刷新新院1", "刷新新院2"}
+
+    # 只重新应用与水位同一时刻的变更（重复应用无副作用）
+    assert await SimpleService.refresh_name_index(db_session) < 5
+
+@pytest.mark.asyncio
+async def test_get_design_units_with_total(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """
+    测试场景：列表总数首次精确计数后由写入路径增量维护；带过滤条件时精确计数
+    """
+    cache = CountCache("design_unit", ttl=300)
+    monkeypatch.setattr(simple_service, "unit_count", cache)
+    for i in range(3):
+        await DesignUnitFactory.create_async(session=db_session, name=f"计数设计院{i}")
+
+    response = await client.get(
+        "/api/design_units", params={"total": "cached", "page_size": 2}
+    )
+    data = assert_api_success(response)
+    assert len(data["items"]) == 2
+    assert (data["total"], data["total_pages"], data["total_mode"]) == (3, 2, "cached")
+    etag = response.headers["ETag"]
+
+    # 新增数据在第 2 页，第 1 页内容不变但总数变化，缓存增量维护不重新计数
+    payload = DesignUnitFactory.build_payload(name="计数设计院9")
+    created = assert_api_success(await client.post("/api/design_unit", json=payload))
+    response = await client.get(
+        "/api/design_units",
+        params={"total": "cached", "page_size": 2},
+        headers={"If-None-Match": etag},
+    )
+    assert assert_api_success(response)["total"] == 4
+    assert cache.reconciles == 1
+
+    await client.delete(f"/api/design_unit/{created['id']}")
+    # SQLite 没有表统计信息，approx 退化为计数缓存
+    response = await client.get("/api/design_units", params={"total": "approx"})
+    data = assert_api_success(response)
+    assert (data["total"], data["total_mode"]) == (3, "cached")
+
+    response = await client.get(
+        "/api/design_units", params={"total": "cached", "name_prefix": "计数设计院1"}
+    )
+    data = assert_api_success(response)
+    assert (data["total"], data["total_mode"]) == (1, "exact")
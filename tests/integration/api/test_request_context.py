@@ -0,0 +1,65 @@
+import pytest
+from httpx import AsyncClient
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exts.exceptions.error_logger import error_logger
+from tests.factories import DesignUnitFactory, UserFactory
+from tests.integration.api.utils import assert_api_success
+
+
+def _timing_phases(response) -> set:
+    parts = response.headers["Server-Timing"].split(", ")
+    return {part.split(";")[0] for part in parts}
+
+
+@pytest.mark.asyncio
+async def test_request_id_and_server_timing(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    测试场景：响应带 X-Request-ID（沿用合法的客户端 id，否则生成）与各阶段 Server-Timing
+    """
+    unit = await DesignUnitFactory.create_async(session=db_session)
+
+    response = await client.get(
+        f"/api/design_unit/{unit.id}", headers={"X-Request-ID": "client-req-1"}
+    )
+    assert_api_success(response)
+    assert response.headers["X-Request-ID"] == "client-req-1"
+    assert {"validation", "db", "serialize", "total"} <= _timing_phases(response)
+
+    response = await client.get(
+        f"/api/design_unit/{unit.id}", headers={"X-Request-ID": "bad id!"}
+    )
+    assert len(response.headers["X-Request-ID"]) == 16
+
+    register_data = UserFactory.build_register_payload()
+    await client.post("/api/register", json=register_data)
+    token = assert_api_success(await client.post("/api/login", json=register_data))[
+        "access_token"
+    ]
+    response = await client.get("/api/me", headers={"Authorization": f"Bearer {token}"})
+    assert "auth" in _timing_phases(response)
+
+
+@pytest.mark.asyncio
+async def test_request_context_bound_to_logs(client: AsyncClient):
+    """
+    测试场景：请求内的日志（如异常处理器的日志）自动带上请求 id
+    """
+    # 之前的用例可能已记录过 4040，清空去重窗口
+    error_logger.reset()
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record))
+    try:
+        response = await client.get(
+            "/api/design_unit/999999", headers={"X-Request-ID": "trace-404"}
+        )
+    finally:
+        logger.remove(handler_id)
+
+    assert response.headers["X-Request-ID"] == "trace-404"
+    biz_errors = [record for record in records if "[BizError]" in record["message"]]
+    assert biz_errors and biz_errors[0]["extra"]["request_id"] == "trace-404"
+
@@ -0,0 +1,18 @@
+import io
+
+from utils.bulk_import import iter_record_batches
+
+
+def test_decode_error_keeps_parsed_rows():
+    """
+    测试场景：文件中途出现编码错误时，本批已解析的行照常产出，编码错误作为最后一条记录
+    """
+    lines = b"".join(f"导入设计院{i}\n".encode() for i in range(1000))
+    content = b"name\n" + lines + b"\xff\xfe\n" + "之后的行\n".encode()
+
+    batches = list(iter_record_batches(io.BytesIO(content), "csv", 5000))
+    assert len(batches) == 1
+    *records, error = batches[0]
+    assert records and all(record is not None for _, record, _ in records)
+    assert records[0][1] == {"name": "导入设计院0"}
+    assert error[1] is None and "文件编码错误" in error[2]
@@ -0,0 +1,130 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from exts.middlewares import compression
+from exts.middlewares.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE_BODY = {"items": [{"id": i, "name": f"设计院{i}"} for i in range(500)]}
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, offload_size=4096)
+
+    @app.get("/large")
+    async def large():
+        return LARGE_BODY
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1024, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(200):
+                yield json.dumps({"id": i}).encode() + b"\n"
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    @app.get("/export")
+    async def export():
+        async def partitions():
+            for i in range(3):
+                yield json.dumps([{"id": i, "name": "设计院" * 500}]).encode() + b"\n"
+
+        return StreamingResponse(partitions(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("", None),
+        ("gzip", "gzip"),
+        ("gzip;q=0.5, identity", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate", None),
+    ],
+)
+def test_negotiate_encoding(accept, expected):
+    """
+    测试场景：Accept-Encoding 协商
+    """
+    assert negotiate_encoding(accept) == expected
+
+
+@pytest.mark.asyncio
+async def test_compress_large_skip_small_and_images(app):
+    """
+    测试场景：大响应压缩，小响应与图片不压缩
+    """
+    transport = ASGITransport(app=app)
+    headers = {"Accept-Encoding": "gzip"}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/large", headers=headers)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert response.json() == LARGE_BODY
+
+        # 未压缩的响应同样带 Vary，共享缓存按 Accept-Encoding 区分
+        response = await client.get("/small", headers=headers)
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+        response = await client.get("/image", headers=headers)
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+        response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+
+@pytest.mark.asyncio
+async def test_compress_streaming_response(app):
+    """
+    测试场景：流式响应增量压缩
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        # httpx 会按 Content-Encoding 自动解压
+        lines = response.text.splitlines()
+        assert len(lines) == 200
+
+
+@pytest.mark.asyncio
+async def test_large_stream_chunks_compressed_in_threadpool(app, monkeypatch):
+    """
+    测试场景：流式响应中超过 offload_size 的数据块在线程池中压缩，不阻塞事件循环
+    """
+    offloaded = []
+    run_in_threadpool = compression.run_in_threadpool
+
+    async def tracking_run_in_threadpool(func, *args):
+        offloaded.append(len(args[0]))
+        return await run_in_threadpool(func, *args)
+
+    monkeypatch.setattr(compression, "run_in_threadpool", tracking_run_in_threadpool)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/export", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.text.splitlines()) == 3
+
+        await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert len(offloaded) == 3 and min(offloaded) >= 4096
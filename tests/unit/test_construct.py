@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from apis.base.schemas.simple import DesignUnitResponse, design_unit_projection
+from db.models import DesignUnit
+from utils.construct import construct_from_orm, construct_many
+
+
+def test_construct_matches_validate_for_valid_rows():
+    """
+    测试场景：对已校验过的数据库数据，快速构造与 model_validate 结果一致
+    """
+    unit = DesignUnit(
+        id=1,
+        name="广东建筑设计院",
+        tel="13800138000",
+        email="contact@example.com",
+        address="广州市天河区科韵路88号",
+        contact="张三",
+        created_at=datetime(2024, 1, 1, 8, 0, 0),
+        updated_at=datetime(2024, 1, 2, 8, 0, 0),
+    )
+    constructed = construct_from_orm(DesignUnitResponse, unit)
+    validated = DesignUnitResponse.model_validate(unit)
+    assert constructed == validated
+    assert constructed.model_dump() == validated.model_dump()
+
+
+def test_construct_skips_validators_and_fills_defaults():
+    """
+    测试场景：不执行输入校验器；行中缺失的字段使用默认值
+    """
+
+    class Row:
+        id = 2
+        name = "设计院"
+        email = "NOT-AN-EMAIL"
+
+    unit = construct_from_orm(DesignUnitResponse, Row())
+    assert unit.email == "NOT-AN-EMAIL"
+    assert unit.tel is None
+
+    model = design_unit_projection(("id", "name"))
+    assert [item.model_dump() for item in construct_many(model, [Row()])] == [
+        {"id": 2, "name": "设计院"}
+    ]
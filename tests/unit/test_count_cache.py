@@ -0,0 +1,42 @@
+from utils.count_cache import CountCache
+
+
+def test_count_cache_increments_and_expires(monkeypatch):
+    """
+    测试场景：未校准时忽略增量；校准后增量维护；超过 ttl 后需要重新校准
+    """
+    now = [100.0]
+    monkeypatch.setattr("utils.count_cache.time.monotonic", lambda: now[0])
+    cache = CountCache("test", ttl=60)
+
+    cache.add(1)
+    assert cache.get() is None
+
+    cache.set(10)
+    cache.add(2)
+    cache.add(-1)
+    assert cache.get() == 11
+
+    now[0] += 61
+    assert cache.get() is None
+    cache.set(12)
+    assert cache.get() == 12
+    assert cache.stats()["drift"] == -1
+
+
+def test_count_cache_discards_racing_reconcile():
+    """
+    测试场景：精确计数期间有增量写入时放弃校准，下一次读取重新计数
+    """
+    cache = CountCache("test", ttl=60)
+    cache.set(10)
+
+    generation = cache.generation
+    cache.add(1)  # 计数期间提交的写入
+    cache.set(10, generation)
+    assert cache.get() is None
+    assert cache.stats()["discarded"] == 1
+
+    generation = cache.generation
+    cache.set(11, generation)
+    assert cache.get() == 11
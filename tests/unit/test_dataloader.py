@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+
+from apis.base.repository.simple import SimpleRepository
+from apis.base.services.simple import SimpleService
+from db.database import LazyAsyncSession, unit_of_work
+from db.models import DesignUnit
+from exts.requestvar.context import RequestContext, request_context_var
+from utils.dataloader import DataLoader
+
+
+@pytest.mark.asyncio
+async def test_loads_in_same_tick_are_batched():
+    """
+    测试场景：同一轮次内的 load 合并为一次批量调用，按 key 分发结果，缺失返回 None
+    """
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(list(keys))
+        return {key: f"unit-{key}" for key in keys if key != 404}
+
+    loader = DataLoader(batch_load)
+    results = await asyncio.gather(
+        loader.load(3), loader.load(1), loader.load(404), loader.load(3)
+    )
+
+    assert results == ["unit-3", "unit-1", None, "unit-3"]
+    assert calls == [[3, 1, 404]]
+
+    # 已加载的 key 不再查询
+    assert await loader.load_many([1, 3]) == ["unit-1", "unit-3"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_error_propagates_and_is_not_cached():
+    """
+    测试场景：批量函数异常传递给本批次所有调用方，失败结果不缓存
+    """
+    attempts = 0
+
+    async def batch_load(keys):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("db down")
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch_load)
+    with pytest.raises(RuntimeError):
+        await loader.load_many([1, 2])
+
+    assert await loader.load_many([1, 2]) == [1, 2]
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_oversized_batch_runs_chunks_sequentially():
+    """
+    测试场景：超过 max_batch_size 的批次拆分后依次执行，不并发使用同一会话
+    """
+    running = 0
+    max_running = 0
+    calls = []
+
+    async def batch_load(keys):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        calls.append(list(keys))
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch_load, max_batch_size=2)
+    assert await loader.load_many([1, 2, 3, 4, 5]) == [1, 2, 3, 4, 5]
+    assert calls == [[1, 2], [3, 4], [5]]
+    assert max_running == 1
+
+
+@pytest.mark.asyncio
+async def test_get_unit_by_id_batched_within_request():
+    """
+    测试场景：同一请求内同一轮次的 get_unit_by_id 合并为一条 IN 查询
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all([DesignUnit(name=f"设计院{i}") for i in range(3)])
+        await session.commit()
+
+    selects = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        selects.append(statement)
+
+    token = request_context_var.set(RequestContext("batch-test"))
+    try:
+        session = LazyAsyncSession(factory)
+        async with unit_of_work(session):
+            units = await asyncio.gather(
+                *(SimpleService.get_unit_by_id(session, i) for i in (1, 2, 3))
+            )
+        assert [unit.name for unit in units] == ["设计院0", "设计院1", "设计院2"]
+        assert len(selects) == 1 and " IN " in selects[0]
+    finally:
+        request_context_var.reset(token)
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_does_not_leak_connection(tmp_path, monkeypatch):
+    """
+    测试场景：请求在批量加载期间被取消（客户端断开、超时），批量随之取消，
+    不会在工作单元关闭会话后再签出连接
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'loader.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(DesignUnit(name="取消设计院"))
+        await session.commit()
+
+    get_units_by_ids = SimpleRepository.get_units_by_ids
+    batch_started = asyncio.Event()
+
+    async def slow_get_units_by_ids(db_session, unit_ids):
+        batch_started.set()
+        await asyncio.sleep(0.05)
+        return await get_units_by_ids(db_session, unit_ids)
+
+    monkeypatch.setattr(SimpleRepository, "get_units_by_ids", slow_get_units_by_ids)
+
+    session = LazyAsyncSession(factory)
+    token = request_context_var.set(RequestContext("cancel-test"))
+    try:
+
+        async def request():
+            async with unit_of_work(session):
+                await SimpleService.get_unit_by_id(session, 1)
+
+        task = asyncio.ensure_future(request())
+        await batch_started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.1)
+        assert engine.pool.checkedout() == 0
+    finally:
+        request_context_var.reset(token)
+        await session.close()
+        await engine.dispose()
@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from exts.exceptions.error_logger import ErrorLogger
+from exts.metrics.registry import metrics
+
+
+def test_error_logger_dedups_by_code(monkeypatch):
+    """
+    测试场景：WARNING 级别同一错误码窗口内只记录首条，窗口过后带上被抑制条数；
+    ERROR 级别每条都记录；计数器每次都累加
+    """
+    now = [0.0]
+    monkeypatch.setattr(
+        "exts.exceptions.error_logger.time.monotonic", lambda: now[0]
+    )
+    error_logger = ErrorLogger(window=10.0)
+    request = SimpleNamespace(method="GET", scope={"path": "/api/design_unit/1"})
+    metrics.reset()
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record))
+    try:
+        for _ in range(5):
+            error_logger.log("WARNING", "BizError", 4040, request, "Message: {}", "x")
+        error_logger.log("WARNING", "BizError", 1001, request)
+        now[0] = 11.0
+        error_logger.log("WARNING", "BizError", 4040, request, "Message: {}", "y")
+        error_logger.log("ERROR", "DatabaseError", 5100, request, "Error: {}", "a")
+        error_logger.log("ERROR", "DatabaseError", 5100, request, "Error: {}", "b")
+    finally:
+        logger.remove(handler_id)
+
+    assert [record["extra"]["error_code"] for record in records] == [
+        4040,
+        1001,
+        4040,
+        5100,
+        5100,
+    ]
+    assert records[0]["message"] == (
+        "[BizError] GET /api/design_unit/1 | Error Code: 4040 | Message: x"
+    )
+    assert records[2]["extra"]["suppressed"] == 4
+    assert records[2]["message"].endswith("| Message: y | 4 more suppressed")
+    assert metrics.get_counter("errors_total", code=4040) == 6
+    assert error_logger.stats()["suppressed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_error_logger_flushes_suppressed_on_window_end():
+    """
+    测试场景：窗口内被抑制的条数在窗口结束时补记，不依赖下一条同类错误
+    """
+    error_logger = ErrorLogger(window=0.05)
+    request = SimpleNamespace(method="GET", scope={"path": "/api/design_unit/1"})
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record))
+    try:
+        for _ in range(3):
+            error_logger.log("WARNING", "BizError", 4040, request)
+        assert error_logger.stats()["pending"] == 2
+        await asyncio.sleep(0.1)
+    finally:
+        logger.remove(handler_id)
+
+    assert len(records) == 2
+    assert records[1]["extra"]["suppressed"] == 2
+    assert "2 more suppressed" in records[1]["message"]
+    assert error_logger.stats()["pending"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+import signal
+import time
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from exts.exceptions.error_code import ErrorCode
+from exts.middlewares.inflight import (
+    InFlightMiddleware,
+    InFlightTracker,
+    inflight_tracker,
+)
+from config.settings import settings
+from serve import (
+    RESPAWN_BACKOFF_BASE,
+    RESPAWN_BACKOFF_MAX,
+    WORKER_MIN_UPTIME,
+    DrainingServer,
+    WorkerManager,
+    worker_shutdown_budget,
+)
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_inflight_and_rejects_new_requests():
+    """
+    测试场景：排空阶段等待进行中的请求完成，新请求返回 503
+    """
+    tracker = InFlightTracker()
+    release = asyncio.Event()
+
+    app = FastAPI()
+    app.add_middleware(InFlightMiddleware, tracker=tracker)
+
+    @app.get("/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        inflight = asyncio.ensure_future(client.get("/slow"))
+        while tracker.active == 0:
+            await asyncio.sleep(0.01)
+
+        tracker.start_drain()
+        rejected = await client.get("/slow")
+        assert rejected.status_code == ErrorCode.SERVICE_UNAVAILABLE.http_status
+        assert rejected.headers["Connection"] == "close"
+
+        # 请求未结束前排空超时
+        assert await tracker.wait_idle(timeout=0.1) is False
+
+        release.set()
+        assert await tracker.wait_idle(timeout=1) is True
+        assert (await inflight).status_code == 200
+        assert tracker.rejected == 1
+
+
+def test_exit_signal_starts_drain(monkeypatch):
+    """
+    测试场景：工作进程收到退出信号时立即进入排空阶段，不等到 lifespan 关闭
+    """
+    monkeypatch.setattr(inflight_tracker, "draining", False)
+    server = DrainingServer(uvicorn.Config(FastAPI()))
+    server.handle_exit(signal.SIGTERM, None)
+    assert inflight_tracker.draining is True
+    assert server.should_exit is True
+
+
+def test_worker_shutdown_budget_covers_graceful_and_drain(monkeypatch):
+    """主进程的等待预算需覆盖 uvicorn 优雅关闭与 lifespan 排空两段耗时"""
+    monkeypatch.setattr(settings, "graceful_timeout", 30)
+    monkeypatch.setattr(settings, "shutdown_drain_timeout", 25)
+    assert worker_shutdown_budget() == 55
+
+
+def test_crashing_worker_respawn_backs_off(monkeypatch):
+    """启动即退出的工作进程按指数退避重启，正常运行后退出则立即重启"""
+    manager = WorkerManager(app=None, sock=None, workers=1)
+    spawned = []
+    monkeypatch.setattr(manager, "spawn", spawned.append)
+
+    delays = []
+    for _ in range(12):
+        manager.started_at[0] = time.monotonic()
+        manager._schedule_respawn(0)
+        delays.append(manager.respawn_at.pop(0) - time.monotonic())
+
+    assert spawned == []
+    assert delays[0] == pytest.approx(RESPAWN_BACKOFF_BASE, abs=0.1)
+    assert delays[1] == pytest.approx(RESPAWN_BACKOFF_BASE * 2, abs=0.1)
+    assert delays[-1] == pytest.approx(RESPAWN_BACKOFF_MAX, abs=0.1)
+
+    # 退避结束后才重启
+    manager.respawn_at[0] = time.monotonic() + 60
+    manager._respawn_due()
+    assert spawned == []
+    manager.respawn_at[0] = time.monotonic() - 1
+    manager._respawn_due()
+    assert spawned == [0]
+
+    # 存活足够久后退出：立即重启并清零失败计数
+    manager.started_at[0] = time.monotonic() - WORKER_MIN_UPTIME - 1
+    manager._schedule_respawn(0)
+    assert spawned == [0, 0]
+    assert manager.failures[0] == 0
+    assert manager.respawn_at == {}
@@ -0,0 +1,90 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from db.database import LazyAsyncSession
+from db.models import DesignUnit
+from exts.requestvar.context import RequestContext, request_context_var
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """
+    基于内存 SQLite 的会话工厂，并统计连接签出次数
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    checkouts = []
+    event.listen(
+        engine.sync_engine, "checkout", lambda *args: checkouts.append(args)
+    )
+
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    factory.checkouts = checkouts
+    yield factory
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_untouched_session_never_checks_out(session_factory):
+    """
+    测试场景：未执行任何语句时不创建会话、不签出连接
+    """
+    session = LazyAsyncSession(session_factory)
+    await session.commit()
+    await session.rollback()
+    await session.close()
+
+    assert session.is_started is False
+    assert session_factory.checkouts == []
+
+
+@pytest.mark.asyncio
+async def test_first_execute_checks_out_and_close_releases(session_factory):
+    """
+    测试场景：首次执行时签出连接，close 后会话可再次惰性创建
+    """
+    session = LazyAsyncSession(session_factory)
+    session.add(DesignUnit(name="惰性会话设计院"))
+    assert session.has_pending_work is True
+
+    await session.commit()
+    assert len(session_factory.checkouts) == 1
+
+    await session.close()
+    assert session.is_started is False
+
+    result = await session.execute(select(DesignUnit))
+    assert result.scalars().first().name == "惰性会话设计院"
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_time_is_recorded(session_factory):
+    """
+    测试场景：语句出错时同样结束计时，计入 db 阶段，不在连接上残留开始时间
+    """
+    ctx = RequestContext("db-timing")
+    token = request_context_var.set(ctx)
+    try:
+        session = LazyAsyncSession(session_factory)
+        with pytest.raises(OperationalError):
+            await session.execute(text("SELECT * FROM missing_table"))
+        assert ctx.timings["db"] > 0
+        await session.rollback()
+
+        ctx.timings.clear()
+        await session.execute(text("SELECT 1"))
+        assert ctx.timings["db"] > 0
+        connection = await session.connection()
+        assert "query_start" not in connection.info
+        await session.close()
+    finally:
+        request_context_var.reset(token)
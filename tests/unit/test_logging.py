@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+
+import pytest
+from loguru import logger
+
+from exts.logururoute.json_sink import JsonLinesSink
+from exts.logururoute.sampling import CallSiteRateLimiter, SampledLogger
+
+
+def test_json_lines_sink_writes_batches(tmp_path):
+    """
+    测试场景：日志由写线程批量写为 JSON Lines，移除 sink 时写完剩余记录
+    """
+    sink = JsonLinesSink(str(tmp_path / "%Y%m%d.jsonl"), batch_size=10)
+    handler_id = logger.add(sink, format="{message}", level="INFO")
+    try:
+        for i in range(25):
+            logger.bind(request_id="abc").info("第 {} 条 {{literal}}", i)
+        logger.debug("低于级别，不输出")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("出错了")
+    finally:
+        logger.remove(handler_id)
+
+    (log_file,) = tmp_path.iterdir()
+    lines = [json.loads(line) for line in log_file.read_text("utf-8").splitlines()]
+    assert len(lines) == 26
+    assert lines[0]["message"] == "第 0 条 {literal}"
+    assert lines[0]["level"] == "INFO"
+    assert lines[0]["extra"] == {"request_id": "abc"}
+    assert "ZeroDivisionError" in lines[-1]["exception"]
+    assert sink.stats()["written"] == 26
+
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="需要 fork")
+def test_json_lines_sink_writes_after_fork(tmp_path):
+    """
+    测试场景：主进程创建 sink 后 fork（serve.py 的 worker），子进程的日志照常写入
+    """
+    sink = JsonLinesSink(str(tmp_path / "%Y%m%d.jsonl"), flush_interval=0.01)
+    handler_id = logger.add(sink, format="{message}", level="INFO")
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # 子进程：写入后移除 sink（写完剩余记录），以写入条数作为退出码
+            try:
+                logger.info("子进程日志")
+                logger.remove(handler_id)
+                code = sink.stats()["written"]
+            except BaseException:  # noqa: BLE001 子进程不能回到 pytest
+                code = 99
+            sys.stdout.flush()
+            os._exit(code)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        logger.remove(handler_id)
+
+    assert os.waitstatus_to_exitcode(status) == 1
+    (log_file,) = tmp_path.iterdir()
+    assert "子进程日志" in log_file.read_text("utf-8")
+
+def test_call_site_rate_limiter(monkeypatch):
+    """
+    测试场景：同一调用点每秒只输出 limit 条，下一窗口首条带上被丢弃条数；
+    被丢弃的调用不进入 loguru（不格式化消息）
+    """
+    now = [0.0]
+    monkeypatch.setattr("exts.logururoute.sampling.time.monotonic", lambda: now[0])
+    limiter = CallSiteRateLimiter(limit=2)
+    sampled = SampledLogger(logger, limiter)
+    formatted = []
+
+    class Value:
+        def __str__(self):
+            formatted.append(1)
+            return "v"
+
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record))
+    try:
+        for second, count in ((0.0, 5), (1.5, 1)):
+            now[0] = second
+            for _ in range(count):
+                sampled.info("热点日志 {}", Value())
+            sampled.debug("另一调用点")
+    finally:
+        logger.remove(handler_id)
+
+    assert [record["level"].name for record in records].count("INFO") == 3
+    assert [record["level"].name for record in records].count("DEBUG") == 2
+    assert len(formatted) == 3
+    assert records[-2]["extra"]["suppressed"] == 3
+    assert records[0]["function"] == "test_call_site_rate_limiter"
+    assert limiter.stats()["dropped"] == 3
@@ -0,0 +1,74 @@
+from utils.ngram import NgramIndex
+
+
+def test_search_ranks_prefix_then_position_then_length():
+    """
+    测试场景：前缀匹配优先，其次按匹配位置、名称长度排序，大小写不敏感
+    """
+    index = NgramIndex()
+    index.add(1, "华南建筑设计院")
+    index.add(2, "建筑设计研究院")
+    index.add(3, "建筑院")
+    index.add(4, "广东华南建筑设计院")
+    index.add(5, "ABC Design")
+
+    assert [unit_id for unit_id, _ in index.search("建筑")] == [3, 2, 1, 4]
+    assert index.search("建筑", limit=2) == [(3, "建筑院"), (2, "建筑设计研究院")]
+    assert index.search("abc") == [(5, "ABC Design")]
+    assert index.search("不存在") == []
+
+
+def test_update_remove_and_compact():
+    """
+    测试场景：改名、删除后不再命中旧名称，墓碑压缩后结果不变
+    """
+    index = NgramIndex()
+    index.add(1, "旧名称设计院")
+    index.add(2, "规划设计院")
+    index.add(1, "新名称设计院")
+    index.remove(2)
+
+    assert index.search("旧名称") == []
+    assert index.search("设计院") == [(1, "新名称设计院")]
+
+    index.compact()
+    assert index.stats()["tombstones"] == 0
+    assert index.search("设计院") == [(1, "新名称设计院")]
+
+
+def test_build_keeps_concurrent_writes():
+    """
+    测试场景：构建期间写入路径的新增/删除优先于加载的旧数据
+    """
+    index = NgramIndex()
+    index.start_build()
+    index.add(1, "新名称")
+    index.remove(2)
+    index.load(1, "旧名称")
+    index.load(2, "已删除")
+    index.load(3, "其他名称")
+    index.finish_build()
+
+    assert index.ready
+    assert index.search("名称") == [(1, "新名称"), (3, "其他名称")]
+    assert index.search("已删除") == []
+
+
+def test_search_beyond_max_candidates():
+    """
+    测试场景：共享前缀的名称超过候选上限时，完整名称与墓碑之后的名称仍能命中
+    """
+    index = NgramIndex(max_candidates=100)
+    for i in range(300):
+        index.add(i, f"建筑设计院{i:04d}")
+
+    assert index.search("建筑设计院0299") == [(299, "建筑设计院0299")]
+    assert index.search("设计院0250") == [(250, "建筑设计院0250")]
+
+    for i in range(150):
+        index.remove(i)
+    assert [unit_id for unit_id, _ in index.search("建筑设计院", limit=3)] == [
+        150,
+        151,
+        152,
+    ]
@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from config.settings import settings
+from db.pool_monitor import (
+    InstrumentedAsyncQueuePool,
+    PoolSizeAdvisor,
+    pool_monitor,
+)
+from exts.exceptions.error_code import ErrorCode
+from exts.exceptions.exception_handler import GlobalExceptionHandler
+from exts.metrics.registry import metrics
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout_is_counted(tmp_path):
+    """
+    测试场景：连接池耗尽时记录等待时长与超时次数
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    timeouts_before = metrics.get_counter("db_pool_timeouts_total")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+
+    assert metrics.get_counter("db_pool_timeouts_total") == timeouts_before + 1
+    assert metrics.snapshot()["histograms"]["db_pool_wait_seconds"]["count"] >= 2
+    await engine.dispose()
+
+
+
+@pytest.mark.asyncio
+async def test_pool_waiting_counts_only_blocked_checkouts(tmp_path):
+    """
+    测试场景：新建连接、直接拿到空闲连接不计入排队数，连接池耗尽阻塞等待时才计入
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    waiting_on_connect = []
+    event.listen(
+        engine.sync_engine,
+        "connect",
+        lambda *args: waiting_on_connect.append(pool_monitor.waiting),
+    )
+
+    async def checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert waiting_on_connect == [0]
+        blocked = asyncio.ensure_future(checkout())
+        await asyncio.sleep(0.05)
+        assert pool_monitor.waiting == 1
+    await blocked
+    assert pool_monitor.waiting == 0
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_pool_timeout_maps_to_retryable_error():
+    """
+    测试场景：连接池超时返回 503 与 Retry-After
+    """
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    response = await GlobalExceptionHandler().handle_database_error(
+        request, PoolTimeoutError("QueuePool limit reached")
+    )
+    assert response.status_code == ErrorCode.DATABASE_POOL_TIMEOUT.http_status
+    assert response.headers["Retry-After"] == str(settings.pool_retry_after)
+
+
+def test_advisor_recommends_from_peak_concurrency():
+    """
+    测试场景：按窗口峰值推荐连接池容量，只输出仪表盘，不修改连接池
+    """
+    advisor = PoolSizeAdvisor(window_seconds=0, headroom=1.5, adaptive=True)
+    assert advisor.recommended_size() is None
+    pool = SimpleNamespace(size=lambda: 2)
+    for in_use in (2, 4, 3):
+        advisor.observe(in_use, pool=pool)
+    assert advisor.recommended_size() == 6
+    assert metrics.snapshot()["gauges"]["db_pool_recommended_size"] == 6
+    assert vars(pool).keys() == {"size"}
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from db.database import LazyAsyncSession
+from db.models import DesignUnit
+from db.query_timeout import QueryTimeoutError, query_timeout
+
+# 约需数秒才能执行完的查询
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 50000000)"
+    " SELECT count(*) FROM c"
+)
+
+
+@pytest.mark.asyncio
+async def test_slow_query_is_interrupted(tmp_path):
+    """
+    测试场景：语句超时后抛出 QueryTimeoutError，并中断数据库端执行
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'timeout.db'}")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await query_timeout(0.05)()
+
+    session = LazyAsyncSession(factory)
+    start = time.perf_counter()
+    with pytest.raises(QueryTimeoutError):
+        await session.execute(SLOW_QUERY)
+    elapsed = time.perf_counter() - start
+
+    # 被中断而不是等待查询跑完
+    assert elapsed < 1
+
+    # 回滚后会话可继续使用
+    await session.rollback()
+    assert (await session.execute(text("SELECT 1"))).scalar() == 1
+    await session.close()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_noop_operations_do_not_check_out(tmp_path):
+    """
+    测试场景：无待刷新对象的 flush、命中标识映射的 get 不签出连接、不开启事务
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lazy.db'}")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await query_timeout(5)()
+
+    session = LazyAsyncSession(factory)
+    await session.flush()
+    assert not session.has_pending_work
+
+    async with engine.begin() as conn:
+        await conn.run_sync(DesignUnit.metadata.create_all)
+    unit = DesignUnit(name="设计院")
+    session.add(unit)
+    await session.commit()
+    assert await session.get(DesignUnit, unit.id) is unit
+    assert not session.has_pending_work
+    await session.close()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_connection_times_out(tmp_path):
+    """
+    测试场景：没有执行中的语句（等待连接池）时到期直接取消，抛出 QueryTimeoutError；
+    外部取消不被转换为超时
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'wait.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=10,
+    )
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await query_timeout(0.05)()
+
+    async with engine.connect() as holder:
+        await holder.execute(text("SELECT 1"))
+        session = LazyAsyncSession(factory)
+        start = time.perf_counter()
+        with pytest.raises(QueryTimeoutError):
+            await session.execute(text("SELECT 1"))
+        assert time.perf_counter() - start < 1
+        await session.close()
+
+        await query_timeout(5)()
+        waiting = LazyAsyncSession(factory)
+        task = asyncio.ensure_future(waiting.execute(text("SELECT 1")))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    await engine.dispose()
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """
+    测试场景：100 个并发相同调用只执行一次，结果共享
+    """
+    flight = SingleFlight("test_share")
+    executions = 0
+
+    async def load():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    results = await asyncio.gather(*(flight.do("unit:1", load) for _ in range(100)))
+
+    assert executions == 1
+    assert all(result == {"id": 1} for result in results)
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 99
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_not_cached():
+    """
+    测试场景：执行异常传递给所有等待者（每个跟随者各自一份副本），结束后不缓存
+    """
+    flight = SingleFlight("test_error")
+    executions = 0
+
+    async def load():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("k", load) for _ in range(5)), return_exceptions=True
+    )
+    assert executions == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert all(str(result) == "boom" for result in results)
+    assert len({id(result) for result in results}) == 5
+
+    with pytest.raises(ValueError):
+        await flight.do("k", load)
+    assert executions == 2
+
+
+@pytest.mark.asyncio
+async def test_leader_cancelled_followers_retry():
+    """
+    测试场景：执行者被取消（客户端断开）后，跟随者重新发起并拿到结果
+    """
+    flight = SingleFlight("test_cancel")
+    started = asyncio.Event()
+    executions = 0
+
+    async def load():
+        nonlocal executions
+        executions += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return executions
+
+    leader = asyncio.ensure_future(flight.do("k", load))
+    await started.wait()
+    followers = [asyncio.ensure_future(flight.do("k", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    results = await asyncio.gather(*followers)
+    assert executions == 2
+    assert results == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_follower_cancel_does_not_affect_leader():
+    """
+    测试场景：跟随者被取消不影响执行者和其他跟随者
+    """
+    flight = SingleFlight("test_follower_cancel")
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    leader = asyncio.ensure_future(flight.do("k", load))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("k", load))
+    other = asyncio.ensure_future(flight.do("k", load))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert await leader == "ok"
+    assert await other == "ok"
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_new_call():
+    """
+    测试场景：forget 之后的调用不再加入之前发起的调用（写入提交后读取最新数据）
+    """
+    flight = SingleFlight("test_forget")
+    value = "old"
+    release = asyncio.Event()
+
+    async def load():
+        result = value
+        await release.wait()
+        return result
+
+    before = asyncio.ensure_future(flight.do(("unit", 1), load))
+    await asyncio.sleep(0)
+    value = "new"
+    assert flight.forget(lambda key: key[1] == 1) == 1
+    after = asyncio.ensure_future(flight.do(("unit", 1), load))
+    await asyncio.sleep(0)
+    release.set()
+    assert await before == "old"
+    assert await after == "new"
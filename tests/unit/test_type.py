@@ -0,0 +1,102 @@
+import pytest
+from pydantic import ValidationError
+
+from apis.base.schemas.simple import DesignUnitCreateRequest
+from utils import type as type_module
+from utils.ttl_cache import TTLCache
+from utils.type import validation_message
+
+
+def test_constraint_types_strip_and_coerce():
+    """
+    测试场景：约束类型去除首尾空白，数字形式的手机号按字符串处理
+    """
+    request = DesignUnitCreateRequest(
+        name="  广东建筑设计院 ", tel=13800138000, address=" 广州市天河区 "
+    )
+    assert request.name == "广东建筑设计院"
+    assert request.tel == "13800138000"
+    assert request.address == "广州市天河区"
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ({"name": ""}, "名称不能为空"),
+        ({"name": None}, "名称不能为空"),
+        ({"name": "设计院", "contact": ["x"]}, "联系人格式不正确"),
+        ({"name": "设" * 21}, "名称长度不能超过20个字符"),
+        ({"name": "设计院", "address": "址" * 201}, "地址长度不能超过200个字符"),
+        ({"name": "设计院", "tel": "  "}, "手机号不能为空"),
+        ({"name": "设计院", "tel": "12345"}, "手机号格式不正确"),
+    ],
+)
+def test_validation_message_translates_constraint_errors(payload, expected):
+    """
+    测试场景：类型、长度、正则约束的校验错误按字段名称翻译为中文提示
+    """
+    with pytest.raises(ValidationError) as exc_info:
+        DesignUnitCreateRequest(**payload)
+    assert validation_message(exc_info.value.errors()[0]).startswith(expected)
+
+
+def test_validate_email_caches_results(monkeypatch):
+    """
+    测试场景：相同原始输入只完整校验一次，校验失败的结果同样缓存
+    """
+    cache = TTLCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(type_module, "_email_cache", cache)
+
+    assert type_module.validate_email(" A@Example.com ") == "a@example.com"
+    assert type_module.validate_email(" A@Example.com ") == "a@example.com"
+    for _ in range(2):
+        with pytest.raises(ValueError, match="邮箱格式不正确"):
+            type_module.validate_email("not-an-email")
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_validate_emails_batch(monkeypatch):
+    """
+    测试场景：批量校验逐项返回结果，批内重复地址只校验一次，可选择不使用缓存
+    """
+    cache = TTLCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(type_module, "_email_cache", cache)
+    calls = []
+    check = type_module._check_email
+    monkeypatch.setattr(
+        type_module, "_check_email", lambda raw: calls.append(raw) or check(raw)
+    )
+
+    results = type_module.validate_emails(
+        ["a@example.com", None, "bad", "a@example.com"], update_cache=False
+    )
+    assert results[0] == ("a@example.com", None)
+    assert results[1] == (None, None)
+    assert results[2][0] is None and "邮箱格式不正确" in results[2][1]
+    assert results[3] == ("a@example.com", None)
+    assert calls == ["a@example.com", "bad"]
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    type_module.validate_emails(["a@example.com"])
+    type_module.validate_emails(["a@example.com"])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_cache_evicts_and_expires(monkeypatch):
+    """
+    测试场景：超出容量淘汰最久未使用的条目，过期条目读取时失效
+    """
+    now = [0.0]
+    monkeypatch.setattr("utils.ttl_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 11
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 1
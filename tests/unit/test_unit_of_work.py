@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from db.database import LazyAsyncSession, transactional, unit_of_work
+from db.models import DesignUnit
+from db.pool_monitor import PoolMonitor, bind_route
+from exts.metrics.registry import MetricsRegistry
+
+
+@transactional
+async def create_unit(db_session, name: str) -> int:
+    unit = DesignUnit(name=name)
+    db_session.add(unit)
+    await db_session.flush()
+    return unit.id
+
+
+@pytest.mark.asyncio
+async def test_transactional_commits_and_records_hold_time():
+    """
+    测试场景：服务方法返回后立即提交并归还连接，且按路由记录持有时长
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    registry = MetricsRegistry()
+    PoolMonitor(registry).install(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    bind_route("/api/design_unit")
+    session = LazyAsyncSession(factory)
+    unit_id = await create_unit(session, "工作单元设计院")
+
+    # 方法返回时连接已归还，会话已关闭
+    assert session.is_started is False
+    snapshot = registry.snapshot()
+    hold = snapshot["histograms"]["db_pool_hold_seconds{route=/api/design_unit}"]
+    assert hold["count"] == 1
+    assert snapshot["collectors"]["db_pool"]["pool_class"] == "StaticPool"
+
+    # 数据已提交，新会话可读到
+    async with factory() as other:
+        result = await other.execute(select(DesignUnit).where(DesignUnit.id == unit_id))
+        assert result.scalars().first().name == "工作单元设计院"
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_nested_transactional_joins_outer_unit_of_work():
+    """
+    测试场景：工作单元内多次调用 transactional 方法只签出一次连接，统一提交；
+    取消时回滚并归还连接
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    registry = MetricsRegistry()
+    PoolMonitor(registry).install(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    bind_route("/api/design_units")
+    session = LazyAsyncSession(factory)
+    async with unit_of_work(session):
+        await create_unit(session, "第一设计院")
+        # 内层方法不单独提交
+        assert session.has_pending_work
+        await create_unit(session, "第二设计院")
+    assert session.is_started is False
+    checkouts = registry.get_counter(
+        "db_pool_checkouts_total", route="/api/design_units"
+    )
+    assert checkouts == 1
+
+    started = asyncio.Event()
+
+    async def cancelled_request():
+        async with unit_of_work(session):
+            await create_unit(session, "被取消的设计院")
+            started.set()
+            await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(cancelled_request())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert session.is_started is False
+
+    async with factory() as other:
+        names = (await other.execute(select(DesignUnit.name))).scalars().all()
+        assert sorted(names) == ["第一设计院", "第二设计院"]
+
+    await engine.dispose()
@@ -0,0 +1,90 @@
+"""
+@File: bulk_import.py
+@Description: 批量导入文件的增量解析（CSV / NDJSON）
+
+按批读取上传文件，每批产出 [(行号, 记录 或 None, 解析错误 或 None), ...]，
+整个文件不会一次性读入内存。读取上传文件是阻塞 IO，调用方应在线程池中取批次：
+
+    batches = iter_record_batches(upload.file, "csv", 1000)
+    batch = await run_in_threadpool(next, batches, None)
+"""
+
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# (行号, 记录, 解析错误)
+RecordItem = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def guess_import_format(filename: Optional[str]) -> Optional[str]:
+    """根据文件名后缀推断导入格式"""
+    if not filename:
+        return None
+    suffix = filename.rsplit(".", 1)[-1].lower()
+    if suffix in ("ndjson", "jsonl"):
+        return "ndjson"
+    if suffix == "csv":
+        return "csv"
+    return None
+
+
+def _iter_csv(text: io.TextIOBase) -> Iterator[RecordItem]:
+    reader = csv.DictReader(text)
+    for row in reader:
+        # 空单元格视为未填写
+        record = {
+            key: (value if value != "" else None)
+            for key, value in row.items()
+            if key is not None
+        }
+        yield reader.line_num, record, None
+
+
+def _iter_ndjson(text: io.TextIOBase) -> Iterator[RecordItem]:
+    for line_no, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"JSON 格式错误: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "每行必须是一个 JSON 对象"
+            continue
+        yield line_no, record, None
+
+
+def iter_record_batches(
+    file: BinaryIO, import_format: str, batch_size: int
+) -> Iterator[List[RecordItem]]:
+    """
+    增量解析上传文件，按批产出记录
+
+    :param file: 上传文件的二进制文件对象
+    :param import_format: csv 或 ndjson
+    :param batch_size: 每批记录数
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    records = _iter_csv(text) if import_format == "csv" else _iter_ndjson(text)
+    try:
+        batch: List[RecordItem] = []
+        try:
+            for item in records:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        except UnicodeDecodeError as e:
+            # 已解析的行照常导入，编码错误作为本批的最后一条记录
+            batch.append((0, None, f"文件编码错误，请使用 UTF-8: {e}"))
+        if batch:
+            yield batch
+    finally:
+        # 不关闭底层上传文件，由框架负责
+        text.detach()
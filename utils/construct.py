@@ -0,0 +1,50 @@
+"""
+@File: construct.py
+@Description: 可信数据（ORM 实例 / 查询行）到响应模型的快速转换
+
+model_validate(from_attributes) 会对每个字段重新执行输入校验器（名称长度、手机号正则、
+email_validator 等），而数据库中的数据在写入时已经过同样的校验。对这类可信数据，
+按字段名取属性后用 model_construct 构造，跳过全部校验。
+
+- 只用于数据库读出的数据，外部输入仍须走 model_validate
+- 不做类型转换与规范化（如邮箱小写），结果与写入时规范化后的值一致
+- 缺失的属性使用模型字段的默认值
+
+使用方式:
+    unit = construct_from_orm(DesignUnitResponse, unit_orm)
+    units = construct_many(DesignUnitResponse, units_orm)
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def _field_names(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def construct_from_orm(model: Type[M], obj: Any) -> M:
+    """
+    从可信对象构造响应模型，不执行校验
+
+    :param model: 响应模型
+    :param obj: ORM 实例或查询行（按属性名取值）
+    """
+    values = {}
+    for name in _field_names(model):
+        value = getattr(obj, name, _MISSING)
+        if value is not _MISSING:
+            values[name] = value
+    return model.model_construct(**values)
+
+
+def construct_many(model: Type[M], objs: Iterable[Any]) -> List[M]:
+    """批量构造响应模型，不执行校验"""
+    return [construct_from_orm(model, obj) for obj in objs]
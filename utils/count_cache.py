@@ -0,0 +1,91 @@
+"""
+@File: count_cache.py
+@Description: 进程内计数缓存（列表总数）
+
+- 写入路径在事务提交后调用 add(delta) 增量维护，不必每次请求都 COUNT(*)
+- 超过 ttl 秒未校准时视为过期，由调用方重新精确计数后 set() 校准，
+  纠正其他进程写入、直接改库等造成的漂移
+- 尚未校准过（value 为 None）时忽略增量，避免在未知基数上累加
+- 精确计数期间有增量写入时，计数结果可能已包含也可能未包含该写入，
+  此时不采用计数结果，而是保持未校准状态，下一次读取重新计数
+
+使用方式:
+    cache = CountCache("design_unit", ttl=300)
+    total = cache.get()
+    if total is None:
+        generation = cache.generation
+        total = await count_rows()
+        cache.set(total, generation)
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+
+class CountCache:
+    """带过期校准的计数缓存"""
+
+    def __init__(self, name: str, ttl: float = 300.0):
+        """
+        :param name: 缓存名称（用于统计）
+        :param ttl: 校准间隔（秒），<= 0 表示每次都重新计数
+        """
+        self.name = name
+        self.ttl = ttl
+        self.value: Optional[int] = None
+        self.reconciled_at = 0.0
+        self.hits = 0
+        self.reconciles = 0
+        self.drift = 0  # 最近一次校准时缓存值与精确值之差
+        self.generation = 0  # 增量写入次数，用于判断计数期间是否有写入
+        self.discarded = 0  # 因计数期间有写入而放弃的校准次数
+
+    def get(self) -> Optional[int]:
+        """未过期时返回缓存值，否则返回 None"""
+        if self.value is None or self.ttl <= 0:
+            return None
+        if time.monotonic() - self.reconciled_at > self.ttl:
+            return None
+        self.hits += 1
+        return self.value
+
+    def set(self, value: int, generation: Optional[int] = None):
+        """
+        以精确计数校准
+
+        :param generation: 开始计数前读取的 generation；计数期间有增量写入时
+            放弃本次校准并置为未校准
+        """
+        if generation is not None and generation != self.generation:
+            self.value = None
+            self.discarded += 1
+            return
+        if self.value is not None:
+            self.drift = self.value - value
+        self.value = value
+        self.reconciled_at = time.monotonic()
+        self.reconciles += 1
+
+    def add(self, delta: int):
+        """增量维护（事务提交后调用）"""
+        self.generation += 1
+        if self.value is not None:
+            self.value = max(self.value + delta, 0)
+
+    def invalidate(self):
+        self.value = None
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        return {
+            "value": self.value,
+            "age": (
+                round(time.monotonic() - self.reconciled_at, 3)
+                if self.value is not None
+                else None
+            ),
+            "hits": self.hits,
+            "reconciles": self.reconciles,
+            "drift": self.drift,
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,128 @@
+"""
+@File: dataloader.py
+@Description: 请求内批量加载器（DataLoader）
+
+同一事件循环轮次内发起的 load(key) 调用会被收集起来，在下一轮一次性交给批量函数执行
+（如一条 WHERE id IN (...) 查询），再按 key 把结果分发回各调用方。
+
+- 加载器按请求创建（持有该请求的会话），同一 key 在加载器生命周期内只查询一次
+- 超过 max_batch_size 的批次拆分后依次执行：同一会话不能并发执行语句
+- 批量函数返回 {key: value}，缺失的 key 得到 None
+- 批量函数抛出异常时，本批次的所有调用方都收到该异常
+- 批量在本轮次第一个调用方的任务内执行，不创建脱离调用方的后台任务：
+  调用方（请求、工作单元）被取消时批量随之取消，不会在会话关闭后继续使用会话
+
+使用方式:
+    loader = DataLoader(lambda ids: load_units_by_ids(db_session, ids))
+    units = await loader.load_many([3, 1, 2])  # 一条查询，按传入顺序返回
+"""
+
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """按事件循环轮次合并的批量加载器"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 500,
+    ):
+        """
+        :param batch_fn: 批量加载函数，接收去重后的 key 列表，返回 {key: value}
+        :param max_batch_size: 单次批量的最大 key 数，超出时拆分为多次依次调用
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self.batches = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        """加载单个 key，同一轮次内的调用合并为一次批量加载"""
+        leader = not self._queue
+        future = self._future(key)
+        if leader and self._queue:
+            await self._dispatch()
+        return await future
+
+    async def load_many(self, keys: Sequence[K]) -> List[Optional[V]]:
+        """加载多个 key，按传入顺序返回"""
+        leader = not self._queue
+        futures = [self._future(key) for key in keys]
+        if leader and self._queue:
+            await self._dispatch()
+        return list(await asyncio.gather(*futures))
+
+    def _future(self, key: K) -> "asyncio.Future[Optional[V]]":
+        """获取 key 的结果 future，新 key 加入待执行队列"""
+        future = self._cache.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._cache[key] = future
+            self._queue.append(key)
+        return future
+
+    async def _dispatch(self):
+        """本轮次第一个调用方执行：让出一轮事件循环收集同轮次的调用，再执行批量"""
+        try:
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            queue, self._queue = self._queue, []
+            self._cancel(queue)
+            raise
+        queue, self._queue = self._queue, []
+        await self._run_batches(queue)
+
+    async def _run_batches(self, queue: List[K]):
+        size = self.max_batch_size
+        for start in range(0, len(queue), size):
+            self.batches += 1
+            try:
+                await self._run_batch(queue[start : start + size])
+            except BaseException:
+                # 被取消时，尚未执行的批次同样取消，避免调用方一直等待
+                self._cancel(queue[start + size :])
+                raise
+
+    def _cancel(self, keys: List[K]):
+        for key in keys:
+            future = self._cache.pop(key, None)
+            if future is not None and not future.done():
+                future.cancel()
+
+    async def _run_batch(self, keys: List[K]):
+        futures = [self._cache[key] for key in keys]
+        try:
+            values = await self.batch_fn(keys)
+        except BaseException as e:
+            for key, future in zip(keys, futures):
+                # 失败结果不缓存，后续可重新加载
+                self._cache.pop(key, None)
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(values.get(key))
@@ -0,0 +1,62 @@
+"""
+@File: export.py
+@Description: 流式导出编码（NDJSON / CSV）
+
+按分区（一批行）编码为一个字节块，供 StreamingResponse 逐块发送，
+内存占用只与分区大小有关，与总行数无关。
+"""
+
+import csv
+import datetime
+import decimal
+import io
+import json
+from typing import Any, Sequence
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """一批行编码为 NDJSON（每行一个 JSON 对象）"""
+    dumps = json.JSONEncoder(
+        ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode
+    return "".join(
+        dumps(dict(zip(columns, row))) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+def encode_csv_header(columns: Sequence[str]) -> bytes:
+    """CSV 表头（带 UTF-8 BOM，方便 Excel 直接打开）"""
+    return b"\xef\xbb\xbf" + encode_csv([columns])
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    """一批行编码为 CSV"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    writer.writerows(
+        [_csv_value(value) for value in row] for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
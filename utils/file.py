@@ -66,7 +66,7 @@ from enum import Enum
 from fastapi import UploadFile
 from typing import Optional, List, Dict
 import aiofiles
-from exts.logururoute.business_logger import logger
+from exts.logururoute.business_logger import logger, sampled_logger
 
 
 class FileCategory(str, Enum):
@@ -133,18 +133,18 @@ class FileUtils:
             raise ValueError(f"不支持的文件类别: {file_category}")
 
         upload_dir = os.path.join(FileUtils.BASE_UPLOAD_DIR, config.upload_subdir)
-        logger.info(f"创建上传目录: {upload_dir} ({config.description})")
         os.makedirs(upload_dir, exist_ok=True)
-        logger.info(f"上传目录创建成功: {upload_dir}")
+        sampled_logger.debug("上传目录: {} ({})", upload_dir, config.description)
         return upload_dir
 
     @staticmethod
     def generate_filename(original_filename: str) -> str:
         """生成唯一文件名"""
-        logger.info(f"生成文件名，原始文件名: {original_filename}")
         file_extension = os.path.splitext(original_filename)[1]
         unique_filename = f"{uuid.uuid4()}{file_extension}"
-        logger.info(f"生成的唯一文件名: {unique_filename}")
+        sampled_logger.debug(
+            "生成唯一文件名: {} -> {}", original_filename, unique_filename
+        )
         return unique_filename
 
     @staticmethod
@@ -169,8 +169,10 @@ class FileUtils:
         # 检查文件类型（MIME类型）
         if file.content_type not in config.allowed_mime_types:
             logger.error(
-                f"不支持的文件格式: {file.content_type}，"
-                f"{config.description}仅支持: {', '.join(config.allowed_mime_types)}"
+                "不支持的文件格式: {}，{}仅支持: {}",
+                file.content_type,
+                config.description,
+                config.allowed_mime_types,
             )
             raise ValueError(
                 f"不支持的文件格式: {file.content_type}，"
@@ -181,8 +183,10 @@ class FileUtils:
         file_extension = os.path.splitext(file.filename)[1].lower()
         if file_extension not in config.allowed_extensions:
             logger.error(
-                f"不支持的文件扩展名: {file_extension}，"
-                f"{config.description}仅支持: {', '.join(config.allowed_extensions)}"
+                "不支持的文件扩展名: {}，{}仅支持: {}",
+                file_extension,
+                config.description,
+                config.allowed_extensions,
             )
             raise ValueError(
                 f"不支持的文件扩展名，{config.description}仅支持: {', '.join(config.allowed_extensions)}"
@@ -192,15 +196,18 @@ class FileUtils:
         max_size = config.max_size_mb * 1024 * 1024  # 转换为字节
         if len(content) > max_size:
             logger.error(
-                f"文件大小超过限制: {len(content)} bytes > {max_size} bytes "
-                f"({config.max_size_mb}MB)"
+                "文件大小超过限制: {} bytes > {} bytes ({}MB)",
+                len(content),
+                max_size,
+                config.max_size_mb,
             )
             raise ValueError(f"{config.description}大小不能超过{config.max_size_mb}MB")
 
-        logger.info(
-            f"文件验证通过: {file.filename}, "
-            f"类型: {file.content_type}, "
-            f"大小: {len(content)} bytes"
+        sampled_logger.debug(
+            "文件验证通过: {}, 类型: {}, 大小: {} bytes",
+            file.filename,
+            file.content_type,
+            len(content),
         )
 
     @staticmethod
@@ -228,17 +235,19 @@ class FileUtils:
         if not config:
             raise ValueError(f"不支持的文件类别: {file_category}")
 
-        logger.info(
-            f"开始保存{config.description}: "
-            f"filename={file.filename}, content_type={file.content_type}"
+        sampled_logger.info(
+            "开始保存{}: filename={}, content_type={}",
+            config.description,
+            file.filename,
+            file.content_type,
         )
 
         # 读取文件内容
         try:
             content = await file.read()
-            logger.info(f"文件读取成功，大小: {len(content)} bytes")
+            sampled_logger.debug("文件读取成功，大小: {} bytes", len(content))
         except Exception as e:
-            logger.error(f"读取文件失败: {str(e)}")
+            logger.error("读取文件失败: {}", e)
             raise
 
         # 验证文件
@@ -249,19 +258,16 @@ class FileUtils:
         filename = FileUtils.generate_filename(file.filename)
         file_path = os.path.join(upload_dir, filename)
 
-        logger.info(f"准备保存到: {file_path}")
-
         # 保存文件
         try:
             async with aiofiles.open(file_path, "wb") as out_file:
                 await out_file.write(content)
-            logger.info(f"文件保存成功: {file_path}")
         except Exception as e:
-            logger.error(f"文件保存失败: {str(e)}")
+            logger.error("文件保存失败: {}: {}", file_path, e)
             raise
 
         # 返回相对路径
         relative_path = os.path.join(config.upload_subdir, filename)
-        logger.info(f"文件保存完成，返回相对路径: {relative_path}")
+        sampled_logger.info("文件保存完成: {}", relative_path)
 
         return relative_path
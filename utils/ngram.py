@@ -0,0 +1,239 @@
+"""
+@File: ngram.py
+@Description: 进程内 n-gram 名称索引（联想输入）
+
+- 以一元、二元字符组（unigram / bigram）建立倒排表，倒排表使用紧凑的 array('I')
+- 另建“开头字符组”倒排表，前缀匹配无需扫描全部候选
+- 查询取所有字符组倒排表的交集作为候选，候选数上限只作用于真实匹配
+- 删除与改名采用墓碑标记，墓碑过多时整体压缩重建
+- 排序：前缀匹配优先，其次按匹配位置、名称长度、名称
+
+所有修改都在事件循环线程内同步执行，无需加锁。
+
+使用方式:
+    index = NgramIndex()
+    index.add(1, "广东建筑设计院")
+    index.search("建筑")  # [(1, "广东建筑设计院")]
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+
+def _normalize(text: str) -> str:
+    return text.strip().lower()
+
+
+def _grams(key: str) -> Set[str]:
+    """名称的一元与二元字符组"""
+    grams = set(key)
+    grams.update(key[i : i + 2] for i in range(len(key) - 1))
+    return grams
+
+
+class NgramIndex:
+    """n-gram 名称索引"""
+
+    def __init__(self, max_candidates: int = 10000, compact_ratio: float = 0.25):
+        """
+        :param max_candidates: 单次查询参与排序的匹配数上限，保证最坏情况耗时有上界
+        :param compact_ratio: 墓碑占比超过该值时压缩重建
+        """
+        self.max_candidates = max_candidates
+        self.compact_ratio = compact_ratio
+        self.ready = False
+        self.building = False
+        # 增量刷新的水位（由调用方维护，如 (updated_at, id, deleted_at, tombstone_id)）
+        self.watermark: Any = None
+        self._reset()
+
+    def _reset(self):
+        self._names: List[Optional[str]] = []  # slot -> 原始名称，None 为墓碑
+        self._keys: List[Optional[str]] = []  # slot -> 规范化名称（与原名相同时共用对象）
+        self._ids = array("q")  # slot -> id
+        self._slots: Dict[int, int] = {}  # id -> slot
+        self._postings: Dict[str, array] = {}  # 字符组 -> slots
+        self._prefixes: Dict[str, array] = {}  # 开头 1~2 个字符 -> slots
+        self._dead = 0
+        self._suppressed: Set[int] = set()  # 构建期间被删除的 id
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # ==================== 修改 ====================
+
+    def add(self, unit_id: int, name: str):
+        """新增或更新名称"""
+        slot = self._slots.get(unit_id)
+        if slot is not None:
+            if self._names[slot] == name:
+                return
+            self._kill(slot)
+
+        key = _normalize(name)
+        slot = len(self._names)
+        self._names.append(name)
+        self._keys.append(name if key == name else key)
+        self._ids.append(unit_id)
+        self._slots[unit_id] = slot
+        for gram in _grams(key):
+            self._postings.setdefault(gram, array("I")).append(slot)
+        for prefix in {key[:1], key[:2]}:
+            if prefix:
+                self._prefixes.setdefault(prefix, array("I")).append(slot)
+
+    def load(self, unit_id: int, name: str):
+        """
+        构建阶段加载一条记录
+
+        构建期间已由写入路径新增/更新或删除的 id 以写入路径为准，跳过加载
+        """
+        if unit_id in self._slots or unit_id in self._suppressed:
+            return
+        self.add(unit_id, name)
+
+    def remove(self, unit_id: int):
+        """删除名称"""
+        if self.building:
+            self._suppressed.add(unit_id)
+        slot = self._slots.pop(unit_id, None)
+        if slot is not None:
+            self._kill(slot)
+
+    def _kill(self, slot: int):
+        self._names[slot] = None
+        self._keys[slot] = None
+        self._dead += 1
+        if self._dead > 1000 and self._dead > len(self._names) * self.compact_ratio:
+            self.compact()
+
+    def compact(self):
+        """清除墓碑，重建倒排表"""
+        live = [
+            (self._ids[slot], name)
+            for slot, name in enumerate(self._names)
+            if name is not None
+        ]
+        suppressed = self._suppressed
+        self._reset()
+        self._suppressed = suppressed
+        for unit_id, name in live:
+            self.add(unit_id, name)
+
+    def start_build(self):
+        self.building = True
+
+    def finish_build(self, success: bool = True):
+        self.building = False
+        self._suppressed.clear()
+        self.ready = success
+
+    # ==================== 查询 ====================
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        查询包含 query 的名称
+
+        :return: [(id, 名称)]，前缀匹配优先，其次按匹配位置、名称长度排序
+        """
+        query = _normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        keys = self._keys
+        grams = _grams(query) if len(query) == 1 else _bigrams(query)
+
+        # 前缀匹配：开头字符组与 query 各字符组倒排表的交集
+        # 用生成器 + nsmallest 只保留 limit 个候选，避免大量临时对象触发全量 GC
+        prefix_postings = [self._prefixes.get(query[:2])]
+        if len(query) > 2:
+            prefix_postings += [self._postings.get(gram) for gram in grams]
+        prefix_slots = self._matches(
+            prefix_postings,
+            lambda key: key.startswith(query),
+        )
+        ranked = heapq.nsmallest(
+            limit, ((len(keys[slot]), keys[slot], slot) for slot in prefix_slots)
+        )
+
+        # 前缀结果不足时，再查包含匹配
+        if len(ranked) < limit:
+            # 位置 0 的已在前缀阶段收集
+            contain_slots = self._matches(
+                [self._postings.get(gram) for gram in grams],
+                lambda key: key.find(query) > 0,
+            )
+            ranked += heapq.nsmallest(
+                limit - len(ranked),
+                (
+                    (keys[slot].find(query), len(keys[slot]), keys[slot], slot)
+                    for slot in contain_slots
+                ),
+            )
+
+        return [(self._ids[item[-1]], self._names[item[-1]]) for item in ranked]
+
+    def _matches(self, postings_list: List[Optional[array]], predicate):
+        """
+        候选交集中满足 predicate 的存活 slot，最多 max_candidates 个
+
+        墓碑与不匹配的 slot 不占用候选数
+        """
+        keys = self._keys
+        return islice(
+            (
+                slot
+                for slot in _intersect(postings_list)
+                if (key := keys[slot]) is not None and predicate(key)
+            ),
+            self.max_candidates,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """索引统计"""
+        posting_bytes = sum(
+            postings.buffer_info()[1] * postings.itemsize
+            for table in (self._postings, self._prefixes)
+            for postings in table.values()
+        )
+        return {
+            "ready": self.ready,
+            "building": self.building,
+            "names": len(self._slots),
+            "tombstones": self._dead,
+            "grams": len(self._postings),
+            "posting_bytes": posting_bytes,
+        }
+
+
+def _bigrams(key: str) -> Set[str]:
+    return {key[i : i + 2] for i in range(len(key) - 1)}
+
+
+def _intersect(postings_list: List[Optional[array]]) -> Sequence[int]:
+    """
+    多个倒排表的交集（slot 升序），任一倒排表为空时返回空
+
+    从最短的倒排表出发：候选远少于下一个倒排表时逐个二分查找，否则用集合过滤
+    """
+    if not postings_list or not all(postings_list):
+        return ()
+    postings_list = sorted(postings_list, key=len)
+    result: Sequence[int] = postings_list[0]
+    for postings in postings_list[1:]:
+        if not result:
+            break
+        size = len(postings)
+        if len(result) * 8 < size:
+            result = [
+                slot
+                for slot in result
+                if (i := bisect_left(postings, slot)) < size and postings[i] == slot
+            ]
+        else:
+            members = set(result)
+            result = [slot for slot in postings if slot in members]
+    return result
@@ -0,0 +1,135 @@
+"""
+@File: singleflight.py
+@Description: 并发相同请求合并（single-flight）
+
+同一 key 的并发调用只执行一次，其余调用等待并共享结果（不做缓存，执行结束即失效）。
+
+取消处理：
+    - 跟随者被取消只影响自身
+    - 执行者（leader）被取消（如客户端断开）时，等待中的跟随者会重新发起，
+      由其中一个成为新的执行者，避免跟随者共享一个已被取消的结果
+
+异常处理：执行者的异常传给每个跟随者时各自复制一份，避免多个任务同时抛出同一个异常实例
+（并发修改其 __traceback__ / __context__）
+
+一致性：加入进行中的调用，可能拿到在自身开始之前就已发起的读取结果。写入提交后调用
+forget() 移除相关 key，之后的读取重新发起，不会加入写入之前发起的调用
+
+使用方式:
+    _unit_flight = SingleFlight("design_unit")
+
+    async def get_unit(db_session, unit_id):
+        return await _unit_flight.do(unit_id, lambda: load_unit(db_session, unit_id))
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from exts.metrics.registry import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """并发相同调用合并器"""
+
+    def __init__(self, name: str, enabled: bool = True):
+        """
+        :param name: 名称（用于指标导出）
+        :param enabled: 是否启用合并，关闭时每次调用都直接执行
+        """
+        self.name = name
+        self.enabled = enabled
+        self.executions = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        metrics.register_collector(f"singleflight_{name}", self.stats)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        执行或加入同一 key 的进行中调用
+
+        :param key: 合并键
+        :param func: 无参协程工厂，仅在成为执行者时调用
+        """
+        if not self.enabled:
+            self.executions += 1
+            return await func()
+
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                return await self._lead(key, func)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not _is_cancelling():
+                    # 执行者被取消，自身未被取消：重新发起
+                    continue
+                raise
+            except Exception as e:
+                raise _copy_exception(e) from None
+
+    async def _lead(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 标记异常已读取，避免无跟随者时告警
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self, match: Callable[[Hashable], bool]) -> int:
+        """
+        移除匹配的进行中调用，之后的调用重新发起（已加入的跟随者仍等待原结果）
+
+        :param match: key 判定函数，如 lambda key: key[1] == unit_id
+        :return: 移除的 key 数
+        """
+        keys = [key for key in self._calls if match(key)]
+        for key in keys:
+            del self._calls[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """合并统计"""
+        calls = self.executions + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+            "coalescing_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
+
+
+def _copy_exception(exc: Exception) -> Exception:
+    """复制异常（不调用 __init__，保留 args、属性与执行者的堆栈），无法复制时返回原异常"""
+    try:
+        copied = exc.__class__.__new__(exc.__class__, *exc.args)
+        copied.__dict__.update(exc.__dict__)
+        copied.args = exc.args
+    except Exception:
+        return exc
+    return copied.with_traceback(exc.__traceback__)
+
+
+def _is_cancelling() -> bool:
+    """当前任务是否正在被取消（Python 3.11+ 可精确判断）"""
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling and cancelling())
@@ -0,0 +1,82 @@
+"""
+@File: ttl_cache.py
+@Description: 有界 LRU + TTL 缓存（线程安全，带命中统计）
+
+- 容量满时淘汰最久未使用的条目
+- 条目写入超过 ttl 秒后视为过期，读取时删除
+- 读写加锁：同一缓存可能同时在事件循环与线程池（如批量导入校验）中使用
+
+使用方式:
+    cache = TTLCache(maxsize=10000, ttl=3600)
+    value = cache.get(key, MISSING)
+    if value is MISSING:
+        value = compute(key)
+        cache.set(key, value)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+MISSING = object()
+
+
+class TTLCache:
+    """有界 LRU + TTL 缓存"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0):
+        """
+        :param maxsize: 最大条目数，<= 0 表示不缓存
+        :param ttl: 条目有效期（秒），<= 0 表示不过期
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at = item
+                if not expires_at or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else 0.0
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -1,61 +1,40 @@
 """
 @File: type.py
 @Description: 通用参数类型校验工具模块
+
+名称、地址、电话类型使用 StringConstraints（去空白、长度、正则），由 pydantic-core
+在 Rust 侧完成校验，不回调 Python 函数；校验失败的英文提示由 validation_message()
+按字段名称翻译为中文（全局参数校验异常处理器与批量导入调用）。
 """
 
-from typing import Annotated
-from pydantic import BeforeValidator, Field, TypeAdapter, ValidationError
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Tuple
+from pydantic import (
+    BeforeValidator,
+    Field,
+    StringConstraints,
+    TypeAdapter,
+    ValidationError,
+)
 from pydantic import EmailStr as PydanticEmailStr
-import re
-
-
-# ============== 通用辅助函数 ==============
 
-
-def validate_str_length(v: str, name: str, max_len: int, min_len: int = 1) -> str:
-    """
-    通用字符串长度校验
-    :param v: 输入值
-    :param name: 字段名称（用于报错提示）
-    :param max_len: 最大长度
-    :param min_len: 最小长度
-    """
-    if v is None:
-        raise ValueError(f"{name}不能为空")
-
-    v = str(v).strip()
-
-    if len(v) < min_len:
-        raise ValueError(f"{name}长度不能少于{min_len}个字符")
-
-    if len(v) > max_len:
-        raise ValueError(f"{name}长度不能超过{max_len}个字符")
-
-    return v
+from config.settings import settings
+from exts.metrics.registry import metrics
+from utils.ttl_cache import MISSING, TTLCache
 
 
 # ============== 字符串长度校验类型 ==============
 
-
-def validate_name(v: str) -> str:
-    return validate_str_length(v, "名称", max_len=20)
-
-
-def validate_address(v: str) -> str:
-    return validate_str_length(v, "地址", max_len=200)
-
-
 # 名称类型
 NameStr = Annotated[
     str,
-    BeforeValidator(validate_name),
+    StringConstraints(strip_whitespace=True, min_length=1, max_length=20),
     Field(description="名称", examples=["广东建筑设计院"]),
 ]
 
 # 地址类型
 AddressStr = Annotated[
     str,
-    BeforeValidator(validate_address),
+    StringConstraints(strip_whitespace=True, min_length=1, max_length=200),
     Field(description="地址", examples=["广州市天河区科韵路88号"]),
 ]
 
@@ -69,40 +48,21 @@ GENERAL_PHONE_PATTERN = (
     r"^(1[3-9]\d{9}|0\d{2,3}-?\d{7,8}(-\d{1,6})?|400-?\d{7}|800-?\d{7})$"
 )
 
-
-def validate_mobile(v: str) -> str:
-    """验证纯手机号"""
-    v = str(v).strip()
-    if not v:
-        raise ValueError("手机号不能为空")
-
-    if not re.match(MOBILE_PHONE_PATTERN, v):
-        raise ValueError("手机号格式不正确，请输入有效的11位中国大陆手机号码")
-    return v
-
-
-def validate_general_phone(v: str) -> str:
-    """验证通用电话（手机/座机/400）"""
-    v = str(v).strip()
-    if not v:
-        raise ValueError("电话号码不能为空")
-
-    if not re.match(GENERAL_PHONE_PATTERN, v):
-        raise ValueError("电话号码格式不正确，支持手机号、座机(带区号)或400热线")
-    return v
-
-
 # 手机号类型
 MobilePhoneStr = Annotated[
     str,
-    BeforeValidator(validate_mobile),
-    Field(description="手机号", pattern=MOBILE_PHONE_PATTERN, examples=["13800138000"]),
+    StringConstraints(
+        strip_whitespace=True, min_length=1, pattern=MOBILE_PHONE_PATTERN
+    ),
+    Field(description="手机号", examples=["13800138000"]),
 ]
 
 # 通用电话类型
 PhoneStr = Annotated[
     str,
-    BeforeValidator(validate_general_phone),
+    StringConstraints(
+        strip_whitespace=True, min_length=1, pattern=GENERAL_PHONE_PATTERN
+    ),
     Field(description="电话号码", examples=["020-88888888", "13800138000"]),
 ]
 
@@ -111,22 +71,128 @@ PhoneStr = Annotated[
 
 _email_adapter = TypeAdapter(PydanticEmailStr)
 
+# email_validator 的语法与 IDNA 检查开销大，按原始输入缓存结果（含校验失败的提示）
+_email_cache = TTLCache(settings.email_cache_size, settings.email_cache_ttl)
+metrics.register_collector("email_validation_cache", _email_cache.stats)
 
-def validate_email(v: str) -> str:
-    v = str(v).strip().lower()
+
+class _InvalidEmail(str):
+    """缓存中表示校验失败，值为错误提示"""
+
+
+def _check_email(raw: str) -> str:
+    """完整校验，返回规范化邮箱；失败时返回 _InvalidEmail"""
+    v = raw.strip().lower()
     if not v:
-        raise ValueError("邮箱地址不能为空")
+        return _InvalidEmail("邮箱地址不能为空")
     try:
         _email_adapter.validate_python(v)
     except ValidationError:
-        raise ValueError("邮箱格式不正确，请输入有效的邮箱地址")
-
+        return _InvalidEmail("邮箱格式不正确，请输入有效的邮箱地址")
     return v
 
 
+def validate_email(v: str) -> str:
+    raw = str(v)
+    result = _email_cache.get(raw, MISSING)
+    if result is MISSING:
+        result = _check_email(raw)
+        _email_cache.set(raw, result)
+    if isinstance(result, _InvalidEmail):
+        raise ValueError(str(result))
+    return result
+
+
+def validate_emails(
+    values: Iterable[Optional[str]], update_cache: bool = True
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    批量校验邮箱（批量导入等场景）
+
+    同一批内相同的输入只校验一次；先查缓存，未命中的再完整校验
+
+    :param values: 原始邮箱，None 表示未填写
+    :param update_cache: 是否使用缓存；导入大量一次性地址时传 False，既不查询也不写入
+        缓存，避免把请求路径上的热点地址挤出缓存，也不拉低缓存命中率统计
+    :return: 与输入一一对应的 (规范化邮箱, 错误提示)，未填写时均为 None
+    """
+    resolved: Dict[str, str] = {}
+    results = []
+    for value in values:
+        if value is None:
+            results.append((None, None))
+            continue
+        raw = str(value)
+        result = resolved.get(raw)
+        if result is None:
+            if not update_cache:
+                result = _check_email(raw)
+            else:
+                result = _email_cache.get(raw, MISSING)
+                if result is MISSING:
+                    result = _check_email(raw)
+                    _email_cache.set(raw, result)
+            resolved[raw] = result
+        if isinstance(result, _InvalidEmail):
+            results.append((None, str(result)))
+        else:
+            results.append((result, None))
+    return results
+
+
 # 邮箱类型
 EmailStr = Annotated[
     str,
     BeforeValidator(validate_email),
     Field(description="邮箱地址", examples=["contact@example.com"]),
 ]
+
+
+# ============== 校验错误提示翻译 ==============
+
+# 字段名 -> 提示中的字段名称
+FIELD_LABELS = {
+    "name": "名称",
+    "contact": "联系人",
+    "address": "地址",
+    "tel": "手机号",
+    "email": "邮箱地址",
+}
+
+# 正则不匹配时按正则给出提示
+_PATTERN_MESSAGES = {
+    MOBILE_PHONE_PATTERN: "手机号格式不正确，请输入有效的11位中国大陆手机号码",
+    GENERAL_PHONE_PATTERN: "电话号码格式不正确，支持手机号、座机(带区号)或400热线",
+}
+
+
+def validation_message(error: Dict[str, Any]) -> Optional[str]:
+    """
+    将 pydantic-core 字符串类型与约束校验错误翻译为中文提示
+
+    字段名称取 loc 中最后一个字段名在 FIELD_LABELS 中的名称，如 "名称长度不能超过20个字符"；
+    未登记的字段只给出约束说明
+
+    :param error: ValidationError.errors() 中的一项
+    :return: 中文提示，不需要翻译的错误返回 None
+    """
+    error_type = error.get("type")
+    ctx = error.get("ctx") or {}
+    field = next(
+        (part for part in reversed(error.get("loc", ())) if isinstance(part, str)), ""
+    )
+    label = FIELD_LABELS.get(field, "")
+    if error_type == "string_type":
+        # null 视为未填写，其他非字符串（列表、对象等）视为格式错误
+        if error.get("input") is None:
+            return f"{label}不能为空"
+        return f"{label}格式不正确"
+    if error_type == "string_too_short":
+        if ctx.get("min_length") == 1:
+            return f"{label}不能为空"
+        return f"{label}长度不能少于{ctx.get('min_length')}个字符"
+    if error_type == "string_too_long":
+        return f"{label}长度不能超过{ctx.get('max_length')}个字符"
+    if error_type == "string_pattern_mismatch":
+        return _PATTERN_MESSAGES.get(ctx.get("pattern"), f"{label}格式不正确")
+    return None